@@ -0,0 +1,128 @@
+"""
+Benchmarks of the hot paths of the product API.
+
+Every benchmark creates a test database from the configured settings, fills it with products,
+prints the measured timings or query counts and drops the database, e.g.:
+
+    python -m benchmarks.search --products 10000
+
+The settings module is read from DJANGO_SETTINGS_MODULE, core.settings by default.
+"""
+
+import argparse
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+
+def setup_django() -> None:
+    """Configure Django for a standalone benchmark run."""
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+    import django
+
+    django.setup()
+
+
+def parse_args(description: str, products: int, repeat: int) -> argparse.Namespace:
+    """Parse the common arguments of a benchmark."""
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--products", type=int, default=products, help="Number of products in the catalog.")
+    parser.add_argument("--repeat", type=int, default=repeat, help="Number of calls in a measured round.")
+    parser.add_argument("--rounds", type=int, default=5, help="Number of measured rounds, the median is reported.")
+
+    return parser.parse_args()
+
+
+@contextmanager
+def test_database():
+    """Create a migrated test database for the duration of the block and drop it afterwards."""
+
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def create_products(count: int, description_length: int = 100, batch_size: int = 1000) -> list:
+    """Create products spread over ten categories, with descriptions of the given length."""
+
+    from products.models import Product
+
+    words = ("red", "green", "blue", "light", "fast", "small", "large", "quiet", "smart", "classic")
+    description = ("lorem ipsum dolor sit amet " * (description_length // 27 + 1))[:description_length]
+
+    return Product.objects.bulk_create(
+        (
+            Product(
+                name=f"{words[number % 10]} {words[number // 10 % 10]} product {number}",
+                photo=f"https://example.com/{number}.jpg",
+                category=f"Category {number % 10}",
+                offer_of_the_month=number % 7 == 0,
+                availability=number % 3 != 0,
+                self_pickup=number % 2 == 0,
+                description1=description,
+                description2=description,
+                price=Decimal(10 + number % 1000),
+                sku=f"SKU-{number}",
+            )
+            for number in range(count)
+        ),
+        batch_size=batch_size,
+    )
+
+
+def measure(function, repeat: int, rounds: int) -> float:
+    """
+    Measure a function.
+
+    Returns:
+        float - The median time of a call over the rounds, in microseconds.
+    """
+
+    timings = []
+
+    for _ in range(rounds):
+        started = time.perf_counter()
+
+        for _ in range(repeat):
+            function()
+
+        timings.append((time.perf_counter() - started) / repeat * 1e6)
+
+    return statistics.median(timings)
+
+
+def count_queries(function) -> int:
+    """Count the database queries made by a function."""
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as context:
+        function()
+
+    return len(context.captured_queries)
+
+
+def report(title: str, results: dict) -> None:
+    """Print the results of a benchmark, timings in microseconds and counts as they are."""
+
+    from django.db import connection
+
+    print(f"{title} ({connection.vendor})")
+
+    for name, value in results.items():
+        if isinstance(value, float):
+            print(f"  {name:<56} {value:>12.1f} us")
+        else:
+            print(f"  {name:<56} {value:>12}")
@@ -0,0 +1,58 @@
+"""
+Benchmark of reading a product detail.
+
+Measures the repository read of a product detail, which selects only the columns of the detail,
+compared with loading a model instance and building the detail from it, as it was done before.
+The product cache is bypassed.
+"""
+
+from benchmarks import count_queries, create_products, measure, parse_args, report, setup_django, test_database
+
+
+def main():
+    args = parse_args(__doc__, products=1000, repeat=1000)
+    setup_django()
+
+    from products.dto import GetProductDTO
+    from products.models import Product
+    from products.repositories import ProductRepository
+
+    with test_database():
+        product_id = create_products(args.products, description_length=500)[args.products // 2].id
+        repository = ProductRepository()
+
+        def read_values():
+            return repository.get_product_by_id(product_id)
+
+        def read_model_instance():
+            product = Product.objects.filter(id=product_id).first()
+
+            return GetProductDTO(
+                id=product.pk,
+                name=product.name,
+                photo=product.photo,
+                category=product.category,
+                offer_of_the_month=product.offer_of_the_month,
+                availability=product.availability,
+                self_pickup=product.self_pickup,
+                description=product.description,
+                price=product.price,
+                sku=product.sku,
+                updated_at=product.updated_at,
+                version=product.version,
+            )
+
+        if read_values() != read_model_instance():
+            raise AssertionError("The detail query reads a different product")
+
+        results = {
+            "queries of a detail read": count_queries(read_values),
+            "model instance (before)": measure(read_model_instance, args.repeat, args.rounds),
+            "selected columns": measure(read_values, args.repeat, args.rounds),
+        }
+
+    report(f"Product detail read, 500-character descriptions, {args.products} products", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark of building product data transfer objects from rows.
+
+Measures the time and the memory of building ProductDTOs from row tuples with the generated row
+constructor, compared with calling the __init__ of the slotted ProductDTO and of a frozen dataclass
+with the same fields but without slots, as the DTOs were declared before. No database is used.
+"""
+
+import gc
+import tracemalloc
+from dataclasses import fields as dc_fields, make_dataclass
+from decimal import Decimal
+
+from benchmarks import measure, parse_args, report, setup_django
+
+
+def allocated_memory(function) -> int:
+    """Measure the memory kept allocated by the result of a function, in bytes."""
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        result = function()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del result
+
+    return size
+
+
+def main():
+    args = parse_args(__doc__, products=100000, repeat=1)
+    setup_django()
+
+    from products.dto import ProductDTO, row_constructor
+
+    DictProductDTO = make_dataclass(
+        "DictProductDTO",
+        [(field.name, field.type, field) for field in dc_fields(ProductDTO)],
+        frozen=True,
+    )
+    from_row = row_constructor(ProductDTO)
+
+    description = "lorem ipsum dolor sit amet " * 4
+    rows = [
+        (
+            number,
+            f"Product {number}",
+            f"https://example.com/{number}.jpg",
+            f"Category {number % 10}",
+            number % 7 == 0,
+            number % 3 != 0,
+            number % 2 == 0,
+            description,
+            description,
+            Decimal(10 + number % 1000),
+            f"SKU-{number}",
+        )
+        for number in range(args.products)
+    ]
+
+    if from_row(rows[0]) != ProductDTO(*rows[0]):
+        raise AssertionError("The row constructor builds a different product")
+
+    builders = {
+        "frozen dataclass, __init__ (before)": lambda: [DictProductDTO(*row) for row in rows],
+        "slotted dataclass, __init__": lambda: [ProductDTO(*row) for row in rows],
+        "slotted dataclass, row constructor": lambda: [from_row(row) for row in rows],
+    }
+
+    results = {}
+
+    for name, build in builders.items():
+        results[name] = measure(build, args.repeat, args.rounds)
+        results[f"{name}, bytes"] = allocated_memory(build)
+
+    report(f"Building {args.products} ProductDTOs from rows", results)
+
+
+if __name__ == "__main__":
+    main()
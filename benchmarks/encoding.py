@@ -0,0 +1,60 @@
+"""
+Benchmark of encoding products to JSON.
+
+Measures rendering a list of products and a product detail with the precompiled encoders of
+ProductJSONRenderer, compared with rendering the data of the DRF serializers with JSONRenderer,
+as it was done before. Both must produce the same bytes.
+"""
+
+from benchmarks import create_products, measure, parse_args, report, setup_django, test_database
+
+
+def main():
+    args = parse_args(__doc__, products=300, repeat=20)
+    setup_django()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from products.dto import QueryParamsDTO
+    from products.renderers import ProductJSONRenderer
+    from products.repositories import ProductRepository
+    from products.serializers import GetProductSerializer, ProductSerializer
+
+    with test_database():
+        product = create_products(args.products, description_length=500)[0]
+        repository = ProductRepository()
+        products_dto = list(repository.iter_products(QueryParamsDTO(), chunk_size=1000))
+        product_dto = repository.get_product_by_id(product.id)
+
+    def render_list_with_serializer():
+        return JSONRenderer().render(ProductSerializer(products_dto, many=True).data)
+
+    def render_list_with_encoder():
+        return ProductJSONRenderer().render(products_dto)
+
+    def render_detail_with_serializer():
+        return JSONRenderer().render(GetProductSerializer(product_dto).data)
+
+    def render_detail_with_encoder():
+        return ProductJSONRenderer().render(product_dto)
+
+    if render_list_with_serializer() != render_list_with_encoder():
+        raise AssertionError("The encoder renders the list differently from the serializer")
+
+    if render_detail_with_serializer() != render_detail_with_encoder():
+        raise AssertionError("The encoder renders the detail differently from the serializer")
+
+    results = {
+        f"list of {len(products_dto)} products, serializer (before)": measure(
+            render_list_with_serializer, args.repeat, args.rounds
+        ),
+        f"list of {len(products_dto)} products, encoder": measure(render_list_with_encoder, args.repeat, args.rounds),
+        "detail, serializer (before)": measure(render_detail_with_serializer, args.repeat * 100, args.rounds),
+        "detail, encoder": measure(render_detail_with_encoder, args.repeat * 100, args.rounds),
+    }
+
+    report(f"Product JSON encoding, {args.products} products", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark of the formats and compression of product lists.
+
+Requests the product list through the whole middleware stack in every available format, JSON,
+columnar JSON and MessagePack, with every available content coding, and reports the size of the
+response body and the time of a request. JSON lists are rendered once and then served from the
+catalog cache, while the compact formats are read and rendered on every request. MessagePack and
+brotli are measured only when the optional msgpack and brotli packages are installed.
+"""
+
+from benchmarks import create_products, measure, parse_args, report, setup_django, test_database
+
+
+def main():
+    args = parse_args(__doc__, products=300, repeat=20)
+    setup_django()
+
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+
+    from core.middleware import brotli
+    from products.renderers import msgpack
+
+    setup_test_environment()
+
+    media_types = {
+        "JSON": "application/json",
+        "columnar JSON": "application/vnd.columnar+json",
+    }
+    if msgpack is not None:
+        media_types["MessagePack"] = "application/msgpack"
+
+    content_codings = ["identity", "gzip"]
+    if brotli is not None:
+        content_codings.append("br")
+
+    with test_database():
+        create_products(args.products)
+        client = Client()
+        results = {}
+
+        for format_name, media_type in media_types.items():
+            for content_coding in content_codings:
+
+                def request():
+                    return client.get("/products/", HTTP_ACCEPT=media_type, HTTP_ACCEPT_ENCODING=content_coding)
+
+                response = request()
+
+                if response.status_code != 200 or response.get("Content-Encoding", "identity") != content_coding:
+                    raise AssertionError(f"The list was not sent as {media_type} with {content_coding} coding")
+
+                results[f"{format_name}, {content_coding}, bytes"] = len(response.content)
+                results[f"{format_name}, {content_coding}, request"] = measure(request, args.repeat, args.rounds)
+
+    report(f"Product list formats, {args.products} products", results)
+
+
+if __name__ == "__main__":
+    main()
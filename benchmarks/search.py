@@ -0,0 +1,68 @@
+"""
+Benchmark of the product search.
+
+Measures a search of an unchanged catalog and a search after a product was updated. On databases
+without full-text search the in-process index is then updated from the change log, which is compared
+with rebuilding the whole index from the table after every change, as it was done before.
+"""
+
+from itertools import count
+
+from benchmarks import count_queries, create_products, measure, parse_args, report, setup_django, test_database
+
+
+def main():
+    args = parse_args(__doc__, products=10000, repeat=20)
+    setup_django()
+
+    from products import repositories
+    from products.dto import PartialProductDTO, QueryParamsDTO, SearchQueryDTO
+    from products.search import InvertedIndex, supports_full_text_search
+
+    with test_database():
+        product = create_products(args.products)[0]
+        repository = repositories.ProductRepository()
+        search_query_dto = SearchQueryDTO(query="red product", limit=20)
+        names = (f"red product renamed {number}" for number in count())
+
+        def search():
+            repository.search_products(search_query_dto)
+
+        def update():
+            repository.partial_update_product(product.id, PartialProductDTO(name=next(names)))
+
+        def update_and_search():
+            update()
+            search()
+
+        def update_and_search_rebuilt_index():
+            update()
+            # The index was rebuilt whenever the version of the catalog, read by an aggregate query, changed
+            repository.get_products_version(QueryParamsDTO())
+            repositories.product_search_index = InvertedIndex()
+            search()
+
+        search()
+
+        results = {
+            "queries of a search of an unchanged catalog": count_queries(search),
+            "search of an unchanged catalog": measure(search, args.repeat, args.rounds),
+            "update of a product": measure(update, args.repeat, args.rounds),
+            "update of a product and search": measure(update_and_search, args.repeat, args.rounds),
+        }
+
+        if not supports_full_text_search():
+            index = repositories.product_search_index
+
+            try:
+                results["update of a product and search, index rebuilt (before)"] = measure(
+                    update_and_search_rebuilt_index, args.repeat, args.rounds
+                )
+            finally:
+                repositories.product_search_index = index
+
+    report(f"Product search, {args.products} products", results)
+
+
+if __name__ == "__main__":
+    main()
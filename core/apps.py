@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+
+
+class CoreConfig(AppConfig):
+    name = 'core'
+
+    def ready(self):
+        from . import schema  # noqa: F401 registers the OpenAPI extensions
+        from . import checks  # noqa: F401 registers the system checks
+        from .signals import revoke_claims_on_user_delete, revoke_claims_on_user_save
+
+        user_model = get_user_model()
+        post_save.connect(revoke_claims_on_user_save, sender=user_model, dispatch_uid="revoke_claims_on_user_save")
+        post_delete.connect(revoke_claims_on_user_delete, sender=user_model, dispatch_uid="revoke_claims_on_user_delete")
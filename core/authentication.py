@@ -0,0 +1,162 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+SUPERUSER_CLAIM = "is_superuser"
+PRIVILEGES_ISSUED_AT_CLAIM = "privileges_iat"
+
+# Cache holding the time of the last privilege change of every user holding trusted claims, apart from the
+# product caches so that their entries do not evict it, and shared between processes (see checks.py)
+
+PRIVILEGES_CACHE_ALIAS = "privileges"
+
+
+def privileges_changed_key(user_id) -> str:
+    return f"auth:privileges_changed:{user_id}"
+
+
+def revoke_privilege_claims(user_id) -> None:
+    """
+    Make the privilege claims of all tokens issued to the user so far untrusted.
+    Such tokens keep working, but their user is loaded from the database again.
+    The mark is kept for the lifetime of a refresh token, after which all older tokens are expired.
+
+    Args:
+        user_id: The identifier of the user whose privileges changed.
+    """
+
+    caches[PRIVILEGES_CACHE_ALIAS].set(
+        privileges_changed_key(user_id),
+        int(time.time()),
+        int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()),
+    )
+
+
+def record_privilege_claims(user_id, issued_at: int) -> None:
+    """
+    Make sure the time of the last privilege change of a user is known when claims are issued to them.
+
+    Claims are trusted only while that time can be read, since a missing mark may have been evicted together
+    with a privilege change. A user without a mark gets one dated just before the new claims, so tokens
+    issued earlier, whose mark may have been lost, stay untrusted.
+
+    Args:
+        user_id: The identifier of the user the claims are issued to.
+        issued_at (int): The time the claims were read from the database, in seconds since the epoch.
+    """
+
+    privileges_cache = caches[PRIVILEGES_CACHE_ALIAS]
+    key = privileges_changed_key(user_id)
+    timeout = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+    if not privileges_cache.add(key, issued_at - 1, timeout):
+        privileges_cache.touch(key, timeout)
+
+
+class ValidatedTokenCache:
+    """
+    Thread-safe in-process LRU cache of validated tokens keyed by a digest of the whole raw token.
+    Entries expire after the given time to live or together with the token, whichever comes first.
+    """
+
+    def __init__(self, max_size: int, timeout: int):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes):
+        """Retrieve a validated token, or None if it is not cached or expired."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            token, expires_at = entry
+
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return token
+
+    def set(self, key: bytes, token) -> None:
+        """Store a validated token, evicting the least recently used one if the cache is full."""
+
+        expires_at = min(time.time() + self.timeout, token["exp"])
+
+        with self._lock:
+            self._entries[key] = (token, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication which, when JWT_STATELESS_SUPERUSER_CHECK is enabled, trusts the signed
+    superuser claim of the token instead of loading the user from the database.
+
+    Validated tokens are kept in an in-process LRU cache, so a repeated token is neither decoded
+    nor verified again. The claim is not trusted if the privileges of the user changed after
+    it was issued, or if the time of their last change cannot be read, in which case the user
+    is loaded from the database as usual.
+    """
+
+    token_cache = ValidatedTokenCache(
+        settings.JWT_VALIDATED_TOKEN_CACHE_SIZE,
+        settings.JWT_VALIDATED_TOKEN_CACHE_TIMEOUT,
+    )
+
+    def get_validated_token(self, raw_token: bytes):
+        if not settings.JWT_STATELESS_SUPERUSER_CHECK:
+            return super().get_validated_token(raw_token)
+
+        # The whole token is hashed, the header and payload of a token are not bound to its cached entry otherwise
+        key = hashlib.sha256(raw_token).digest()
+        validated_token = self.token_cache.get(key)
+
+        if validated_token is None:
+            # Raises for a token which is malformed, forged or expired, so only validated tokens are cached
+            validated_token = super().get_validated_token(raw_token)
+            self.token_cache.set(key, validated_token)
+
+        return validated_token
+
+    def get_user(self, validated_token):
+        if settings.JWT_STATELESS_SUPERUSER_CHECK and self._has_trusted_claims(validated_token):
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+
+        return super().get_user(validated_token)
+
+    @staticmethod
+    def _has_trusted_claims(validated_token) -> bool:
+        """Check whether the token carries privilege claims issued after the last privilege change."""
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        issued_at = validated_token.get(PRIVILEGES_ISSUED_AT_CLAIM)
+
+        if user_id is None or issued_at is None or SUPERUSER_CLAIM not in validated_token:
+            return False
+
+        try:
+            changed_at = caches[PRIVILEGES_CACHE_ALIAS].get(privileges_changed_key(user_id))
+        except Exception:
+            logger.warning("Failed to read the privilege changes of user %s", user_id, exc_info=True)
+            return False
+
+        # Without a mark the claims cannot be told apart from claims of a revocation which was evicted
+        return changed_at is not None and issued_at > changed_at
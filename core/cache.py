@@ -0,0 +1,273 @@
+import asyncio
+import time
+
+from django.core.cache import cache
+
+
+class GenerationalCache:
+    """
+    Cache for a group of entries that can be invalidated all at once.
+
+    Every entry is stored together with the generation of the group it was written in.
+    Bumping the generation makes all entries of the group stale with a single cache write,
+    which is used when it is not known which entries are affected by a change.
+
+    Entries removed one by one are versioned the same way: removing an entry gives its key a new version,
+    so a value loaded before the removal and stored after it, by a concurrent loader, is stale as well.
+    """
+
+    def __init__(self, prefix: str, timeout: int, lock_timeout: int, poll_interval: float = 0.05):
+        self.prefix = prefix
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.generation_key = f"{prefix}:generation"
+
+    def get(self, key):
+        """
+        Retrieve a fresh entry and the current generation of the group with a single cache lookup.
+
+        Args:
+            key: The key of the entry within the group.
+
+        Returns:
+            tuple - The cached value or None if there is no fresh entry, and the current generation of the entry,
+                to be passed to set when a value is loaded instead.
+        """
+
+        entry_key, version_key = self._entry_key(key), self._version_key(key)
+        values = cache.get_many([entry_key, version_key, self.generation_key])
+        group_generation = values.get(self.generation_key)
+
+        if group_generation is None:
+            return None, (self._reset_generation(), values.get(version_key))
+
+        generation = (group_generation, values.get(version_key))
+        entry = values.get(entry_key)
+
+        if entry is None or entry[0] != generation:
+            return None, generation
+
+        return entry[1], generation
+
+    def get_many(self, keys) -> tuple[dict, tuple]:
+        """
+        Retrieve fresh entries and the current generation of the group with a single cache lookup.
+
+        Args:
+            keys: The keys of the entries within the group.
+
+        Returns:
+            tuple - The keys of the fresh entries mapped to the cached values, and the current generation
+                of the entries, to be passed to set_many when values are loaded instead.
+        """
+
+        keys = list(keys)
+        entry_keys = [self._entry_key(key) for key in keys]
+        version_keys = [self._version_key(key) for key in keys]
+        values = cache.get_many([*entry_keys, *version_keys, self.generation_key])
+        group_generation = values.get(self.generation_key)
+
+        versions = {key: values.get(version_key) for key, version_key in zip(keys, version_keys)}
+
+        if group_generation is None:
+            return {}, (self._reset_generation(), versions)
+
+        fresh_values = {}
+
+        for key, entry_key in zip(keys, entry_keys):
+            entry = values.get(entry_key)
+            if entry is not None and entry[0] == (group_generation, versions[key]):
+                fresh_values[key] = entry[1]
+
+        return fresh_values, (group_generation, versions)
+
+    def set(self, key, value, generation) -> None:
+        """
+        Store an entry written in the given generation.
+        The generation must be read before the value is loaded, so that a value loaded
+        concurrently with an invalidation or a removal of the entry is never stored as fresh.
+
+        Args:
+            key: The key of the entry within the group.
+            value: The value to cache.
+            generation: The generation returned by get before the value was loaded.
+        """
+
+        cache.set(self._entry_key(key), (generation, value), self.timeout)
+
+    def set_many(self, values: dict, generation) -> None:
+        """
+        Store several entries written in the given generation.
+
+        Args:
+            values (dict): The keys of the entries within the group mapped to the values to cache.
+            generation: The generation returned by get_many before the values were loaded.
+        """
+
+        group_generation, versions = generation
+
+        cache.set_many(
+            {
+                self._entry_key(key): ((group_generation, versions.get(key)), value)
+                for key, value in values.items()
+            },
+            self.timeout,
+        )
+
+    def get_or_load(self, key, loader):
+        """
+        Retrieve an entry, loading and storing it on a miss.
+
+        Only one caller at a time loads a missing entry. Concurrent callers wait for the entry
+        to appear instead of loading it too. If the loader fails, the next caller takes over,
+        and callers load the entry themselves only if the lock expires.
+
+        Args:
+            key: The key of the entry within the group.
+            loader: A callable without arguments returning the value to cache.
+
+        Returns:
+            The cached or loaded value.
+        """
+
+        value, generation = self.get(key)
+
+        if value is not None:
+            return value
+
+        lock_key = f"{self._entry_key(key)}:lock"
+        deadline = time.monotonic() + self.lock_timeout
+
+        while not cache.add(lock_key, True, self.lock_timeout):
+            if time.monotonic() >= deadline:
+                return loader()
+
+            time.sleep(self.poll_interval)
+
+            value, _ = self.get(key)
+            if value is not None:
+                return value
+
+        try:
+            # The previous holder of the lock may have stored the entry after it was last read
+            value, generation = self.get(key)
+
+            if value is None:
+                value = loader()
+                self.set(key, value, generation)
+        finally:
+            cache.delete(lock_key)
+
+        return value
+
+    def delete(self, key) -> None:
+        """Remove an entry, making values loaded before the removal stale."""
+
+        self.delete_many([key])
+
+    def delete_many(self, keys) -> None:
+        """Remove several entries, making values loaded before the removal stale."""
+
+        keys = list(keys)
+        version = time.time_ns()
+
+        # The versions outlive the entries stored by loaders which started before the removal
+        cache.set_many({self._version_key(key): version for key in keys}, self.timeout + self.lock_timeout)
+        cache.delete_many([self._entry_key(key) for key in keys])
+
+    def invalidate(self) -> None:
+        """Make all entries of the group stale by bumping the generation."""
+
+        try:
+            cache.incr(self.generation_key)
+        except ValueError:
+            self._reset_generation()
+
+    async def aget(self, key):
+        """Asynchronous counterpart of get."""
+
+        entry_key, version_key = self._entry_key(key), self._version_key(key)
+        values = await cache.aget_many([entry_key, version_key, self.generation_key])
+        group_generation = values.get(self.generation_key)
+
+        if group_generation is None:
+            await cache.aadd(self.generation_key, time.time_ns(), None)
+            return None, (await cache.aget(self.generation_key), values.get(version_key))
+
+        generation = (group_generation, values.get(version_key))
+        entry = values.get(entry_key)
+
+        if entry is None or entry[0] != generation:
+            return None, generation
+
+        return entry[1], generation
+
+    async def aset(self, key, value, generation) -> None:
+        """Asynchronous counterpart of set."""
+
+        await cache.aset(self._entry_key(key), (generation, value), self.timeout)
+
+    async def aget_or_load(self, key, loader):
+        """
+        Asynchronous counterpart of get_or_load, with the same lock shared with synchronous callers.
+
+        Args:
+            key: The key of the entry within the group.
+            loader: A coroutine function without arguments returning the value to cache.
+
+        Returns:
+            The cached or loaded value.
+        """
+
+        value, generation = await self.aget(key)
+
+        if value is not None:
+            return value
+
+        lock_key = f"{self._entry_key(key)}:lock"
+        deadline = time.monotonic() + self.lock_timeout
+
+        while not await cache.aadd(lock_key, True, self.lock_timeout):
+            if time.monotonic() >= deadline:
+                return await loader()
+
+            await asyncio.sleep(self.poll_interval)
+
+            value, _ = await self.aget(key)
+            if value is not None:
+                return value
+
+        try:
+            value, generation = await self.aget(key)
+
+            if value is None:
+                value = await loader()
+                await self.aset(key, value, generation)
+        finally:
+            await cache.adelete(lock_key)
+
+        return value
+
+    async def ainvalidate(self) -> None:
+        """Asynchronous counterpart of invalidate."""
+
+        try:
+            await cache.aincr(self.generation_key)
+        except ValueError:
+            await cache.aadd(self.generation_key, time.time_ns(), None)
+
+    def _reset_generation(self):
+        """
+        Start a new generation after the counter was evicted or never set.
+        A time-based value is used, so entries written before the eviction do not become fresh again.
+        """
+
+        cache.add(self.generation_key, time.time_ns(), None)
+        return cache.get(self.generation_key)
+
+    def _entry_key(self, key) -> str:
+        return f"{self.prefix}:{key}"
+
+    def _version_key(self, key) -> str:
+        return f"{self.prefix}:{key}:version"
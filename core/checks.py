@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .authentication import PRIVILEGES_CACHE_ALIAS
+
+# Cache backends whose entries are private to the process
+PROCESS_LOCAL_CACHE_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Refuse a process-local default cache in the production server mode. The cached products and lists are
+    invalidated by the worker handling the change, so the other workers would keep serving stale data.
+    """
+
+    if not settings.SERVER_MODE or settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHE_BACKENDS:
+        return []
+
+    return [
+        Error(
+            f"SERVER_MODE={settings.SERVER_MODE} runs several worker processes, which cannot share the "
+            "in-memory cache.",
+            hint=(
+                "Set CACHE_BACKEND and CACHE_LOCATION to a cache shared between processes, e.g. "
+                "django.core.cache.backends.redis.RedisCache and redis://redis:6379/0."
+            ),
+            id="core.E001",
+        )
+    ]
+
+
+@register(Tags.caches, Tags.security)
+def check_shared_privileges_cache(app_configs, **kwargs):
+    """
+    Refuse a process-local privileges cache when the superuser claim of tokens is trusted in the production
+    server mode. A revocation would reach only the worker handling the change, the others would keep trusting
+    the claims of a demoted user.
+    """
+
+    if (
+        not settings.JWT_STATELESS_SUPERUSER_CHECK
+        or not settings.SERVER_MODE
+        or settings.CACHES[PRIVILEGES_CACHE_ALIAS]["BACKEND"] not in PROCESS_LOCAL_CACHE_BACKENDS
+    ):
+        return []
+
+    return [
+        Error(
+            "JWT_STATELESS_SUPERUSER_CHECK requires a privileges cache shared between the worker processes.",
+            hint="Set PRIVILEGES_CACHE_BACKEND and PRIVILEGES_CACHE_LOCATION, or CACHE_BACKEND and CACHE_LOCATION.",
+            id="core.E002",
+        )
+    ]
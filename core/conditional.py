@@ -0,0 +1,85 @@
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, quote_etag
+
+
+def make_etag(*parts) -> str:
+    """Build a strong entity tag from the values identifying a version of a resource."""
+
+    return quote_etag(hashlib.sha1(":".join(str(part) for part in parts).encode("utf-8")).hexdigest())
+
+
+def make_version_etag(version: int, *parts) -> str:
+    """
+    Build a strong entity tag from the version number of a resource followed by the values identifying
+    its representation, so the version can be read back from the If-Match header of a write.
+    """
+
+    return quote_etag(".".join(str(part) for part in (version, *parts)))
+
+
+def get_if_match_versions(request) -> Optional[set[int]]:
+    """
+    Read the versions of a resource the client expects from the If-Match header.
+    The tags identify versions rather than bytes, so weak tags of compressed responses are accepted too.
+
+    Returns:
+        Optional[set[int]] - The versions named by the tags, which may be none of them, or None
+        if any version is acceptable because the header is missing or "*".
+    """
+
+    header = request.META.get("HTTP_IF_MATCH")
+
+    if header is None:
+        return None
+
+    etags = parse_etags(header)
+
+    if etags == ["*"]:
+        return None
+
+    versions = set()
+
+    for etag in etags:
+        version, _, _ = etag.removeprefix("W/").strip('"').partition(".")
+
+        if version.isdigit():
+            versions.add(int(version))
+
+    return versions
+
+
+def get_not_modified_response(request, etag: str, last_modified: Optional[datetime]) -> Optional[HttpResponse]:
+    """
+    Evaluate the conditional request headers against the current version of a resource.
+
+    Returns:
+        HttpResponse - A 304 Not Modified or 412 Precondition Failed response,
+        or None if the resource has to be sent in full.
+    """
+
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+
+    if response is not None:
+        set_validators(response, etag, last_modified)
+
+    return response
+
+
+def set_validators(response: HttpResponse, etag: str, last_modified: Optional[datetime]) -> HttpResponse:
+    """Add the ETag and Last-Modified headers of the current version of a resource to the response."""
+
+    response.headers["ETag"] = etag
+
+    if last_modified:
+        response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+
+    return response
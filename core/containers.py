@@ -1,7 +1,41 @@
 from dependency_injector import containers, providers
+from django.conf import settings
 
-from products.repositories import ProductRepository
-from products.services import ProductService
+from core.cache import GenerationalCache
+from products.events import ProductChangeStream
+from products.repositories import (
+    ProductRepository,
+    CachedProductRepository,
+    AsyncProductRepository,
+    AsyncCachedProductRepository,
+)
+from products.services import ProductService, AsyncProductService
+
+# Version of the layout of cached data transfer objects, part of the cache prefixes. It is changed together
+# with the layout, so entries pickled by a previous release are never unpickled into the new classes.
+
+CACHE_LAYOUT_VERSION = 3
+
+
+class CacheContainer(containers.DeclarativeContainer):
+    """
+    A container responsible for providing instances of caches.
+    Caches keep results of data storage queries and rendered responses between requests.
+    """
+
+    product_cache = providers.Singleton(
+        GenerationalCache,
+        f"products:detail:v{CACHE_LAYOUT_VERSION}",
+        timeout=settings.PRODUCT_CACHE_TIMEOUT,
+        lock_timeout=settings.PRODUCT_CACHE_LOCK_TIMEOUT,
+    )
+
+    catalog_cache = providers.Singleton(
+        GenerationalCache,
+        f"products:catalog:v{CACHE_LAYOUT_VERSION}",
+        timeout=settings.PRODUCT_CATALOG_CACHE_TIMEOUT,
+        lock_timeout=settings.PRODUCT_CACHE_LOCK_TIMEOUT,
+    )
 
 
 class RepositoryContainer(containers.DeclarativeContainer):
@@ -10,7 +44,19 @@ class RepositoryContainer(containers.DeclarativeContainer):
     Repositories are data access components used by services to retrieve data.
     """
 
-    product_repository = providers.Factory(ProductRepository)
+    product_repository = providers.Factory(
+        CachedProductRepository,
+        product_repository=providers.Factory(ProductRepository),
+        product_cache=CacheContainer.product_cache,
+        catalog_cache=CacheContainer.catalog_cache,
+    )
+
+    async_product_repository = providers.Factory(
+        AsyncCachedProductRepository,
+        product_repository=providers.Factory(AsyncProductRepository),
+        product_cache=CacheContainer.product_cache,
+        catalog_cache=CacheContainer.catalog_cache,
+    )
 
 
 class ServiceContainer(containers.DeclarativeContainer):
@@ -20,3 +66,22 @@ class ServiceContainer(containers.DeclarativeContainer):
     """
 
     product_service = providers.Factory(ProductService, product_repository=RepositoryContainer.product_repository)
+
+    async_product_service = providers.Factory(
+        AsyncProductService,
+        product_repository=RepositoryContainer.async_product_repository,
+    )
+
+
+class EventContainer(containers.DeclarativeContainer):
+    """
+    A container responsible for providing instances of event streams.
+    Streams are shared by all connections of a process, so the data storage is read once per change.
+    """
+
+    product_change_stream = providers.Singleton(
+        ProductChangeStream,
+        product_service=ServiceContainer.async_product_service,
+        poll_interval=settings.PRODUCT_EVENTS_POLL_INTERVAL,
+        queue_size=settings.PRODUCT_EVENTS_QUEUE_SIZE,
+    )
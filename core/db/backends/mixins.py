@@ -0,0 +1,60 @@
+from core.db.pool import get_pool
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Mixin for database backends which take connections from a per-process pool instead of opening them.
+
+    Closing a connection returns it to the pool, so connections should not be persisted
+    with CONN_MAX_AGE. The pool is configured by the "POOL" key of the database settings:
+
+        "POOL": {"MAX_SIZE": 10, "TIMEOUT": 10}
+    """
+
+    default_pool_max_size = 10
+    default_pool_timeout = 10
+
+    def get_new_connection(self, conn_params):
+        connect = super().get_new_connection
+        return self.get_pool().acquire(lambda: connect(conn_params))
+
+    def _close(self):
+        if self.connection is None:
+            return
+
+        reusable = self.reset_pooled_connection()
+
+        try:
+            if not reusable:
+                with self.wrap_database_errors:
+                    self.connection.close()
+        finally:
+            self.get_pool().release(self.connection, reusable)
+
+    def get_pool(self):
+        """Return the connection pool of this database."""
+
+        pool_settings = self.settings_dict.get("POOL") or {}
+
+        return get_pool(
+            (self.alias, self.vendor, self.settings_dict.get("HOST"), self.settings_dict.get("NAME")),
+            self.alias,
+            pool_settings.get("MAX_SIZE", self.default_pool_max_size),
+            pool_settings.get("TIMEOUT", self.default_pool_timeout),
+        )
+
+    def reset_pooled_connection(self) -> bool:
+        """
+        Bring the connection back to a clean state before it is returned to the pool.
+        An open transaction is rolled back, and after an error the connection is reused only if it still answers.
+
+        Returns:
+            bool - Whether the connection can be reused.
+        """
+
+        try:
+            self.connection.rollback()
+        except self.Database.Error:
+            return False
+
+        return not self.errors_occurred or self.is_usable()
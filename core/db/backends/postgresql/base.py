@@ -0,0 +1,20 @@
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+from core.db.backends.mixins import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """PostgreSQL backend taking connections from a per-process pool."""
+
+    def reset_pooled_connection(self) -> bool:
+        if self.connection.closed:
+            return False
+
+        try:
+            if self.connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                self.connection.rollback()
+        except base.Database.Error:
+            return False
+
+        return not self.errors_occurred or self.is_usable()
@@ -0,0 +1,10 @@
+from django.db.backends.sqlite3 import base
+
+from core.db.backends.mixins import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    SQLite backend taking connections from a per-process pool.
+    It stands in for the PostgreSQL backend in local runs, and works with file databases only.
+    """
@@ -0,0 +1,16 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.db.models import Index
+
+
+class SearchVectorIndex(GinIndex):
+    """
+    GIN index of a full-text search vector.
+    Databases other than PostgreSQL have neither search vectors nor GIN indexes, so a plain index
+    is created there instead, keeping the schema of the models the same on every database.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return Index.create_sql(self, model, schema_editor, using=using, **kwargs)
+
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from django.db import OperationalError
+
+
+class PoolTimeoutError(OperationalError):
+    """Exception raised when no database connection becomes available within the pool timeout."""
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    alias: str
+    max_size: int
+    size: int
+    in_use: int
+    idle: int
+    waiting: int
+    acquired: int
+    waited: int
+    wait_time_total: float
+    wait_time_max: float
+    timeouts: int
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of database connections with a bounded size.
+
+    At most max_size connections are open at a time. When all of them are in use, callers wait
+    for a released connection for up to timeout seconds instead of opening more connections,
+    which keeps the number of connections to the database fixed however many threads are serving requests.
+    """
+
+    def __init__(self, alias: str, max_size: int, timeout: float):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pid = os.getpid()
+        self._condition = threading.Condition()
+        self._idle = []
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._acquired = 0
+        self._waited = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+
+    def acquire(self, connect):
+        """
+        Take an idle connection, open a new one if the pool is not full, or wait for a released one.
+
+        Args:
+            connect: A callable without arguments opening a new connection.
+
+        Returns:
+            The database connection.
+
+        Raises:
+            PoolTimeoutError: If no connection becomes available within the timeout.
+        """
+
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        with self._condition:
+            if not self._idle and self._size >= self.max_size:
+                self._waiting += 1
+                try:
+                    while not self._idle and self._size >= self.max_size:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise PoolTimeoutError(
+                                f"No database connection of '{self.alias}' became available within "
+                                f"{self.timeout} seconds, all {self.max_size} connections are in use"
+                            )
+                        self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+                wait_time = time.monotonic() - started
+                self._waited += 1
+                self._wait_time_total += wait_time
+                self._wait_time_max = max(self._wait_time_max, wait_time)
+
+            self._acquired += 1
+            self._in_use += 1
+
+            if self._idle:
+                return self._idle.pop()
+
+            self._size += 1
+
+        try:
+            return connect()
+        except BaseException:
+            self._discard()
+            raise
+
+    def release(self, connection, reusable: bool = True) -> None:
+        """
+        Return a connection taken by acquire to the pool.
+
+        Args:
+            connection: The database connection.
+            reusable (bool): Whether the connection can be handed out again.
+                Connections that are not reusable must be closed by the caller.
+        """
+
+        if not reusable:
+            self._discard()
+            return
+
+        with self._condition:
+            self._in_use -= 1
+            self._idle.append(connection)
+            self._condition.notify()
+
+    def stats(self) -> PoolStats:
+        """Return a snapshot of the pool metrics."""
+
+        with self._condition:
+            return PoolStats(
+                alias=self.alias,
+                max_size=self.max_size,
+                size=self._size,
+                in_use=self._in_use,
+                idle=len(self._idle),
+                waiting=self._waiting,
+                acquired=self._acquired,
+                waited=self._waited,
+                wait_time_total=self._wait_time_total,
+                wait_time_max=self._wait_time_max,
+                timeouts=self._timeouts,
+            )
+
+    def _discard(self) -> None:
+        """Forget a connection that is in use, making room for a new one."""
+
+        with self._condition:
+            self._in_use -= 1
+            self._size -= 1
+            self._condition.notify()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key: tuple, alias: str, max_size: int, timeout: float) -> ConnectionPool:
+    """
+    Return the connection pool of the current process for the given database, creating it on first use.
+    Pools inherited from a parent process are replaced, since their connections cannot be shared after a fork.
+
+    Args:
+        key (tuple): The values identifying the database the connections are opened to.
+        alias (str): The alias of the database connection.
+        max_size (int): The maximum number of open connections.
+        timeout (float): The maximum time to wait for a connection, in seconds.
+
+    Returns:
+        ConnectionPool - The connection pool.
+    """
+
+    with _pools_lock:
+        pool = _pools.get(key)
+
+        if pool is None or pool.pid != os.getpid():
+            pool = _pools[key] = ConnectionPool(alias, max_size, timeout)
+
+        return pool
+
+
+def get_pools_stats() -> list[PoolStats]:
+    """Return the metrics of all connection pools of the current process."""
+
+    with _pools_lock:
+        pools = [pool for pool in _pools.values() if pool.pid == os.getpid()]
+
+    return [pool.stats() for pool in pools]
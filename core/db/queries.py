@@ -0,0 +1,60 @@
+from django.db import connections
+from django.db.models import QuerySet
+from django.db.models.sql import UpdateQuery
+
+
+def update_returning(queryset: QuerySet, values: dict, returning: tuple[str, ...]) -> list[tuple]:
+    """
+    Update the rows selected by a QuerySet and fetch fields of the updated rows with a single
+    UPDATE ... RETURNING query, which Django does not provide for updates.
+    The query is compiled by Django, so values may be expressions such as F("version") + 1.
+
+    Args:
+        queryset (QuerySet): A filtered QuerySet of the rows to update.
+        values (dict): The names of the updated fields mapped to their new values.
+        returning (tuple[str, ...]): The names of the fields to fetch.
+
+    Returns:
+        list[tuple] - The fetched fields of every updated row, converted to Python values.
+    """
+
+    connection = connections[queryset.db]
+    opts = queryset.model._meta
+
+    query = queryset.query.chain(UpdateQuery)
+    query.add_update_values(values)
+    query.annotations = {}
+
+    compiler = query.get_compiler(queryset.db)
+    compiler.pre_sql_setup()
+    sql, params = compiler.as_sql()
+
+    fields = [opts.get_field(name) for name in returning]
+    columns = [field.get_col(opts.db_table) for field in fields]
+    converters = [
+        connection.ops.get_db_converters(column) + field.get_db_converters(connection)
+        for field, column in zip(fields, columns)
+    ]
+    returning_sql = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"{sql} RETURNING {returning_sql}", params)
+        rows = cursor.fetchall()
+
+    return [
+        tuple(
+            _convert(value, column, column_converters, connection)
+            for value, column, column_converters in zip(row, columns, converters)
+        )
+        for row in rows
+    ]
+
+
+def _convert(value, column, converters, connection):
+    """Convert a database value of a column with the converters of the backend and the field."""
+
+    for converter in converters:
+        value = converter(value, column, connection)
+
+    return value
+
@@ -0,0 +1,141 @@
+import json
+from decimal import Decimal
+
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class SerializerJSONEncoder:
+    """
+    Encoder converting objects straight to JSON bytes without running the serializer.
+
+    The conversion code is generated once from the fields of the given serializer class, and
+    its output is byte-identical to rendering the serializer data with the default JSONRenderer
+    (compact separators, non-ASCII characters kept, U+2028 and U+2029 escaped).
+    orjson is used for the final encoding when it is installed.
+    """
+
+    def __init__(self, serializer_class: type[serializers.Serializer]):
+        self.serializer_class = serializer_class
+        self.to_primitive, self._to_json = self._compile(serializer_class())
+
+    def encode(self, instance) -> bytes:
+        """Encode a single object into JSON bytes."""
+
+        if orjson is not None:
+            return self._escape_line_separators(orjson.dumps(self.to_primitive(instance), default=self._default))
+
+        return self._finalize(self._to_json(instance))
+
+    def encode_many(self, instances) -> bytes:
+        """Encode a list of objects into a JSON array."""
+
+        if orjson is not None:
+            content = orjson.dumps([self.to_primitive(item) for item in instances], default=self._default)
+            return self._escape_line_separators(content)
+
+        return self._finalize("[" + ",".join(map(self._to_json, instances)) + "]")
+
+    @classmethod
+    def _compile(cls, serializer: serializers.Serializer):
+        """Generate functions converting an object into primitive data and into a JSON string."""
+
+        namespace = {}
+        getters = []
+        dict_items = []
+        json_parts = []
+
+        for index, (name, field) in enumerate(serializer.fields.items()):
+            if field.write_only:
+                continue
+
+            namespace[f"p{index}"], namespace[f"j{index}"] = cls._field_converters(field)
+
+            if field.source.isidentifier():
+                getters.append(f"    v{index} = instance.{field.source}")
+            else:
+                namespace[f"f{index}"] = field
+                getters.append(f"    v{index} = f{index}.get_attribute(instance)")
+
+            dict_items.append(f"{name!r}: None if v{index} is None else p{index}(v{index})")
+            json_parts.append(f"{json.dumps(name)!r} + ':' + ('null' if v{index} is None else j{index}(v{index}))")
+
+        body = "\n".join(getters)
+        primitive_expression = "{" + ", ".join(dict_items) + "}"
+        json_expression = "'{' + " + (" + ',' + ".join(json_parts) or "''") + " + '}'"
+        source = (
+            f"def to_primitive(instance):\n{body}\n    return {primitive_expression}\n"
+            f"def to_json(instance):\n{body}\n    return {json_expression}\n"
+        )
+
+        exec(source, namespace)
+
+        return namespace["to_primitive"], namespace["to_json"]
+
+    @classmethod
+    def _field_converters(cls, field: serializers.Field):
+        """Return functions converting a non-null attribute into primitive data and into a JSON string."""
+
+        if isinstance(field, serializers.ListSerializer) and isinstance(field.child, serializers.Serializer):
+            child_to_primitive, child_to_json = cls._compile(field.child)
+            return (
+                lambda value: [child_to_primitive(item) for item in value],
+                lambda value: "[" + ",".join(map(child_to_json, value)) + "]",
+            )
+
+        if isinstance(field, serializers.Serializer):
+            return cls._compile(field)
+
+        if isinstance(field, serializers.BooleanField):
+            return field.to_representation, lambda value: cls._dumps(field.to_representation(value))
+
+        if isinstance(field, serializers.IntegerField):
+            return int, lambda value: int.__repr__(int(value))
+
+        if isinstance(field, serializers.CharField):
+            return str, lambda value: json.encoder.encode_basestring(str(value))
+
+        if (
+            isinstance(field, serializers.DecimalField)
+            and getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+            and not field.localize
+        ):
+            to_string = cls._decimal_to_string(field)
+            return to_string, lambda value: '"' + to_string(value) + '"'
+
+        return field.to_representation, lambda value: cls._dumps(field.to_representation(value))
+
+    @staticmethod
+    def _decimal_to_string(field: serializers.DecimalField):
+        """Return a function formatting a decimal exactly like DecimalField.to_representation."""
+
+        exponent = -field.decimal_places if field.decimal_places is not None else None
+
+        def to_string(value):
+            if isinstance(value, Decimal) and value.is_finite() and value.as_tuple().exponent == exponent:
+                return "{:f}".format(value)
+            return field.to_representation(value)
+
+        return to_string
+
+    @staticmethod
+    def _default(data):
+        return encoders.JSONEncoder().default(data)
+
+    @staticmethod
+    def _dumps(data) -> str:
+        return json.dumps(data, cls=encoders.JSONEncoder, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+    @staticmethod
+    def _finalize(content: str) -> bytes:
+        return content.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+
+    @staticmethod
+    def _escape_line_separators(content: bytes) -> bytes:
+        return content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
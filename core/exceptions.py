@@ -21,3 +21,13 @@ class ForbiddenException(APIException):
 class InstanceDoesNotExistError(ValidationError):
     def __init__(self, message="Instance does not exists", *args, **kwargs):
         super().__init__(message, *args, **kwargs)
+
+
+class InstanceAlreadyExistsError(ValidationError):
+    def __init__(self, message="Instance already exists", *args, **kwargs):
+        super().__init__(message, *args, **kwargs)
+
+
+class PreconditionFailedError(ValidationError):
+    def __init__(self, message="Precondition failed", *args, **kwargs):
+        super().__init__(message, *args, **kwargs)
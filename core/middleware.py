@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress responses with brotli or gzip, whichever is preferred by the client.
+
+    Responses smaller than RESPONSE_COMPRESSION_MIN_SIZE are sent as they are, since compressing
+    them saves less than it costs. Brotli is used only when the brotli package is installed,
+    event streams are never compressed, so every event reaches the client as soon as it is sent.
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE:
+            return response
+
+        if response.has_header("Content-Encoding") or response.get("Content-Type", "").startswith("text/event-stream"):
+            return response
+
+        if brotli is None or (response.streaming and response.is_async) or not self._prefers_brotli(request):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if response.streaming:
+            response.streaming_content = self._compress_sequence(response.streaming_content)
+            del response.headers["Content-Length"]
+        else:
+            compressed_content = brotli.compress(response.content, quality=settings.RESPONSE_BROTLI_QUALITY)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers["Content-Length"] = str(len(response.content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+
+        return response
+
+    @staticmethod
+    def _compress_sequence(sequence):
+        """Compress a sequence of chunks with brotli as a single stream."""
+
+        compressor = brotli.Compressor(quality=settings.RESPONSE_BROTLI_QUALITY)
+
+        for chunk in sequence:
+            compressed_chunk = compressor.process(chunk)
+            if compressed_chunk:
+                yield compressed_chunk
+
+        yield compressor.finish()
+
+    @classmethod
+    def _prefers_brotli(cls, request) -> bool:
+        """Check whether the client accepts brotli with at least the same preference as gzip."""
+
+        accepted_encodings = cls._parse_accept_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        brotli_quality = accepted_encodings.get("br", 0)
+
+        return brotli_quality > 0 and brotli_quality >= accepted_encodings.get("gzip", 0)
+
+    @staticmethod
+    def _parse_accept_encoding(header: str) -> dict[str, float]:
+        """Parse the Accept-Encoding header into the accepted encodings mapped to their quality values."""
+
+        encodings = {}
+
+        for item in header.split(","):
+            encoding, _, parameters = item.partition(";")
+            encoding = encoding.strip().lower()
+
+            if not encoding:
+                continue
+
+            quality = 1.0
+            parameter_name, _, value = parameters.partition("=")
+
+            if parameter_name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+            encodings[encoding] = quality
+
+        return encodings
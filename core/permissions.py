@@ -1,6 +1,6 @@
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.settings import api_settings
 
+from .authentication import CachedJWTAuthentication
 from .exceptions import ForbiddenException, UnauthorizedException
 
 
@@ -11,7 +11,7 @@ class JWTPermissionValidator:
     def validate_jwt_authentication_or_raise(cls, request):
         """Validate JWT token for authentication."""
 
-        jwt_auth = JWTAuthentication()
+        jwt_auth = CachedJWTAuthentication()
         header = jwt_auth.get_header(request)
         if not header or not cls._is_valid_auth_type(header):
             raise UnauthorizedException()
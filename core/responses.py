@@ -32,3 +32,16 @@ class AccessDeniedDetailSerializer(serializers.Serializer):
     """
 
     detail = serializers.CharField()
+
+
+class BulkValidationErrorResponseSerializer(serializers.Serializer):
+    """
+    Serializer for creating a validation error response for a batch of items.
+    Used to create a response that contains information about items of the batch that failed validation.
+    Fields:
+    - index (int): The position of the item in the batch.
+    - errors (dict): The names of the fields that failed validation along with a list of errors.
+    """
+
+    index = serializers.IntegerField()
+    errors = serializers.DictField(child=serializers.ListField())
@@ -0,0 +1,13 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme, TokenObtainPairSerializerExtension
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """OpenAPI security scheme of CachedJWTAuthentication, the same as of the JWTAuthentication it extends."""
+
+    target_class = "core.authentication.CachedJWTAuthentication"
+
+
+class SuperuserTokenObtainPairSerializerExtension(TokenObtainPairSerializerExtension):
+    """OpenAPI schema of the login serializer, the same as of the TokenObtainPairSerializer it extends."""
+
+    target_class = "core.serializers.SuperuserTokenObtainPairSerializer"
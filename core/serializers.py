@@ -0,0 +1,34 @@
+import time
+
+from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from .authentication import SUPERUSER_CLAIM, PRIVILEGES_ISSUED_AT_CLAIM, record_privilege_claims
+
+
+class SuperuserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token pair serializer embedding the superuser status of the user, signed as a token claim."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[SUPERUSER_CLAIM] = user.is_superuser
+        # Unlike "iat", this claim is copied unchanged to access tokens and rotated refresh tokens,
+        # so it always tells when the embedded privileges were read from the database.
+        token[PRIVILEGES_ISSUED_AT_CLAIM] = int(time.time())
+        record_privilege_claims(user.pk, token[PRIVILEGES_ISSUED_AT_CLAIM])
+        return token
+
+
+class PoolStatsSerializer(serializers.Serializer):
+    alias = serializers.CharField()
+    max_size = serializers.IntegerField()
+    size = serializers.IntegerField()
+    in_use = serializers.IntegerField()
+    idle = serializers.IntegerField()
+    waiting = serializers.IntegerField()
+    acquired = serializers.IntegerField()
+    waited = serializers.IntegerField()
+    wait_time_total = serializers.FloatField()
+    wait_time_max = serializers.FloatField()
+    timeouts = serializers.IntegerField()
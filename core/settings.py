@@ -46,11 +46,13 @@ INSTALLED_APPS = [
     "rest_framework",
     "drf_spectacular",
     # apps
+    'core',
     'products',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -80,21 +82,88 @@ TEMPLATES = [
 WSGI_APPLICATION = 'core.wsgi.application'
 
 
+# Production server mode, "wsgi" or "asgi" when served by the gunicorn workers of gunicorn.conf.py, empty otherwise
+
+SERVER_MODE = os.environ.get("SERVER_MODE", "")
+
+
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Take connections from a bounded pool of every process instead of opening one per thread.
+# The pool keeps the number of connections to the database fixed however many threads serve requests.
+
+DB_POOL_ENABLED = os.environ.get("DB_POOL_ENABLED", "false").lower() == "true"
+
 DATABASES = {
     'default': {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "core.db.backends.postgresql" if DB_POOL_ENABLED else "django.db.backends.postgresql",
         "NAME": os.environ.get("POSTGRES_DB"),
         "USER": os.environ.get("POSTGRES_USER"),
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
         "HOST": os.environ.get("POSTGRES_HOST"),
         "PORT": os.environ.get("POSTGRES_DB_PORT"),
+        # Keep connections open between requests of a worker thread and check them before reuse.
+        # Under ASGI every request runs in its own context, so connections are closed after each request.
+        # Pooled connections are returned to the pool after each request instead.
+        "CONN_MAX_AGE": int(
+            os.environ.get(
+                "DB_CONN_MAX_AGE",
+                0 if DB_POOL_ENABLED or SERVER_MODE == "asgi" else 60,
+            )
+        ),
+        "CONN_HEALTH_CHECKS": os.environ.get("DB_CONN_HEALTH_CHECKS", "true").lower() == "true",
+        # Maximum number of connections of every process and maximum time to wait for one, in seconds
+        "POOL": {
+            "MAX_SIZE": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+            "TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The in-memory cache is private to every process, so the gunicorn workers of SERVER_MODE require a shared cache
+# such as Redis, otherwise changes would invalidate the cached products and lists of a single worker (see checks.py).
+
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache")
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    },
+    # Privilege changes of users trusted by JWT_STATELESS_SUPERUSER_CHECK, kept apart from the cached products.
+    # By default on the same cache server as the default cache, or in a separate in-memory cache.
+    "privileges": {
+        "BACKEND": os.environ.get("PRIVILEGES_CACHE_BACKEND", CACHE_BACKEND),
+        "LOCATION": os.environ.get("PRIVILEGES_CACHE_LOCATION", os.environ.get("CACHE_LOCATION", "privileges")),
+        "KEY_PREFIX": "privileges",
+    },
+}
+
+# Lifetime of cached products and maximum time to wait for a product being loaded by another request, in seconds
+
+PRODUCT_CACHE_TIMEOUT = int(os.environ.get("PRODUCT_CACHE_TIMEOUT", 300))
+
+PRODUCT_CACHE_LOCK_TIMEOUT = int(os.environ.get("PRODUCT_CACHE_LOCK_TIMEOUT", 5))
+
+# Lifetime of cached results derived from the whole catalog, such as rendered product lists, in seconds
+
+PRODUCT_CATALOG_CACHE_TIMEOUT = int(os.environ.get("PRODUCT_CATALOG_CACHE_TIMEOUT", 60))
+
+# PostgreSQL text search configuration used to build search vectors of products and to parse search queries
+
+PRODUCT_SEARCH_CONFIG = os.environ.get("PRODUCT_SEARCH_CONFIG", "english")
+
+# Minimum size of a response body compressed by the CompressionMiddleware, in bytes, and the brotli quality (0-11)
+
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.environ.get("RESPONSE_COMPRESSION_MIN_SIZE", 1024))
+
+RESPONSE_BROTLI_QUALITY = int(os.environ.get("RESPONSE_BROTLI_QUALITY", 4))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -137,10 +206,42 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": ("rest_framework_simplejwt.authentication.JWTAuthentication",),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("core.authentication.CachedJWTAuthentication",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Number of rows fetched from the database at a time by the streaming product export
+
+PRODUCT_EXPORT_CHUNK_SIZE = int(os.environ.get("PRODUCT_EXPORT_CHUNK_SIZE", 2000))
+
+# Number of rows written by a single query and maximum number of products per request of the bulk product API
+
+PRODUCT_BULK_BATCH_SIZE = int(os.environ.get("PRODUCT_BULK_BATCH_SIZE", 1000))
+
+PRODUCT_BULK_MAX_ITEMS = int(os.environ.get("PRODUCT_BULK_MAX_ITEMS", 50000))
+
+# Stream of product changes: seconds between polls of the change log when no notification arrives, seconds between
+# keep-alive comments, seconds after which a stream ends and its client reconnects, and changes buffered per client
+
+PRODUCT_EVENTS_POLL_INTERVAL = float(os.environ.get("PRODUCT_EVENTS_POLL_INTERVAL", 5))
+
+PRODUCT_EVENTS_HEARTBEAT_INTERVAL = float(os.environ.get("PRODUCT_EVENTS_HEARTBEAT_INTERVAL", 15))
+
+PRODUCT_EVENTS_MAX_DURATION = float(os.environ.get("PRODUCT_EVENTS_MAX_DURATION", 300))
+
+PRODUCT_EVENTS_QUEUE_SIZE = int(os.environ.get("PRODUCT_EVENTS_QUEUE_SIZE", 1000))
+
+# Trust the superuser claim embedded in tokens at login instead of loading the user from the database.
+# Privilege changes are propagated through the "privileges" cache, so it must be shared between processes.
+
+JWT_STATELESS_SUPERUSER_CHECK = os.environ.get("JWT_STATELESS_SUPERUSER_CHECK", "false").lower() == "true"
+
+# Maximum number of validated tokens kept in memory by every process and their lifetime in seconds
+
+JWT_VALIDATED_TOKEN_CACHE_SIZE = int(os.environ.get("JWT_VALIDATED_TOKEN_CACHE_SIZE", 1024))
+
+JWT_VALIDATED_TOKEN_CACHE_TIMEOUT = int(os.environ.get("JWT_VALIDATED_TOKEN_CACHE_TIMEOUT", 30))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Test Task ICAP Group Gmbh",
     "VERSION": "1.0.0",
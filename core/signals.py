@@ -0,0 +1,16 @@
+from .authentication import revoke_privilege_claims
+
+
+def revoke_claims_on_user_save(sender, instance, update_fields=None, **kwargs):
+    """Revoke the privilege claims of the user's tokens whenever the user changes, except on login."""
+
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+
+    revoke_privilege_claims(instance.pk)
+
+
+def revoke_claims_on_user_delete(sender, instance, **kwargs):
+    """Revoke the privilege claims of the deleted user's tokens."""
+
+    revoke_privilege_claims(instance.pk)
@@ -0,0 +1,246 @@
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache, caches
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase, override_settings
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.authentication import CachedJWTAuthentication, ValidatedTokenCache
+from core.cache import GenerationalCache
+from core.db.pool import ConnectionPool, PoolTimeoutError
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+    """Tests of checking connections out of the pool and returning them."""
+
+    def test_acquire_reuses_released_connection(self):
+        pool = ConnectionPool("default", max_size=2, timeout=1)
+        connection = object()
+
+        self.assertIs(pool.acquire(lambda: connection), connection)
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(lambda: self.fail("A new connection was opened")), connection)
+        stats = pool.stats()
+        self.assertEqual((stats.size, stats.in_use, stats.idle, stats.acquired), (1, 1, 0, 2))
+
+    def test_acquire_waits_for_released_connection_when_pool_is_full(self):
+        pool = ConnectionPool("default", max_size=1, timeout=5)
+        connection = pool.acquire(object)
+
+        release = threading.Timer(0.05, pool.release, (connection,))
+        release.start()
+        self.addCleanup(release.join)
+
+        self.assertIs(pool.acquire(lambda: self.fail("The pool opened more connections than its size")), connection)
+        stats = pool.stats()
+        self.assertEqual((stats.size, stats.waited, stats.timeouts), (1, 1, 0))
+        self.assertGreater(stats.wait_time_max, 0)
+
+    def test_acquire_times_out_when_pool_is_full(self):
+        pool = ConnectionPool("default", max_size=1, timeout=0.05)
+        pool.acquire(object)
+
+        with self.assertRaises(PoolTimeoutError):
+            pool.acquire(object)
+
+        stats = pool.stats()
+        self.assertEqual((stats.size, stats.in_use, stats.waiting, stats.timeouts), (1, 1, 0, 1))
+
+    def test_failed_connect_frees_its_place(self):
+        pool = ConnectionPool("default", max_size=1, timeout=0.05)
+
+        def connect():
+            raise ConnectionError
+
+        with self.assertRaises(ConnectionError):
+            pool.acquire(connect)
+
+        connection = object()
+        self.assertIs(pool.acquire(lambda: connection), connection)
+        self.assertEqual(pool.stats().size, 1)
+
+    def test_release_of_unusable_connection_discards_it(self):
+        pool = ConnectionPool("default", max_size=1, timeout=0.05)
+        broken = pool.acquire(object)
+
+        pool.release(broken, reusable=False)
+
+        connection = object()
+        self.assertIs(pool.acquire(lambda: connection), connection)
+        stats = pool.stats()
+        self.assertEqual((stats.size, stats.idle), (1, 0))
+
+
+class PooledSQLiteBackendTestCase(SimpleTestCase):
+    """Tests of the pooled SQLite backend, which takes connections from the pool and returns them on close."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.connections = ConnectionHandler(
+            {
+                "default": {
+                    "ENGINE": "core.db.backends.sqlite3",
+                    "NAME": os.path.join(directory.name, "db.sqlite3"),
+                    "POOL": {"MAX_SIZE": 1, "TIMEOUT": 0.05},
+                }
+            }
+        )
+        self.addCleanup(self.connections.close_all)
+
+        self.connection = self.connections["default"]
+        with self.connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE item (name TEXT)")
+
+    def test_close_returns_connection_to_pool(self):
+        raw_connection = self.connection.connection
+
+        self.connection.close()
+
+        stats = self.connection.get_pool().stats()
+        self.assertEqual((stats.size, stats.in_use, stats.idle), (1, 0, 1))
+
+        self.connection.ensure_connection()
+        self.assertIs(self.connection.connection, raw_connection)
+
+    def test_close_rolls_back_open_transaction(self):
+        self.connection.set_autocommit(False)
+        with self.connection.cursor() as cursor:
+            cursor.execute("INSERT INTO item (name) VALUES ('uncommitted')")
+
+        self.connection.close()
+
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM item")
+            self.assertEqual(cursor.fetchone(), (0,))
+        self.assertFalse(self.connection.connection.in_transaction)
+
+    def test_close_discards_connection_that_cannot_be_reset(self):
+        raw_connection = self.connection.connection
+        raw_connection.close()
+
+        self.connection.close()
+
+        self.assertEqual(self.connection.get_pool().stats().size, 0)
+
+        self.connection.ensure_connection()
+        self.assertIsNot(self.connection.connection, raw_connection)
+
+    def test_connection_waits_for_the_pool_when_it_is_full(self):
+        other_thread_errors = []
+
+        def connect_from_other_thread():
+            other_connections = ConnectionHandler({"default": self.connection.settings_dict})
+            try:
+                other_connections["default"].ensure_connection()
+            except PoolTimeoutError as error:
+                other_thread_errors.append(error)
+            finally:
+                other_connections.close_all()
+
+        thread = threading.Thread(target=connect_from_other_thread)
+        started = time.monotonic()
+        thread.start()
+        thread.join()
+
+        self.assertEqual(len(other_thread_errors), 1)
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertEqual(self.connection.get_pool().stats().timeouts, 1)
+
+
+@override_settings(JWT_STATELESS_SUPERUSER_CHECK=True)
+class CachedJWTAuthenticationTestCase(SimpleTestCase):
+    """Tests of the cache of validated tokens."""
+
+    def setUp(self):
+        self.authentication = CachedJWTAuthentication()
+        self.authentication.token_cache = ValidatedTokenCache(max_size=10, timeout=60)
+
+    def test_repeated_token_is_validated_once(self):
+        raw_token = str(AccessToken()).encode()
+
+        validated_token = self.authentication.get_validated_token(raw_token)
+
+        self.assertIs(self.authentication.get_validated_token(raw_token), validated_token)
+
+    def test_token_sharing_the_signature_of_a_cached_token_is_rejected(self):
+        token = AccessToken()
+        token["user_id"] = 1
+        raw_token = str(token).encode()
+        self.authentication.get_validated_token(raw_token)
+
+        token["user_id"] = 2
+        header, payload, _ = str(token).encode().split(b".")
+        forged_token = b".".join((header, payload, raw_token.rpartition(b".")[2]))
+
+        with self.assertRaises(InvalidToken):
+            self.authentication.get_validated_token(forged_token)
+
+    def test_invalid_token_is_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(InvalidToken):
+                self.authentication.get_validated_token(b"malformed")
+
+        self.assertEqual(len(self.authentication.token_cache._entries), 0)
+
+
+class GenerationalCacheTestCase(SimpleTestCase):
+    """Tests of loading missing entries of a generational cache."""
+
+    concurrency = 20
+
+    def setUp(self):
+        cache.clear()
+        self.cache = GenerationalCache("test", timeout=60, lock_timeout=5, poll_interval=0.01)
+
+    def test_concurrent_misses_load_entry_once(self):
+        loads = []
+
+        def loader():
+            loads.append(threading.get_ident())
+            time.sleep(0.05)
+            return "value"
+
+        values = []
+        threads = [
+            threading.Thread(target=lambda: values.append(self.cache.get_or_load("key", loader)))
+            for _ in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(values, ["value"] * self.concurrency)
+        self.assertEqual(len(loads), 1)
+
+    def test_entry_stored_before_the_lock_is_taken_is_not_loaded_again(self):
+        backend = caches["default"]
+        add = backend.add
+
+        def add_after_another_load(*args, **kwargs):
+            # Another caller loads and stores the entry between the miss and taking the lock
+            with mock.patch.object(backend, "add", add):
+                self.cache.get_or_load("key", lambda: "value")
+
+            return add(*args, **kwargs)
+
+        with mock.patch.object(backend, "add", add_after_another_load):
+            value = self.cache.get_or_load("key", lambda: self.fail("The entry was loaded again"))
+
+        self.assertEqual(value, "value")
+
+    def test_removed_entry_is_not_stored_by_earlier_load(self):
+        _, generation = self.cache.get("key")
+
+        self.cache.delete("key")
+        self.cache.set("key", "stale", generation)
+
+        self.assertEqual(self.cache.get("key")[0], None)
@@ -0,0 +1,44 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from .db.pool import get_pools_stats
+from .permissions import JWTPermissionValidator
+from .responses import AccessDeniedDetailSerializer
+from .serializers import SuperuserTokenObtainPairSerializer, PoolStatsSerializer
+
+
+class SuperuserTokenObtainPairView(TokenObtainPairView):
+    """Login view issuing tokens with the embedded superuser status."""
+
+    serializer_class = SuperuserTokenObtainPairSerializer
+
+
+class ApiDatabasePoolMetricsView(APIView):
+    """
+    The ApiDatabasePoolMetricsView class defines API endpoint for monitoring the database connection pools
+    of the process serving the request. The list is empty if the pooled database backend is not used.
+    """
+
+    @extend_schema(
+        summary="Retrieve metrics of the database connection pools",
+        responses={
+            200: PoolStatsSerializer(many=True),
+            401: AccessDeniedDetailSerializer,
+            403: AccessDeniedDetailSerializer,
+        },
+        tags=["Metrics"],
+    )
+    def get(self, request):
+        """Handle GET request to retrieve the metrics of the connection pools."""
+
+        JWTPermissionValidator.is_superuser_or_raise(request)
+
+        pools_stats = PoolStatsSerializer(get_pools_stats(), many=True)
+
+        return Response(
+            data=pools_stats.data,
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,108 @@
+"""
+Gunicorn configuration of the production server.
+
+Every setting can be overridden with an environment variable:
+
+    SERVER_MODE         "wsgi" runs threaded workers, "asgi" runs uvicorn workers for the async views.
+    WEB_CONCURRENCY     Number of worker processes, 2 * CPU cores + 1 by default,
+                        lowered to keep the database connections within DB_MAX_CONNECTIONS.
+    GUNICORN_THREADS    Number of threads per worker process of the "wsgi" mode.
+    GUNICORN_BIND       Address the server listens on.
+    GUNICORN_TIMEOUT    Seconds a worker may spend on a request before it is restarted.
+    GUNICORN_KEEPALIVE  Seconds to keep an idle client connection open.
+    GUNICORN_MAX_REQUESTS  Number of requests after which a worker is restarted, 0 disables restarts.
+    DB_MAX_CONNECTIONS  Number of database connections the server may keep open, 90 by default, which leaves
+                        room for maintenance sessions within the default max_connections=100 of PostgreSQL.
+                        The server refuses to start if the workers could open more connections than that.
+"""
+
+import multiprocessing
+import os
+
+server_mode = os.environ.get("SERVER_MODE", "wsgi")
+
+wsgi_app = "core.asgi:application" if server_mode == "asgi" else "core.wsgi:application"
+worker_class = "uvicorn.workers.UvicornWorker" if server_mode == "asgi" else "gthread"
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+threads = int(os.environ.get("GUNICORN_THREADS", 4)) if server_mode != "asgi" else 1
+db_max_connections = int(os.environ.get("DB_MAX_CONNECTIONS", 90))
+
+
+def get_connections_per_worker():
+    """Return the maximum number of database connections of a worker process, or None if it is not bounded."""
+
+    # Settings are not loaded yet, so the same environment variables as in core/settings.py are read
+    if os.environ.get("DB_POOL_ENABLED", "false").lower() == "true":
+        return int(os.environ.get("DB_POOL_MAX_SIZE", 10))
+
+    # Under ASGI connections are opened per request and closed after it, their number follows the traffic
+    if server_mode == "asgi":
+        return None
+
+    # Every worker thread keeps its own persistent connection
+    return threads
+
+
+connections_per_worker = get_connections_per_worker()
+
+if "WEB_CONCURRENCY" in os.environ:
+    workers = int(os.environ["WEB_CONCURRENCY"])
+elif connections_per_worker is not None:
+    workers = max(1, min(multiprocessing.cpu_count() * 2 + 1, db_max_connections // connections_per_worker))
+else:
+    workers = multiprocessing.cpu_count() * 2 + 1
+
+if connections_per_worker is not None and workers * connections_per_worker > db_max_connections:
+    raise ValueError(
+        f"{workers} worker(s) may open up to {workers * connections_per_worker} database connections, "
+        f"more than DB_MAX_CONNECTIONS={db_max_connections}. Lower WEB_CONCURRENCY, GUNICORN_THREADS "
+        f"or DB_POOL_MAX_SIZE, or raise DB_MAX_CONNECTIONS together with max_connections of the database."
+    )
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    """Report the effective concurrency and database connection settings once the server is ready."""
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+    from django.conf import settings
+
+    database = settings.DATABASES["default"]
+    conn_max_age = database.get("CONN_MAX_AGE", 0)
+
+    if server_mode == "asgi":
+        concurrency = "unbounded, async views share the event loop of each worker"
+    else:
+        concurrency = f"{workers * threads} requests"
+
+    if connections_per_worker is None:
+        connections = "not bounded, one per concurrent request"
+    else:
+        connections = f"up to {workers * connections_per_worker} of DB_MAX_CONNECTIONS={db_max_connections}"
+
+    server.log.info(
+        "Serving %s with %d %s worker(s) x %d thread(s), concurrency: %s",
+        wsgi_app,
+        workers,
+        worker_class,
+        threads,
+        concurrency,
+    )
+    server.log.info(
+        "Database connections: %s, CONN_MAX_AGE=%s, CONN_HEALTH_CHECKS=%s",
+        connections,
+        conn_max_age,
+        database.get("CONN_HEALTH_CHECKS", False),
+    )
+
+    if server_mode == "asgi" and conn_max_age:
+        server.log.warning("Persistent database connections are not reused under ASGI, set DB_CONN_MAX_AGE=0")
@@ -0,0 +1,247 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from core.conditional import make_etag, make_version_etag, get_not_modified_response, set_validators
+from core.containers import ServiceContainer, CacheContainer, EventContainer
+from core.permissions import JWTPermissionValidator
+from core.exceptions import InstanceDoesNotExistError, InstanceAlreadyExistsError
+from .dto import NewProductDTO, ProductChangeDTO
+from .events import ProductChangeStream, ProductChangeSubscription
+from .serializers import ProductCreateSerializer, ProductQueryParamsSerializer, ProductEventsQueryParamsSerializer
+from .renderers import ProductJSONRenderer
+from .views import ApiProductListView
+
+
+class AsyncApiView(View):
+    """
+    Base class of the asynchronous API views.
+    The views are served without blocking the event loop when the project runs under ASGI,
+    and, like DRF views, authenticate with JWT instead of session cookies, so they are exempt from CSRF checks.
+    """
+
+    renderer = ProductJSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    def render(self, data, status_code=status.HTTP_200_OK) -> HttpResponse:
+        """Create a JSON response with the rendered data."""
+
+        return HttpResponse(self.renderer.render(data), content_type=self.renderer.media_type, status=status_code)
+
+    async def is_superuser_or_error(self, request):
+        """Check permission to only allow superuser, returning an error response if it is denied."""
+
+        try:
+            await sync_to_async(JWTPermissionValidator.is_superuser_or_raise)(request)
+        except APIException as exception:
+            return self.render({"detail": exception.detail}, exception.status_code)
+
+        return None
+
+
+class AsyncApiProductListView(AsyncApiView):
+    """
+    The AsyncApiProductListView class is the asynchronous counterpart of ApiProductListView.
+    It shares the catalog cache and the validators of the rendered lists with ApiProductListView.
+    """
+
+    async def post(self, request):
+        """Handle POST request to create product."""
+
+        error_response = await self.is_superuser_or_error(request)
+
+        if error_response is not None:
+            return error_response
+
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return self.render({"detail": "JSON parse error"}, status.HTTP_400_BAD_REQUEST)
+
+        product_serializer = ProductCreateSerializer(data=data)
+
+        if not product_serializer.is_valid():
+            return self.render(product_serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        product_service = ServiceContainer.async_product_service()
+
+        new_product_dto = NewProductDTO(**product_serializer.validated_data)
+
+        try:
+            product_dto = await product_service.create_product(new_product_dto)
+        except InstanceAlreadyExistsError as exception:
+            return self.render({"error": str(exception.message)}, status.HTTP_409_CONFLICT)
+
+        return self.render(product_dto, status.HTTP_201_CREATED)
+
+    async def get(self, request):
+        """Handle GET request to retrieve all products data."""
+
+        query_params_serializer = ProductQueryParamsSerializer(data=ApiProductListView._query_params_data(request.GET))
+
+        if not query_params_serializer.is_valid():
+            return self.render(query_params_serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        query_params_dto = ApiProductListView._query_params_to_dto(query_params_serializer.validated_data)
+
+        product_service = ServiceContainer.async_product_service()
+
+        catalog_cache = CacheContainer.catalog_cache()
+        cache_key = ApiProductListView._list_cache_key(query_params_dto)
+
+        cached_list, _ = await catalog_cache.aget(cache_key)
+
+        if cached_list is not None:
+            etag, content = cached_list
+            return ApiProductListView._conditional_list_response(request, self.renderer, etag, content)
+
+        version_dto = await product_service.get_products_version(query_params_dto)
+
+        etag = make_etag("products", cache_key, version_dto.count, version_dto.last_modified, self.renderer.format)
+
+        not_modified = get_not_modified_response(request, etag, None)
+
+        if not_modified is not None:
+            return not_modified
+
+        async def load_list():
+            product_page_dto = await product_service.get_products(query_params_dto)
+            content = self.renderer.render(
+                product_page_dto.items if query_params_dto.limit is None else product_page_dto,
+                renderer_context={"fields": query_params_dto.fields},
+            )
+            return etag, content
+
+        try:
+            _, content = await catalog_cache.aget_or_load(cache_key, load_list)
+        except InstanceDoesNotExistError as exception:
+            return self.render({"error": str(exception.message)}, status.HTTP_404_NOT_FOUND)
+
+        return ApiProductListView._conditional_list_response(request, self.renderer, etag, content)
+
+
+class AsyncApiProductDetailView(AsyncApiView):
+    """The AsyncApiProductDetailView class is the asynchronous counterpart of ApiProductDetailView for reading."""
+
+    async def get(self, request, id):
+        """Handle GET request to retrieve product data."""
+
+        product_service = ServiceContainer.async_product_service()
+
+        try:
+            version_dto = await product_service.get_product_version(id)
+        except InstanceDoesNotExistError as exception:
+            return self.render({"error": str(exception.message)}, status.HTTP_404_NOT_FOUND)
+
+        etag = make_version_etag(version_dto.version, self.renderer.format)
+
+        not_modified = get_not_modified_response(request, etag, version_dto.last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
+        try:
+            product_dto = await product_service.get_product(id)
+        except InstanceDoesNotExistError as exception:
+            return self.render({"error": str(exception.message)}, status.HTTP_404_NOT_FOUND)
+
+        return set_validators(self.render(product_dto), etag, version_dto.last_modified)
+
+
+class AsyncApiProductEventsView(AsyncApiView):
+    """
+    The AsyncApiProductEventsView class streams changes of products to clients as server-sent events
+    while they are made, optionally only changes of the given products or categories.
+
+    Every event carries the sequence number of the change as its id, the operation as its type and the change
+    as its data. A reconnecting client sends the id of the last event it received in the Last-Event-ID header,
+    and the changes it missed are read from the change log first. Streams end after PRODUCT_EVENTS_MAX_DURATION
+    seconds and clients reconnect, so the connections of clients which went away are eventually released.
+    """
+
+    # Milliseconds a client waits before reconnecting when a stream ends
+    retry = 1000
+
+    async def get(self, request):
+        """Handle GET request to stream changes of products."""
+
+        if not isinstance(request, ASGIRequest):
+            return self.render(
+                {"detail": "Event streams are served only by the ASGI application."},
+                status.HTTP_501_NOT_IMPLEMENTED,
+            )
+
+        data = request.GET.dict()
+
+        for name in ("id", "category"):
+            if name in request.GET:
+                data[name] = request.GET.getlist(name)
+
+        if "since" not in data and "Last-Event-ID" in request.headers:
+            data["since"] = request.headers["Last-Event-ID"]
+
+        query_params_serializer = ProductEventsQueryParamsSerializer(data=data)
+
+        if not query_params_serializer.is_valid():
+            return self.render(query_params_serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        query_params = query_params_serializer.validated_data
+
+        product_change_stream = EventContainer.product_change_stream()
+        subscription = await product_change_stream.subscribe(
+            frozenset(query_params.get("id", ())),
+            frozenset(query_params.get("category", ())),
+        )
+
+        response = StreamingHttpResponse(
+            self._events(product_change_stream, subscription, query_params.get("since")),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+
+        return response
+
+    async def _events(self, product_change_stream: ProductChangeStream, subscription: ProductChangeSubscription, since):
+        """Generate the events of a subscription, sending keep-alive comments while there are no changes."""
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.PRODUCT_EVENTS_MAX_DURATION
+
+        try:
+            yield f"retry: {self.retry}\n\n".encode()
+
+            if since is not None:
+                async for change_dto in product_change_stream.backlog(subscription, since):
+                    yield self._render_event(change_dto)
+
+            while not subscription.closed and (remaining := deadline - loop.time()) > 0:
+                change_dto = await subscription.next_change(min(settings.PRODUCT_EVENTS_HEARTBEAT_INTERVAL, remaining))
+
+                if change_dto is not None:
+                    yield self._render_event(change_dto)
+                elif not subscription.closed:
+                    yield b": keep-alive\n\n"
+        finally:
+            product_change_stream.unsubscribe(subscription)
+
+    def _render_event(self, change_dto: ProductChangeDTO) -> bytes:
+        """Render a change of a product as a server-sent event."""
+
+        return b"id: %d\nevent: %s\ndata: %s\n\n" % (
+            change_dto.seq,
+            change_dto.operation.encode(),
+            self.renderer.render(change_dto),
+        )
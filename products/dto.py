@@ -1,8 +1,12 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, fields as dc_fields
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Optional
 
+# Data transfer objects are slotted, so they carry no __dict__, which matters for lists of many thousands of them
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class NewProductDTO:
     name: str
     photo: str
@@ -13,9 +17,10 @@ class NewProductDTO:
     description1: str
     description2: str
     price: float
+    sku: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProductDTO:
     id: int
     name: str
@@ -27,9 +32,10 @@ class ProductDTO:
     description1: str
     description2: str
     price: float
+    sku: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PartialProductDTO:
     name: Optional[str] = None
     photo: Optional[str] = None
@@ -40,16 +46,93 @@ class PartialProductDTO:
     description1: Optional[str] = None
     description2: Optional[str] = None
     price: Optional[float] = None
+    sku: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class QueryParamsDTO:
     offer_of_the_month: Optional[bool] = None
     availability: Optional[bool] = None
     self_pickup: Optional[bool] = None
+    ids: Optional[tuple[int, ...]] = None
+    categories: Optional[tuple[str, ...]] = None
+    price_min: Optional[float] = None
+    price_max: Optional[float] = None
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+    ordering: Optional[str] = None
+    fields: Optional[tuple[str, ...]] = None
+
+
+@dataclass(frozen=True, slots=True)
+class CursorDTO:
+    ordering: str
+    reverse: bool
+    values: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class ProductPageDTO:
+    items: list[ProductDTO]
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class SearchQueryDTO:
+    query: str
+    limit: int = 20
+    offset: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class ProductSearchResultDTO:
+    items: list[ProductDTO]
+    next_offset: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryFacetDTO:
+    category: str
+    count: int
+    price_min: float
+    price_max: float
+    price_avg: float
+
+
+@dataclass(frozen=True, slots=True)
+class FlagFacetDTO:
+    true_count: int = 0
+    false_count: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class ProductFacetsDTO:
+    count: int
+    categories: list[CategoryFacetDTO]
+    offer_of_the_month: FlagFacetDTO
+    availability: FlagFacetDTO
+    self_pickup: FlagFacetDTO
+
+
+@dataclass(frozen=True, slots=True)
+class ProductChangeDTO:
+    seq: int
+    product_id: int
+    operation: str
+    changed_at: datetime
+    product: Optional[ProductDTO] = None
+    previous_category: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ProductChangesDTO:
+    changes: list[ProductChangeDTO]
+    next_since: int
+    has_more: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GetProductDTO:
     id: int
     name: str
@@ -60,3 +143,70 @@ class GetProductDTO:
     self_pickup: bool
     description: str
     price: float
+    sku: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    version: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class VersionDTO:
+    count: int
+    last_modified: Optional[datetime]
+    version: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class UpdatedProductDTO:
+    product: ProductDTO
+    version: int
+    last_modified: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class ProductBatchDTO:
+    products: list[GetProductDTO]
+    missing_ids: list[int]
+
+
+@lru_cache(maxsize=None)
+def row_constructor(dto_class: type, fields: Optional[tuple[str, ...]] = None) -> Callable[[tuple], object]:
+    """
+    Generate a function building data transfer objects from rows of the data storage.
+
+    The slots of the object are set directly, skipping the generated __init__ of frozen dataclasses,
+    which sets every field through object.__setattr__. Fields which are not in the row are set to None.
+
+    Args:
+        dto_class (type): The slotted data transfer object class.
+        fields (Optional[tuple[str, ...]]): The names of the fields in the order of the row columns,
+            all fields in the order of their declaration by default.
+
+    Returns:
+        Callable - The function converting a row tuple into a data transfer object.
+    """
+
+    all_fields = tuple(field.name for field in dc_fields(dto_class))
+    fields = all_fields if fields is None else fields
+    missing_fields = [field for field in all_fields if field not in fields]
+
+    namespace = {"new": object.__new__, "dto_class": dto_class}
+    lines = ["def from_row(row):"]
+
+    if fields:
+        lines.append(f"    {', '.join(f'v{index}' for index in range(len(fields)))}, = row")
+
+    lines.append("    instance = new(dto_class)")
+
+    for index, field in enumerate(fields):
+        namespace[f"set{index}"] = getattr(dto_class, field).__set__
+        lines.append(f"    set{index}(instance, v{index})")
+
+    for index, field in enumerate(missing_fields, len(fields)):
+        namespace[f"set{index}"] = getattr(dto_class, field).__set__
+        lines.append(f"    set{index}(instance, None)")
+
+    lines.append("    return instance")
+
+    exec("\n".join(lines), namespace)
+
+    return namespace["from_row"]
@@ -0,0 +1,368 @@
+import asyncio
+import logging
+import select
+import threading
+from collections import defaultdict
+from typing import AsyncIterator, Optional
+
+from django.db import connection, connections, transaction
+from django.dispatch import Signal
+
+from .dto import ProductChangeDTO
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL channel notified when changes of products are logged, listened to by the streams of every process
+
+PRODUCT_CHANGES_CHANNEL = "product_changes"
+
+# Sent in the process which logged changes of products once their transaction is committed
+
+product_changes_logged = Signal()
+
+
+def notify_product_changes() -> None:
+    """
+    Let the product change streams know that new changes were logged in the current transaction.
+
+    On PostgreSQL the channel is notified, which reaches the streams of every process once the transaction
+    is committed, and notifications of the same transaction are delivered only once. Other databases have
+    no notifications, so only the streams of the current process are woken up, the others poll the log.
+    """
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"NOTIFY {PRODUCT_CHANGES_CHANNEL}")
+    else:
+        transaction.on_commit(lambda: product_changes_logged.send(sender=None))
+
+
+def _change_categories(change_dto: ProductChangeDTO) -> Optional[set[str]]:
+    """Get the categories a change concerns, the current and the previous one, or None if neither is known."""
+
+    categories = set()
+
+    if change_dto.product is not None:
+        categories.add(change_dto.product.category)
+
+    if change_dto.previous_category is not None:
+        categories.add(change_dto.previous_category)
+
+    return categories or None
+
+
+class ProductChangeSubscription:
+    """
+    A subscription to changes of products, limited to the given products and categories if any.
+    Changes are buffered in a bounded queue, a subscriber which falls behind is closed and should
+    resume from the last change it received, reading the missed changes from the change log.
+    """
+
+    def __init__(self, product_ids: frozenset[int], categories: frozenset[str], queue_size: int):
+        self.product_ids = product_ids
+        self.categories = categories
+        self.last_seq = 0
+        self.closed = False
+        self._queue = asyncio.Queue(queue_size)
+
+    def matches(self, change_dto: ProductChangeDTO) -> bool:
+        """
+        Check whether a change is of interest to the subscriber.
+        A product moved to another category is of interest to the subscribers of both categories. If the category
+        of a deleted product is unknown, the deletion is sent to every subscriber of categories.
+        """
+
+        if not self.product_ids and not self.categories:
+            return True
+
+        if change_dto.product_id in self.product_ids:
+            return True
+
+        change_categories = _change_categories(change_dto)
+
+        if change_categories is None:
+            return bool(self.categories)
+
+        return not self.categories.isdisjoint(change_categories)
+
+    def push(self, change_dto: ProductChangeDTO) -> None:
+        """Queue a change for the subscriber, closing the subscription if its queue is full."""
+
+        if self.closed:
+            return
+
+        try:
+            self._queue.put_nowait(change_dto)
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self) -> None:
+        """Close the subscription, dropping the queued changes and waking up the subscriber."""
+
+        self.closed = True
+
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+        self._queue.put_nowait(None)
+
+    async def next_change(self, timeout: float) -> Optional[ProductChangeDTO]:
+        """
+        Wait for the next change which was not received yet.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait.
+
+        Returns:
+            Optional[ProductChangeDTO] - The change, or None if there was none in time or the subscription was closed.
+        """
+
+        while not self.closed:
+            try:
+                change_dto = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+            if change_dto is not None and change_dto.seq > self.last_seq:
+                self.last_seq = change_dto.seq
+                return change_dto
+
+        return None
+
+
+class ProductChangeStream:
+    """
+    Per-process fan-out of product changes to the subscribers of the event stream.
+
+    A single dispatcher task of the event loop reads new changes from the change log and pushes them to the
+    matching subscribers, so the database is queried once per batch of changes however many connections
+    are open, and idle subscribers cost nothing but their queue. Subscribers are indexed by the products
+    and categories they are interested in, so a change is matched only against its own subscribers.
+
+    The dispatcher is woken up by notifications: on PostgreSQL a dedicated connection listens to the channel
+    in a background thread, on other databases the commits of the current process send a signal. The change
+    log is also polled periodically, so no change is lost when a notification is. The change log is numbered
+    in commit order (see BaseProductRepository._lock_change_log), so the dispatcher and resuming subscribers
+    can continue after the greatest sequence number they have seen.
+    """
+
+    def __init__(self, product_service, poll_interval: float, queue_size: int, batch_size: int = 1000):
+        self.product_service = product_service
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+
+        self._loop = None
+        self._wake_event = None
+        self._dispatcher = None
+        self._last_seq = 0
+        self._listener = None
+        self._reset_subscriptions()
+
+        product_changes_logged.connect(self._on_changes_logged, weak=False)
+
+    async def subscribe(self, product_ids: frozenset[int], categories: frozenset[str]) -> ProductChangeSubscription:
+        """
+        Subscribe to changes of products made from now on.
+
+        Args:
+            product_ids (frozenset[int]): The products of interest.
+            categories (frozenset[str]): The categories of interest, every change is of interest if neither is given.
+
+        Returns:
+            ProductChangeSubscription - The subscription, which must be cancelled when the subscriber leaves.
+        """
+
+        await self._ensure_dispatcher()
+
+        # The dispatcher does not read the change log while nobody listens, so it starts from the latest change
+        if not self._subscriptions:
+            self._last_seq = await self.product_service.get_last_product_change_seq()
+
+        subscription = ProductChangeSubscription(product_ids, categories, self.queue_size)
+        subscription.last_seq = self._last_seq
+
+        self._subscriptions.add(subscription)
+
+        if not product_ids and not categories:
+            self._unfiltered_subscriptions.add(subscription)
+
+        if categories:
+            self._category_subscriptions.add(subscription)
+
+        for product_id in product_ids:
+            self._subscriptions_by_id[product_id].add(subscription)
+
+        for category in categories:
+            self._subscriptions_by_category[category].add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: ProductChangeSubscription) -> None:
+        """Cancel a subscription."""
+
+        self._subscriptions.discard(subscription)
+        self._unfiltered_subscriptions.discard(subscription)
+        self._category_subscriptions.discard(subscription)
+
+        for index, keys in (
+            (self._subscriptions_by_id, subscription.product_ids),
+            (self._subscriptions_by_category, subscription.categories),
+        ):
+            for key in keys:
+                subscribers = index.get(key)
+
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del index[key]
+
+    async def backlog(self, subscription: ProductChangeSubscription, since: int) -> AsyncIterator[ProductChangeDTO]:
+        """
+        Read the changes missed by a resuming subscriber from the change log.
+        Changes read here are skipped when they are pushed to the subscriber later.
+
+        Args:
+            subscription (ProductChangeSubscription): The subscription of the resuming subscriber.
+            since (int): The sequence number of the last change received by the subscriber.
+
+        Yields:
+            ProductChangeDTO - The missed changes of interest to the subscriber, in the order they were made.
+        """
+
+        subscription.last_seq = since
+        has_more = True
+
+        while has_more:
+            changes_dto = await self.product_service.get_product_changes(since, self.batch_size)
+            has_more, since = changes_dto.has_more, changes_dto.next_since
+
+            for change_dto in changes_dto.changes:
+                if subscription.matches(change_dto):
+                    yield change_dto
+
+            subscription.last_seq = since
+
+    def wake(self) -> None:
+        """Wake up the dispatcher to read new changes, it can be called from any thread."""
+
+        loop, wake_event = self._loop, self._wake_event
+
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wake_event.set)
+
+    async def _ensure_dispatcher(self) -> None:
+        """Start the dispatcher in the running event loop, and the listener of notifications on PostgreSQL."""
+
+        loop = asyncio.get_running_loop()
+
+        if self._loop is loop and not self._dispatcher.done():
+            return
+
+        if self._loop is not loop:
+            self._reset_subscriptions()
+
+        self._loop = loop
+        self._wake_event = asyncio.Event()
+        self._dispatcher = loop.create_task(self._dispatch())
+
+        if connection.vendor == "postgresql" and (self._listener is None or not self._listener.is_alive()):
+            self._listener = threading.Thread(target=self._listen, name="product-changes-listener", daemon=True)
+            self._listener.start()
+
+    def _reset_subscriptions(self) -> None:
+        """Drop all subscriptions, those of a previous event loop can no longer be served."""
+
+        self._subscriptions = set()
+        self._unfiltered_subscriptions = set()
+        self._category_subscriptions = set()
+        self._subscriptions_by_id = defaultdict(set)
+        self._subscriptions_by_category = defaultdict(set)
+
+    async def _dispatch(self) -> None:
+        """Push new changes to the subscribers whenever the dispatcher is woken up or the poll interval passes."""
+
+        while True:
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wake_event.clear()
+
+            if not self._subscriptions:
+                continue
+
+            try:
+                await self._publish_new_changes()
+            except Exception:
+                logger.exception("Failed to publish changes of products")
+
+    async def _publish_new_changes(self) -> None:
+        """
+        Read the changes logged since the last published one and push them to the matching subscribers.
+        Sequence numbers are allocated in the order the changes are committed, so no change can appear later
+        behind the last published one.
+        """
+
+        has_more = True
+
+        while has_more:
+            changes_dto = await self.product_service.get_product_changes(self._last_seq, self.batch_size)
+            has_more, self._last_seq = changes_dto.has_more, changes_dto.next_since
+
+            for change_dto in changes_dto.changes:
+                for subscription in self._change_subscriptions(change_dto):
+                    subscription.push(change_dto)
+
+    def _change_subscriptions(self, change_dto: ProductChangeDTO) -> set[ProductChangeSubscription]:
+        """Find the subscriptions interested in a change using the indexes of subscriptions."""
+
+        subscriptions = self._unfiltered_subscriptions | self._subscriptions_by_id.get(change_dto.product_id, set())
+        change_categories = _change_categories(change_dto)
+
+        if change_categories is None:
+            subscriptions |= self._category_subscriptions
+        else:
+            for category in change_categories:
+                subscriptions |= self._subscriptions_by_category.get(category, set())
+
+        return subscriptions
+
+    def _on_changes_logged(self, **kwargs) -> None:
+        self.wake()
+
+    def _listen(self) -> None:
+        """
+        Listen to notifications of the PostgreSQL channel and wake up the dispatcher, run in a background thread.
+        A dedicated connection is opened, bypassing connection pools, since it is held for the lifetime of the process.
+        """
+
+        import psycopg2
+
+        while True:
+            listener = None
+
+            try:
+                listener = psycopg2.connect(**connections["default"].get_connection_params())
+                listener.set_session(autocommit=True)
+
+                with listener.cursor() as cursor:
+                    cursor.execute(f"LISTEN {PRODUCT_CHANGES_CHANNEL}")
+
+                # Changes logged while the listener was not connected are picked up right away
+                self.wake()
+
+                while True:
+                    if select.select([listener], [], [], self.poll_interval) != ([], [], []):
+                        listener.poll()
+
+                        if listener.notifies:
+                            listener.notifies.clear()
+                            self.wake()
+            except Exception:
+                logger.exception("Listening to changes of products failed, reconnecting")
+                threading.Event().wait(self.poll_interval)
+            finally:
+                if listener is not None:
+                    listener.close()
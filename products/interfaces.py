@@ -1,6 +1,20 @@
 from abc import ABCMeta, abstractmethod
+from typing import Iterator, Optional
 
-from .dto import NewProductDTO, ProductDTO, PartialProductDTO, QueryParamsDTO, GetProductDTO
+from .dto import (
+    NewProductDTO,
+    ProductDTO,
+    PartialProductDTO,
+    QueryParamsDTO,
+    GetProductDTO,
+    ProductPageDTO,
+    VersionDTO,
+    SearchQueryDTO,
+    ProductSearchResultDTO,
+    ProductFacetsDTO,
+    ProductChangesDTO,
+    UpdatedProductDTO,
+)
 
 
 class ProductRepositoryInterface(metaclass=ABCMeta):
@@ -28,6 +42,40 @@ class ProductRepositoryInterface(metaclass=ABCMeta):
         Returns:
             ProductDTO - A data transfer object containing the product information.
 
+        Raises:
+            InstanceAlreadyExistsError: If a product with this sku already exists.
+        """
+        pass
+
+    @abstractmethod
+    def bulk_create_products(self, new_products_dto: list[NewProductDTO], batch_size: int) -> int:
+        """
+        Create new products in batches inside a single transaction.
+
+        Args:
+            new_products_dto (list[NewProductDTO]): The data model objects representing products.
+            batch_size (int): The number of products inserted by a single query.
+
+        Returns:
+            int - The number of created products.
+
+        Raises:
+            InstanceAlreadyExistsError: If a product with one of the skus already exists.
+        """
+        pass
+
+    @abstractmethod
+    def bulk_upsert_products(self, new_products_dto: list[NewProductDTO], batch_size: int) -> int:
+        """
+        Create new products or update existing ones matched by sku, in batches inside a single transaction.
+        If the same sku occurs several times, the last occurrence wins.
+
+        Args:
+            new_products_dto (list[NewProductDTO]): The data model objects representing products, each with a sku.
+            batch_size (int): The number of products written by a single query.
+
+        Returns:
+            int - The number of created or updated products.
         """
         pass
 
@@ -48,19 +96,70 @@ class ProductRepositoryInterface(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def partial_update_product(self, product_id: int, partial_product_dto: PartialProductDTO) -> ProductDTO:
+    def get_products_by_ids(self, product_ids: list[int]) -> list[GetProductDTO]:
+        """
+        Retrieve information about several products using their unique identifiers.
+
+        Args:
+            product_ids (list[int]): The unique identifiers of the products.
+
+        Returns:
+            list[GetProductDTO] - Data transfer objects of the found products, in no particular order.
+        """
+        pass
+
+    @abstractmethod
+    def get_product_version(self, product_id: int) -> VersionDTO:
         """
-        Partial update product
+        Retrieve the version of a product without loading the product itself.
+
+        Args:
+            product_id (int): The unique identifier of the product.
+
+        Returns:
+            VersionDTO - A data transfer object containing the modification time of the product.
+
+        Raises:
+            InstanceDoesNotExistError: If no product with this id is found.
+        """
+        pass
+
+    @abstractmethod
+    def get_products_version(self, query_params_dto: QueryParamsDTO) -> VersionDTO:
+        """
+        Retrieve the version of the list of products filtered by the provided parameters,
+        without loading the products themselves.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
+
+        Returns:
+            VersionDTO - A data transfer object containing the number of products and the latest modification time.
+        """
+        pass
+
+    @abstractmethod
+    def partial_update_product(
+        self,
+        product_id: int,
+        partial_product_dto: PartialProductDTO,
+        expected_versions: Optional[set[int]] = None,
+    ) -> UpdatedProductDTO:
+        """
+        Partial update product, writing only the provided fields.
 
         Args:
             product_id (int): The unique identifier of the product.
             partial_product_dto (PartialProductDTO): The data model object representing partial data of a product.
+            expected_versions (Optional[set[int]]): The versions the product is updated from, any version if None.
 
         Returns:
-            ProductDTO - A data transfer object containing the product information.
+            UpdatedProductDTO - A data transfer object containing the product information and its new version.
 
         Raises:
             InstanceDoesNotExistError: If no product with this id is found.
+            InstanceAlreadyExistsError: If another product with this sku already exists.
+            PreconditionFailedError: If the product has none of the expected versions.
         """
         pass
 
@@ -81,17 +180,219 @@ class ProductRepositoryInterface(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def get_products(self, query_params_dto: QueryParamsDTO) -> list[ProductDTO]:
+    def partial_update_products(self, query_params_dto: QueryParamsDTO, partial_product_dto: PartialProductDTO) -> int:
+        """
+        Partial update all products matching the provided parameters with a single query.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
+            partial_product_dto (PartialProductDTO): The data model object representing partial data of a product.
+
+        Returns:
+            int - The number of updated products.
+        """
+        pass
+
+    @abstractmethod
+    def delete_products(self, query_params_dto: QueryParamsDTO) -> int:
+        """
+        Delete all products matching the provided parameters.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
+
+        Returns:
+            int - The number of deleted products.
+        """
+        pass
+
+    @abstractmethod
+    def get_products(self, query_params_dto: QueryParamsDTO) -> ProductPageDTO:
         """
         Retrieve a list of products filtered by the provided parameters.
+        If a limit is provided, a single keyset-paginated page is returned.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter and pagination parameters.
+
+        Returns:
+            ProductPageDTO - A data transfer object containing a list of products and the cursors of adjacent pages.
+
+        Raises:
+            InstanceDoesNotExistError: If no products is found.
+        """
+        pass
+
+    @abstractmethod
+    def iter_products(self, query_params_dto: QueryParamsDTO, chunk_size: int) -> Iterator[ProductDTO]:
+        """
+        Lazily iterate over all products filtered by the provided parameters.
+        Rows are fetched from the data storage in chunks, so memory usage does not depend on the number of products.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
+            chunk_size (int): The number of rows fetched from the data storage at a time.
+
+        Returns:
+            Iterator(ProductDTO) - An iterator of data transfer objects containing information about products.
+        """
+        pass
+
+    @abstractmethod
+    def get_product_facets(self, query_params_dto: QueryParamsDTO) -> ProductFacetsDTO:
+        """
+        Compute facets of the products filtered by the provided parameters: the number of products
+        and price statistics of every category, and the number of products with every value of each flag.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
+
+        Returns:
+            ProductFacetsDTO - A data transfer object containing the facets.
+        """
+        pass
+
+    @abstractmethod
+    def get_product_changes(self, since: int, limit: int) -> ProductChangesDTO:
+        """
+        Retrieve changes of products recorded after the given sequence number, in the order they were made.
+        Several changes of the same product are collapsed into the latest one, which carries the current
+        data of the product, or no data if the product was deleted.
+
+        Args:
+            since (int): The sequence number of the last change already seen by the client, 0 for all changes.
+            limit (int): The maximum number of log entries read at once.
+
+        Returns:
+            ProductChangesDTO - A data transfer object containing the changes and the sequence number to continue from.
+        """
+        pass
+
+    @abstractmethod
+    def search_products(self, search_query_dto: SearchQueryDTO) -> ProductSearchResultDTO:
+        """
+        Find products matching a full-text search query, ordered by relevance.
+
+        Args:
+            search_query_dto (SearchQueryDTO): A data transfer object containing the query and pagination parameters.
+
+        Returns:
+            ProductSearchResultDTO - A data transfer object containing a page of found products
+            and the offset of the next page.
+        """
+        pass
+
+
+class AsyncProductRepositoryInterface(metaclass=ABCMeta):
+    """
+    Interface for asynchronous product repository.
+
+    This interface is the asynchronous counterpart of ProductRepositoryInterface
+    for the methods used by the asynchronous views. Implementations must not block
+    the event loop while waiting for the data storage.
+    """
+
+    @abstractmethod
+    async def create_product(self, new_product_dto: NewProductDTO) -> ProductDTO:
+        """
+        Create a new product
+
+        Args:
+            new_product_dto (NewProductDTO): The data model object representing a product.
+
+        Returns:
+            ProductDTO - A data transfer object containing the product information.
+
+        Raises:
+            InstanceAlreadyExistsError: If a product with this sku already exists.
+        """
+        pass
+
+    @abstractmethod
+    async def get_product_by_id(self, product_id: int) -> GetProductDTO:
+        """
+        Retrieve information about a product using its unique identifier.
+
+        Args:
+            product_id (int): The unique identifier of the product.
+
+        Returns:
+            GetProductDTO - A data transfer object containing the product information.
+
+        Raises:
+            InstanceDoesNotExistError: If no product with this id is found.
+        """
+        pass
+
+    @abstractmethod
+    async def get_product_version(self, product_id: int) -> VersionDTO:
+        """
+        Retrieve the version of a product without loading the product itself.
+
+        Args:
+            product_id (int): The unique identifier of the product.
+
+        Returns:
+            VersionDTO - A data transfer object containing the modification time of the product.
+
+        Raises:
+            InstanceDoesNotExistError: If no product with this id is found.
+        """
+        pass
+
+    @abstractmethod
+    async def get_products_version(self, query_params_dto: QueryParamsDTO) -> VersionDTO:
+        """
+        Retrieve the version of the list of products filtered by the provided parameters,
+        without loading the products themselves.
 
         Args:
             query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
 
         Returns:
-            list(ProductDTO) - A list of data transfer objects containing information about products.
+            VersionDTO - A data transfer object containing the number of products and the latest modification time.
+        """
+        pass
+
+    @abstractmethod
+    async def get_products(self, query_params_dto: QueryParamsDTO) -> ProductPageDTO:
+        """
+        Retrieve a list of products filtered by the provided parameters.
+        If a limit is provided, a single keyset-paginated page is returned.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter and pagination parameters.
+
+        Returns:
+            ProductPageDTO - A data transfer object containing a list of products and the cursors of adjacent pages.
 
         Raises:
             InstanceDoesNotExistError: If no products is found.
         """
         pass
+
+    @abstractmethod
+    async def get_product_changes(self, since: int, limit: int) -> ProductChangesDTO:
+        """
+        Retrieve changes of products recorded after the given sequence number, in the order they were made.
+        Several changes of the same product are collapsed into the latest one, which carries the current
+        data of the product, or no data if the product was deleted.
+
+        Args:
+            since (int): The sequence number of the last change already seen, 0 for all changes.
+            limit (int): The maximum number of log entries read at once.
+
+        Returns:
+            ProductChangesDTO - A data transfer object containing the changes and the sequence number to continue from.
+        """
+        pass
+
+    @abstractmethod
+    async def get_last_product_change_seq(self) -> int:
+        """
+        Retrieve the sequence number of the latest change of products.
+
+        Returns:
+            int - The sequence number, 0 if no change was made yet.
+        """
+        pass
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from products.models import Product
+from products.search import product_search_vector, supports_full_text_search
+
+
+class Command(BaseCommand):
+    help = "Recompute the full-text search vectors of all products, e.g. after changing PRODUCT_SEARCH_CONFIG."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10000, help="Number of products updated by a query.")
+
+    def handle(self, *args, **options):
+        if not supports_full_text_search():
+            self.stdout.write("The database is searched with the in-process index, there are no vectors to rebuild.")
+            return
+
+        batch_size = options["batch_size"]
+        last_id = Product.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+        updated = 0
+
+        for start in range(0, last_id, batch_size):
+            updated += Product.objects.filter(id__gt=start, id__lte=start + batch_size).update(
+                search_vector=product_search_vector()
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search vectors of {updated} products."))
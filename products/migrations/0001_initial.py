@@ -0,0 +1,29 @@
+# Generated by Django 4.2.5 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('photo', models.URLField()),
+                ('category', models.CharField(max_length=50)),
+                ('offer_of_the_month', models.BooleanField()),
+                ('availability', models.BooleanField()),
+                ('self_pickup', models.BooleanField()),
+                ('description1', models.TextField(max_length=500)),
+                ('description2', models.TextField(max_length=500)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+            ],
+        ),
+    ]
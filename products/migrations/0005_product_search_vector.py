@@ -0,0 +1,48 @@
+# Generated by Django 4.2.5 on 2026-10-18 11:10
+
+import core.db.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# Searchable fields of a product and the weight labels of their words at the time of this migration
+
+SEARCH_FIELD_WEIGHTS = {"name": "A", "category": "B", "description1": "C", "description2": "C"}
+
+
+def fill_search_vectors(apps, schema_editor):
+    """Compute the search vectors of existing products, only PostgreSQL maintains them."""
+
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    Product = apps.get_model("products", "Product")
+    vector = None
+
+    for field, weight in SEARCH_FIELD_WEIGHTS.items():
+        field_vector = django.contrib.postgres.search.SearchVector(
+            field, weight=weight, config=settings.PRODUCT_SEARCH_CONFIG
+        )
+        vector = field_vector if vector is None else vector + field_vector
+
+    Product.objects.using(schema_editor.connection.alias).update(search_vector=vector)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=core.db.indexes.SearchVectorIndex(fields=['search_vector'], name='product_search_vector_idx'),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
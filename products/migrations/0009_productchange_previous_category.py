@@ -0,0 +1,18 @@
+# Generated by Django 4.2.5 on 2026-10-18 11:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_product_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productchange',
+            name='previous_category',
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+    ]
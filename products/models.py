@@ -1,9 +1,14 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
+from core.db.indexes import SearchVectorIndex
+
 
 class Product(models.Model):
     """Model representing a product."""
 
+    DESCRIPTION_SEPARATOR = " <br/> "
+
     name = models.CharField(max_length=100)
     photo = models.URLField()
     category = models.CharField(max_length=50)
@@ -13,12 +18,59 @@ class Product(models.Model):
     description1 = models.TextField(max_length=500)
     description2 = models.TextField(max_length=500)
     price = models.DecimalField(max_digits=10, decimal_places=2)
+    sku = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["category", "id"], name="product_category_idx"),
+            models.Index(
+                fields=["availability", "offer_of_the_month", "self_pickup", "id"],
+                name="product_flags_idx",
+            ),
+            models.Index(fields=["id"], condition=models.Q(offer_of_the_month=True), name="product_offer_idx"),
+            models.Index(fields=["id"], condition=models.Q(availability=True), name="product_available_idx"),
+            models.Index(fields=["price", "id"], name="product_price_id_idx"),
+            models.Index(fields=["updated_at"], name="product_updated_at_idx"),
+            SearchVectorIndex(fields=["search_vector"], name="product_search_vector_idx"),
+        ]
 
     def __str__(self):
         return f"Product {self.name}"
 
+    def save(self, *args, **kwargs):
+        # Saving an existing product, e.g. from the admin site, makes a new version like the API updates do
+        if not self._state.adding:
+            self.version += 1
+
+        super().save(*args, **kwargs)
+
     @property
     def description(self):
         """A property that combines two description fields"""
 
-        return f"{self.description1} <br/> {self.description2}"
+        return f"{self.description1}{self.DESCRIPTION_SEPARATOR}{self.description2}"
+
+
+class ProductChange(models.Model):
+    """
+    Model representing an entry of the append-only log of product changes.
+    The primary key is the sequence number of the change, deleted products are recorded as tombstones.
+    The category a product had before the change is recorded when it may have changed, so that subscribers
+    of that category learn that the product left it.
+    """
+
+    class Operation(models.TextChoices):
+        CREATED = "created"
+        UPDATED = "updated"
+        DELETED = "deleted"
+
+    product_id = models.BigIntegerField()
+    operation = models.CharField(max_length=7, choices=Operation.choices)
+    changed_at = models.DateTimeField(auto_now_add=True)
+    previous_category = models.CharField(max_length=50, null=True, blank=True)
+
+    def __str__(self):
+        return f"Product {self.product_id} {self.operation}"
@@ -0,0 +1,113 @@
+import base64
+import binascii
+import json
+from decimal import Decimal, InvalidOperation
+
+from .dto import CursorDTO
+
+ORDERING_FIELDS = ("id", "price", "category")
+
+# Prices have 10 digits, 2 of them decimal places, larger values cannot be compared with the column
+
+MAX_PRICE = Decimal(10) ** 8
+
+
+def _is_id(value) -> bool:
+    """Check whether a cursor value is an integer within the range of the primary key column."""
+
+    return isinstance(value, int) and not isinstance(value, bool) and -(2**63) <= value < 2**63
+
+
+def _is_price(value) -> bool:
+    """Check whether a cursor value is a decimal string within the range of the price column."""
+
+    if not isinstance(value, str):
+        return False
+
+    try:
+        price = Decimal(value)
+    except InvalidOperation:
+        return False
+
+    return price.is_finite() and abs(price) < MAX_PRICE
+
+
+def _is_text(value) -> bool:
+    """Check whether a cursor value is a string which can be sent to the database."""
+
+    return isinstance(value, str) and "\x00" not in value
+
+
+# Checks of the cursor values of every keyset field
+
+KEY_VALUE_CHECKS = {"id": _is_id, "price": _is_price, "category": _is_text}
+
+
+def ordering_keys(ordering: str) -> tuple[str, ...]:
+    """
+    Return the model fields that make up the keyset for the given ordering.
+    The primary key is always the last key so that the keyset is unique.
+
+    Args:
+        ordering (str): An ordering field name, optionally prefixed with "-" for descending order.
+
+    Returns:
+        tuple(str) - The keyset field names.
+    """
+
+    field = ordering.lstrip("-")
+    if field == "id":
+        return ("id",)
+    return field, "id"
+
+
+def encode_cursor(cursor_dto: CursorDTO) -> str:
+    """
+    Encode a keyset position into an opaque, URL-safe cursor string.
+
+    Args:
+        cursor_dto (CursorDTO): The data transfer object describing the keyset position.
+
+    Returns:
+        str - The opaque cursor.
+    """
+
+    payload = json.dumps(
+        {"o": cursor_dto.ordering, "r": cursor_dto.reverse, "v": list(cursor_dto.values)},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> CursorDTO:
+    """
+    Decode an opaque cursor string created by encode_cursor.
+
+    Args:
+        cursor (str): The opaque cursor.
+
+    Returns:
+        CursorDTO - The data transfer object describing the keyset position.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        ordering, reverse, values = payload["o"], payload["r"], payload["v"]
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError) as exception:
+        raise ValueError("Invalid cursor") from exception
+
+    if (
+        not isinstance(ordering, str)
+        or ordering.lstrip("-") not in ORDERING_FIELDS
+        or not isinstance(reverse, bool)
+        or not isinstance(values, list)
+        or len(values) != len(ordering_keys(ordering))
+        or not all(KEY_VALUE_CHECKS[key](value) for key, value in zip(ordering_keys(ordering), values))
+    ):
+        raise ValueError("Invalid cursor")
+
+    return CursorDTO(ordering=ordering, reverse=reverse, values=tuple(values))
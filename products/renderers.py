@@ -0,0 +1,208 @@
+from functools import lru_cache
+from typing import Optional
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders as drf_encoders
+
+from core.encoders import SerializerJSONEncoder
+from .dto import (
+    ProductDTO,
+    GetProductDTO,
+    ProductPageDTO,
+    ProductSearchResultDTO,
+    ProductFacetsDTO,
+    ProductChangeDTO,
+    ProductChangesDTO,
+    ProductBatchDTO,
+)
+from .serializers import (
+    ProductSerializer,
+    GetProductSerializer,
+    ProductPageSerializer,
+    ProductSearchResultSerializer,
+    ProductFacetsSerializer,
+    ProductChangeSerializer,
+    ProductChangesSerializer,
+    ProductBatchSerializer,
+)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class ProductJSONRenderer(JSONRenderer):
+    """
+    Renderer which encodes product data transfer objects straight to JSON using precompiled encoders.
+    The output is identical to rendering the data of the matching serializer, any other data
+    is rendered by the default JSONRenderer.
+
+    If the renderer context contains "fields", only those fields of products are rendered.
+    """
+
+    encoders = {
+        ProductDTO: SerializerJSONEncoder(ProductSerializer),
+        GetProductDTO: SerializerJSONEncoder(GetProductSerializer),
+        ProductPageDTO: SerializerJSONEncoder(ProductPageSerializer),
+        ProductSearchResultDTO: SerializerJSONEncoder(ProductSearchResultSerializer),
+        ProductFacetsDTO: SerializerJSONEncoder(ProductFacetsSerializer),
+        ProductChangeDTO: SerializerJSONEncoder(ProductChangeSerializer),
+        ProductChangesDTO: SerializerJSONEncoder(ProductChangesSerializer),
+        ProductBatchDTO: SerializerJSONEncoder(ProductBatchSerializer),
+    }
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render product data transfer objects, or a list of them, into JSON."""
+
+        encoders = self.get_encoders((renderer_context or {}).get("fields"))
+
+        if isinstance(data, list):
+            encoder = encoders.get(type(data[0])) if data else None
+        else:
+            encoder = encoders.get(type(data))
+
+        if encoder is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+
+        if isinstance(data, list):
+            if indent is not None:
+                return super().render(list(map(encoder.to_primitive, data)), accepted_media_type, renderer_context)
+            return encoder.encode_many(data)
+
+        if indent is not None:
+            return super().render(encoder.to_primitive(data), accepted_media_type, renderer_context)
+
+        return encoder.encode(data)
+
+    @classmethod
+    def to_primitive(cls, data, fields: Optional[tuple[str, ...]] = None):
+        """Convert product data transfer objects, or a list of them, into primitive data, other data is returned as is."""
+
+        encoders = cls.get_encoders(fields)
+
+        if isinstance(data, list):
+            encoder = encoders.get(type(data[0])) if data else None
+            return list(map(encoder.to_primitive, data)) if encoder is not None else data
+
+        encoder = encoders.get(type(data))
+
+        return encoder.to_primitive(data) if encoder is not None else data
+
+    @classmethod
+    def get_encoders(cls, fields: Optional[tuple[str, ...]]) -> dict:
+        """Return the encoders of data transfer objects, rendering only the given fields of products if provided."""
+
+        if fields is None:
+            return cls.encoders
+
+        return cls._projection_encoders(fields)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _projection_encoders(fields: tuple[str, ...]) -> dict:
+        """
+        Compile the encoders of products and pages of products rendering only the given fields.
+        The fields are validated and put in a canonical order by the query parameters serializer,
+        so the number of compiled projections is bounded.
+        """
+
+        product_serializer = type(
+            "ProjectedProductSerializer",
+            (ProductSerializer,),
+            {name: None for name in ProductSerializer._declared_fields if name not in fields},
+        )
+        page_serializer = type(
+            "ProjectedProductPageSerializer",
+            (ProductPageSerializer,),
+            {"results": product_serializer(source="items", many=True)},
+        )
+
+        return {
+            ProductDTO: SerializerJSONEncoder(product_serializer),
+            ProductPageDTO: SerializerJSONEncoder(page_serializer),
+        }
+
+
+class NDJSONRenderer(JSONRenderer):
+    """Renderer which serializes a list of objects to newline delimited JSON, one object per line."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render a list of objects into newline delimited JSON."""
+
+        if data is None:
+            return b""
+
+        if not isinstance(data, list):
+            return self.render_item(data)
+
+        return b"".join(self.render_item(item) for item in data)
+
+    def render_item(self, item):
+        """Render a single object into a JSON line."""
+
+        return super().render(item) + b"\n"
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Renderer which sends lists of products as JSON columns: the field names are sent once
+    under "fields", followed by the values of every product as an array under "rows".
+    The other keys of a page, such as cursors, are kept as they are.
+    """
+
+    media_type = "application/vnd.columnar+json"
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render product data transfer objects, or a list of them, into columnar JSON."""
+
+        data = ProductJSONRenderer.to_primitive(data, (renderer_context or {}).get("fields"))
+
+        if isinstance(data, list):
+            data = self._to_columns(data)
+        elif isinstance(data, dict) and isinstance(data.get("results"), list):
+            data = {
+                **{key: value for key, value in data.items() if key != "results"},
+                **self._to_columns(data["results"]),
+            }
+
+        return super().render(data, accepted_media_type, renderer_context)
+
+    @staticmethod
+    def _to_columns(items: list[dict]) -> dict:
+        """Convert a list of objects with the same keys into the field names and rows of their values."""
+
+        return {
+            "fields": list(items[0]) if items else [],
+            "rows": [list(item.values()) for item in items],
+        }
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Renderer which serializes product data transfer objects, and any other data, to MessagePack."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render product data transfer objects, or a list of them, into MessagePack."""
+
+        if data is None:
+            return b""
+
+        data = ProductJSONRenderer.to_primitive(data, (renderer_context or {}).get("fields"))
+
+        return msgpack.packb(data, default=drf_encoders.JSONEncoder().default)
+
+
+# Compact formats of product lists, negotiated with the Accept header. MessagePack requires the msgpack package.
+
+COMPACT_RENDERER_CLASSES = [ColumnarJSONRenderer, *([MessagePackRenderer] if msgpack is not None else [])]
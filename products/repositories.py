@@ -1,146 +1,528 @@
-from dataclasses import fields as dc_fields
+import hashlib
+from dataclasses import astuple, fields as dc_fields
+from decimal import Decimal
+from typing import Callable, Iterable, Iterator, Optional
 
-from annoying.functions import get_object_or_None
-from django.db.models import QuerySet, Q
+from asgiref.sync import sync_to_async
+from django.contrib.postgres.search import SearchRank
+from django.db import IntegrityError, connection, transaction
+from django.db.models import QuerySet, Q, Count, Max, Min, Sum, F, Value, CharField, DateTimeField
+from django.utils import timezone
 
-from core.exceptions import InstanceDoesNotExistError
-from .dto import NewProductDTO, ProductDTO, PartialProductDTO, QueryParamsDTO, GetProductDTO
-from .models import Product
-from .interfaces import ProductRepositoryInterface
+from core.cache import GenerationalCache
+from core.db.queries import update_returning
+from core.exceptions import InstanceDoesNotExistError, InstanceAlreadyExistsError, PreconditionFailedError
+from .dto import (
+    NewProductDTO,
+    ProductDTO,
+    PartialProductDTO,
+    QueryParamsDTO,
+    GetProductDTO,
+    ProductPageDTO,
+    CursorDTO,
+    VersionDTO,
+    SearchQueryDTO,
+    ProductSearchResultDTO,
+    CategoryFacetDTO,
+    FlagFacetDTO,
+    ProductFacetsDTO,
+    ProductChangeDTO,
+    ProductChangesDTO,
+    UpdatedProductDTO,
+    row_constructor,
+)
+from .events import notify_product_changes
+from .models import Product, ProductChange
+from .interfaces import ProductRepositoryInterface, AsyncProductRepositoryInterface
+from .pagination import decode_cursor, encode_cursor, ordering_keys
+from .search import (
+    SEARCH_FIELD_WEIGHTS,
+    product_search_index,
+    product_search_query,
+    product_search_vector,
+    supports_full_text_search,
+)
 
+PRODUCT_DTO_FIELDS = tuple(field.name for field in dc_fields(ProductDTO))
 
-class ProductRepository(ProductRepositoryInterface):
-    """The ProductRepository class handles the retrieval of product data from the data storage."""
+# Columns of the rows of GetProductDTO objects, the description is joined from the last two of them
 
-    def create_product(self, new_product_dto: NewProductDTO) -> ProductDTO:
+GET_PRODUCT_ROW_FIELDS = tuple(
+    field.name for field in dc_fields(GetProductDTO) if field.name != "description"
+) + ("description1", "description2")
+
+FACET_FLAGS = ("offer_of_the_month", "availability", "self_pickup")
+
+# Key of the PostgreSQL advisory lock serializing the transactions which append to the change log
+
+PRODUCT_CHANGE_LOG_LOCK_ID = 7_180_342_561
+
+
+class BaseProductRepository:
+    """
+    The BaseProductRepository class holds the query building and conversion helpers
+    shared by the synchronous and asynchronous product repositories.
+    """
+
+    @staticmethod
+    def _build_filter_conditions(query_params_dto: QueryParamsDTO) -> Q:
         """
-        Create a new product
+        Build filter conditions for the Product queryset from the provided parameters.
 
         Args:
-            new_product_dto (NewProductDTO): The data model object representing a product.
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
 
         Returns:
-            ProductDTO - A data transfer object containing the product information.
+            Q - The filter conditions.
+        """
+
+        filter_conditions = Q()
 
+        if query_params_dto.offer_of_the_month is not None:
+            filter_conditions &= Q(offer_of_the_month=query_params_dto.offer_of_the_month)
+
+        if query_params_dto.availability is not None:
+            filter_conditions &= Q(availability=query_params_dto.availability)
+
+        if query_params_dto.self_pickup is not None:
+            filter_conditions &= Q(self_pickup=query_params_dto.self_pickup)
+
+        if query_params_dto.ids is not None:
+            filter_conditions &= Q(id__in=query_params_dto.ids)
+
+        if query_params_dto.categories is not None:
+            filter_conditions &= Q(category__in=query_params_dto.categories)
+
+        if query_params_dto.price_min is not None:
+            filter_conditions &= Q(price__gte=query_params_dto.price_min)
+
+        if query_params_dto.price_max is not None:
+            filter_conditions &= Q(price__lte=query_params_dto.price_max)
+
+        return filter_conditions
+
+    @staticmethod
+    def _selected_fields(query_params_dto: QueryParamsDTO, ordering: Optional[str] = None) -> tuple[str, ...]:
         """
+        Determine the columns to select for the projection requested by the provided parameters.
+        The keys of the ordering are always selected, so cursors can be created from the fetched rows.
 
-        product = Product.objects.create(
-            name=new_product_dto.name,
-            photo=new_product_dto.photo,
-            category=new_product_dto.category,
-            offer_of_the_month=new_product_dto.offer_of_the_month,
-            availability=new_product_dto.availability,
-            self_pickup=new_product_dto.self_pickup,
-            description1=new_product_dto.description1,
-            description2=new_product_dto.description2,
-            price=new_product_dto.price,
-        )
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing projection parameters.
+            ordering (Optional[str]): The ordering of a paginated list or None.
 
-        return self._product_to_dto(product)
+        Returns:
+            tuple[str, ...] - The names of the selected ProductDTO fields.
+        """
 
-    def get_product_by_id(self, product_id: int) -> GetProductDTO:
+        if query_params_dto.fields is None:
+            return PRODUCT_DTO_FIELDS
+
+        selected_fields = set(query_params_dto.fields).union(ordering_keys(ordering) if ordering else ())
+
+        return tuple(field for field in PRODUCT_DTO_FIELDS if field in selected_fields)
+
+    @staticmethod
+    def _row_converter(fields: tuple[str, ...]) -> Callable[[tuple], ProductDTO]:
         """
-        Retrieve information about a product using its unique identifier.
+        Create a function converting a row with the given columns into a ProductDTO object.
+        Fields which are not selected are left empty.
 
         Args:
-            product_id (int): The unique identifier of the product.
+            fields (tuple[str, ...]): The names of the selected ProductDTO fields in the order of the columns.
 
         Returns:
-            GetProductDTO - A data transfer object containing the product information.
+            Callable - The conversion function.
+        """
 
-        Raises:
-            InstanceDoesNotExistError: If no product with this id is found.
+        return row_constructor(ProductDTO, fields)
+
+    @classmethod
+    def _page_queryset(
+        cls, products: QuerySet[Product], query_params_dto: QueryParamsDTO
+    ) -> tuple[QuerySet[Product], Optional[CursorDTO], str]:
+        """
+        Build the query of a single page of products using keyset pagination.
+
+        Rows are located by comparing the ordering keys with the position stored in the cursor
+        instead of skipping rows with OFFSET, so the cost of a page does not depend on its depth.
+
+        Args:
+            products (QuerySet[Product]): A filtered QuerySet of Product objects.
+            query_params_dto (QueryParamsDTO): A data transfer object containing pagination parameters.
+
+        Returns:
+            tuple - The QuerySet of the page with one extra row telling whether more rows follow,
+            the decoded cursor or None, and the ordering of the page.
         """
 
-        product = get_object_or_None(Product, id=product_id)
-        if product:
-            return self._product_to_get_dto(product)
-        raise InstanceDoesNotExistError(f"Product with id {product_id} not found")
+        cursor_dto = decode_cursor(query_params_dto.cursor) if query_params_dto.cursor else None
+        ordering = cursor_dto.ordering if cursor_dto else query_params_dto.ordering or "id"
+        reverse = cursor_dto.reverse if cursor_dto else False
+        keys = ordering_keys(ordering)
+        descending = ordering.startswith("-") != reverse
 
-    def partial_update_product(self, product_id: int, partial_product_dto: PartialProductDTO) -> ProductDTO:
+        if cursor_dto:
+            products = products.filter(cls._keyset_conditions(keys, cursor_dto.values, descending))
+
+        products = products.order_by(*(f"-{key}" if descending else key for key in keys))
+
+        return products[: query_params_dto.limit + 1], cursor_dto, ordering
+
+    @classmethod
+    def _rows_to_page(
+        cls,
+        page: list[ProductDTO],
+        query_params_dto: QueryParamsDTO,
+        cursor_dto: Optional[CursorDTO],
+        ordering: str,
+    ) -> ProductPageDTO:
         """
-        Partial update product
+        Create a page from the products fetched by the query built by _page_queryset.
 
         Args:
-            product_id (int): The unique identifier of the product.
-            partial_product_dto (PartialProductDTO): The data model object representing partial data of a product.
+            page (list[ProductDTO]): The fetched products, including the extra row.
+            query_params_dto (QueryParamsDTO): A data transfer object containing pagination parameters.
+            cursor_dto (Optional[CursorDTO]): The decoded cursor of the page or None.
+            ordering (str): The ordering of the page.
 
         Returns:
-            ProductDTO - A data transfer object containing the product information.
+            ProductPageDTO - A data transfer object containing a page of products and the cursors of adjacent pages.
 
         Raises:
-            InstanceDoesNotExistError: If no product with this id is found.
+            InstanceDoesNotExistError: If no products is found.
         """
 
-        product = get_object_or_None(Product, id=product_id)
+        reverse = cursor_dto.reverse if cursor_dto else False
+        keys = ordering_keys(ordering)
+        has_more = len(page) > query_params_dto.limit
+        page = page[: query_params_dto.limit]
 
-        if not product:
-            raise InstanceDoesNotExistError(f"Product with id {product_id} not found")
+        if reverse:
+            page.reverse()
+
+        if not page:
+            if cursor_dto:
+                return ProductPageDTO(items=[])
+            raise InstanceDoesNotExistError("Products not found")
+
+        has_next = True if reverse else has_more
+        has_previous = has_more if reverse else cursor_dto is not None
+
+        return ProductPageDTO(
+            items=page,
+            next_cursor=cls._product_to_cursor(page[-1], ordering, keys, reverse=False) if has_next else None,
+            previous_cursor=cls._product_to_cursor(page[0], ordering, keys, reverse=True) if has_previous else None,
+        )
+
+    @staticmethod
+    def _keyset_conditions(keys: tuple[str, ...], values: tuple, descending: bool) -> Q:
+        """
+        Build conditions selecting rows that follow the given keyset position in the scan direction.
+
+        Args:
+            keys (tuple[str, ...]): The keyset field names.
+            values (tuple): The keyset values of the position.
+            descending (bool): Whether rows are scanned in descending order.
+
+        Returns:
+            Q - The filter conditions.
+        """
+
+        lookup = "lt" if descending else "gt"
+        conditions = Q()
+
+        for index, key in enumerate(keys):
+            condition = Q(**{f"{key}__{lookup}": values[index]})
+            for previous_key, previous_value in zip(keys[:index], values[:index]):
+                condition &= Q(**{previous_key: previous_value})
+            conditions |= condition
+
+        return conditions
+
+    @staticmethod
+    def _ordering_to_order_by(ordering: str) -> list[str]:
+        """
+        Convert an ordering parameter into QuerySet.order_by arguments with the primary key as a tiebreaker.
+
+        Args:
+            ordering (str): An ordering field name, optionally prefixed with "-" for descending order.
+
+        Returns:
+            list[str] - The order_by arguments.
+        """
+
+        prefix = "-" if ordering.startswith("-") else ""
+        return [f"{prefix}{key}" for key in ordering_keys(ordering)]
+
+    @staticmethod
+    def _product_to_cursor(product_dto: ProductDTO, ordering: str, keys: tuple[str, ...], reverse: bool) -> str:
+        """
+        Create an opaque cursor pointing at the position of the given product.
+
+        Args:
+            product_dto (ProductDTO): A data transfer object containing the product information.
+            ordering (str): The ordering of the page.
+            keys (tuple[str, ...]): The keyset field names.
+            reverse (bool): Whether the cursor points to the previous page.
+
+        Returns:
+            str - The opaque cursor.
+        """
+
+        values = tuple(
+            value if isinstance(value, (int, str)) else str(value)
+            for value in (getattr(product_dto, key) for key in keys)
+        )
+        return encode_cursor(CursorDTO(ordering=ordering, reverse=reverse, values=values))
+
+    @staticmethod
+    def _partial_product_dto_to_fields(partial_product_dto: PartialProductDTO) -> dict:
+        """
+        Collect the fields of a PartialProductDTO object that were provided for update.
 
-        update_fields = {
+        Args:
+            partial_product_dto (PartialProductDTO): The data model object representing partial data of a product.
+
+        Returns:
+            dict - The names of the provided fields mapped to their new values.
+        """
+
+        return {
             field.name: getattr(partial_product_dto, field.name)
             for field in dc_fields(PartialProductDTO)
             if not getattr(partial_product_dto, field.name) is None
         }
 
-        for key, value in update_fields.items():
-            setattr(product, key, value)
+    @staticmethod
+    def _search_vector_fields(values: dict) -> dict:
+        """
+        Build the search vector to be written together with new values of product fields, so the vector
+        is maintained by the same query that changes the product.
+
+        Args:
+            values (dict): The names of the changed fields mapped to their new values.
+
+        Returns:
+            dict - The search vector field mapped to its expression, or an empty dict if the database
+            does not maintain search vectors or none of the searchable fields is changed.
+        """
 
-        product.save()
+        if not supports_full_text_search() or SEARCH_FIELD_WEIGHTS.keys().isdisjoint(values):
+            return {}
 
-        return self._product_to_dto(product)
+        return {
+            "search_vector": product_search_vector(
+                {field: value for field, value in values.items() if field in SEARCH_FIELD_WEIGHTS}
+            )
+        }
 
-    def delete_product_by_id(self, product_id: int) -> None:
+    @classmethod
+    def _new_product_dto_to_product(cls, new_product_dto: NewProductDTO) -> Product:
         """
-        Delete information about a product using its unique identifier.
+        Convert a NewProductDTO object into an unsaved data model object (Product).
 
         Args:
-            product_id (int): The unique identifier of the product.
+            new_product_dto (NewProductDTO): The data model object representing a product.
 
         Returns:
-            None
+            Product - An unsaved instance of the Product model class.
+        """
 
-        Raises:
-            InstanceDoesNotExistError: If no product with this id is found.
+        return Product(
+            name=new_product_dto.name,
+            photo=new_product_dto.photo,
+            category=new_product_dto.category,
+            offer_of_the_month=new_product_dto.offer_of_the_month,
+            availability=new_product_dto.availability,
+            self_pickup=new_product_dto.self_pickup,
+            description1=new_product_dto.description1,
+            description2=new_product_dto.description2,
+            price=new_product_dto.price,
+            sku=new_product_dto.sku,
+            **cls._search_vector_fields({field: getattr(new_product_dto, field) for field in SEARCH_FIELD_WEIGHTS}),
+        )
+
+    @classmethod
+    def _insert_product(cls, product: Product) -> None:
+        """Insert a new product and append its creation to the change log in a single transaction."""
+
+        with transaction.atomic():
+            product.save(force_insert=True)
+            cls._log_changes([product.pk], ProductChange.Operation.CREATED)
+
+    @staticmethod
+    def _lock_change_log() -> None:
         """
-        product = get_object_or_None(Product, id=product_id)
+        Lock the change log until the end of the current transaction, before appending to it.
 
-        if not product:
-            raise InstanceDoesNotExistError(f"Product with id {product_id} not found")
+        Readers continue after the greatest sequence number they have seen, so an entry must never become
+        visible after an entry with a greater sequence number. PostgreSQL allocates the ids of concurrent
+        transactions in any order, so the transactions appending to the log are serialized from their first
+        entry to their commit, and entries are numbered in the order of the commits. Writes to SQLite are
+        serialized by the database itself.
+        """
 
-        product.delete()
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", [PRODUCT_CHANGE_LOG_LOCK_ID])
 
-    def get_products(self, query_params_dto: QueryParamsDTO) -> list[ProductDTO]:
+    @classmethod
+    def _log_changes(
+        cls,
+        product_ids: Iterable[int],
+        operation: str,
+        previous_categories: Optional[dict[int, str]] = None,
+    ) -> None:
         """
-        Retrieve a list of products filtered by the provided parameters.
+        Append changes of the given products to the change log and notify the product change streams.
 
         Args:
-            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
+            product_ids (Iterable[int]): The unique identifiers of the changed products.
+            operation (str): The operation applied to the products.
+            previous_categories (Optional[dict[int, str]]): The categories of the products before the change,
+                for the products whose category may have changed.
+        """
 
-        Returns:
-            list(ProductDTO) - A list of data transfer objects containing information about products.
+        previous_categories = previous_categories or {}
 
-        Raises:
-            InstanceDoesNotExistError: If no products is found.
+        cls._lock_change_log()
+
+        ProductChange.objects.bulk_create(
+            ProductChange(
+                product_id=product_id,
+                operation=operation,
+                previous_category=previous_categories.get(product_id),
+            )
+            for product_id in product_ids
+        )
+        notify_product_changes()
+
+    @classmethod
+    def _log_selection_changes(cls, products: QuerySet[Product], operation: str) -> None:
         """
+        Append changes of all selected products to the change log with a single INSERT ... SELECT query,
+        so the ids of the products are not fetched, and notify the product change streams. It must be called
+        in the same transaction as the change, and before it if the change may make the products no longer
+        match the selection. The current categories of updated and deleted products are recorded as their
+        previous ones, so it must be called before such changes.
 
-        filter_conditions = Q()
+        Args:
+            products (QuerySet[Product]): A filtered QuerySet of the changed products.
+            operation (str): The operation applied to the products.
+        """
 
-        if query_params_dto.offer_of_the_month is not None:
-            filter_conditions &= Q(offer_of_the_month=query_params_dto.offer_of_the_month)
+        select_sql, params = (
+            products.order_by()
+            .annotate(
+                change_operation=Value(operation),
+                change_time=Value(timezone.now(), output_field=DateTimeField()),
+                change_previous_category=(
+                    Value(None, output_field=CharField())
+                    if operation == ProductChange.Operation.CREATED
+                    else F("category")
+                ),
+            )
+            .values_list("id", "change_operation", "change_time", "change_previous_category")
+            .query.sql_with_params()
+        )
 
-        if query_params_dto.availability is not None:
-            filter_conditions &= Q(availability=query_params_dto.availability)
+        cls._lock_change_log()
 
-        if query_params_dto.self_pickup is not None:
-            filter_conditions &= Q(self_pickup=query_params_dto.self_pickup)
+        table = connection.ops.quote_name(ProductChange._meta.db_table)
+        columns = ", ".join(
+            connection.ops.quote_name(column)
+            for column in ("product_id", "operation", "changed_at", "previous_category")
+        )
 
-        products = Product.objects.filter(filter_conditions)
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {table} ({columns}) {select_sql}", params)
 
-        if not products.exists():
-            raise InstanceDoesNotExistError("Products not found")
+        notify_product_changes()
+
+    @staticmethod
+    def _change_entries(since: int, limit: int) -> QuerySet:
+        """
+        Select (seq, product_id, operation, changed_at, previous_category) rows of the change log recorded after
+        the given sequence number, one more than the limit to tell whether more entries follow.
+        """
+
+        return (
+            ProductChange.objects.filter(id__gt=since)
+            .order_by("id")
+            .values_list("id", "product_id", "operation", "changed_at", "previous_category")[: limit + 1]
+        )
+
+    @staticmethod
+    def _latest_change_entries(entries: list[tuple]) -> dict[int, tuple]:
+        """
+        Collapse change log entries into the latest entry of every product, ordered by their sequence numbers.
+        The earliest recorded previous category is kept, since it is the one the product was seen in before.
+        """
+
+        latest_entries = {}
+
+        for entry in entries:
+            seq, product_id, operation, changed_at, previous_category = entry
+            earlier_entry = latest_entries.pop(product_id, None)
+
+            if earlier_entry is not None and earlier_entry[4] is not None:
+                entry = (seq, product_id, operation, changed_at, earlier_entry[4])
+
+            latest_entries[product_id] = entry
+
+        return latest_entries
+
+    @staticmethod
+    def _live_product_ids(latest_entries: dict[int, tuple]) -> list[int]:
+        """Get the ids of the changed products which were not deleted by their latest change."""
+
+        return [
+            product_id
+            for product_id, (_, _, operation, _, _) in latest_entries.items()
+            if operation != ProductChange.Operation.DELETED
+        ]
+
+    @staticmethod
+    def _entries_to_changes_dto(
+        entries: list[tuple],
+        latest_entries: dict[int, tuple],
+        products_dto: list[ProductDTO],
+        since: int,
+        limit: int,
+    ) -> ProductChangesDTO:
+        """
+        Build the changes of products from the read change log entries and the current data of the live products.
+
+        Args:
+            entries (list[tuple]): The read change log entries, including the one beyond the limit.
+            latest_entries (dict[int, tuple]): The latest entry of every changed product.
+            products_dto (list[ProductDTO]): The current data of the changed products which still exist.
+            since (int): The sequence number the entries were read after.
+            limit (int): The maximum number of log entries read at once.
+
+        Returns:
+            ProductChangesDTO - A data transfer object containing the changes and the sequence number to continue from.
+        """
 
-        return self._products_to_dto(products)
+        products_dto = {product_dto.id: product_dto for product_dto in products_dto}
+        read_entries = entries[:limit]
+
+        return ProductChangesDTO(
+            changes=[
+                ProductChangeDTO(
+                    seq=seq,
+                    product_id=product_id,
+                    operation=operation,
+                    changed_at=changed_at,
+                    product=products_dto.get(product_id) if operation != ProductChange.Operation.DELETED else None,
+                    previous_category=previous_category,
+                )
+                for seq, product_id, operation, changed_at, previous_category in latest_entries.values()
+            ],
+            next_since=read_entries[-1][0] if read_entries else since,
+            has_more=len(entries) > limit,
+        )
 
     @staticmethod
     def _product_to_dto(product: Product) -> ProductDTO:
@@ -165,44 +547,952 @@ class ProductRepository(ProductRepositoryInterface):
             description1=product.description1,
             description2=product.description2,
             price=product.price,
+            sku=product.sku,
         )
 
-    @classmethod
-    def _products_to_dto(cls, products: QuerySet[Product]) -> list[ProductDTO]:
+    @staticmethod
+    def _get_product_rows(products: QuerySet[Product]) -> QuerySet:
         """
-        Converts a QuerySet of Product objects to a list of ProductDTO objects.
+        Select the rows of GetProductDTO objects, so neither model instances nor the search vectors
+        of the products are loaded. The description is joined by _get_product_row_to_dto rather than
+        by the database, since compiling the concatenation costs more than the rest of the query.
 
         Args:
-            products (QuerySet[Product]): A QuerySet of Product objects to be converted.
+            products (QuerySet[Product]): A QuerySet of the products to select.
 
         Returns:
-            list[ProductDTO]: A list of ProductDTO objects containing the converted data.
+            QuerySet - A QuerySet of row tuples with the GET_PRODUCT_ROW_FIELDS columns.
         """
 
-        products_dto = [cls._product_to_dto(product) for product in products]
-
-        return products_dto
+        return products.values_list(*GET_PRODUCT_ROW_FIELDS)
 
     @staticmethod
-    def _product_to_get_dto(product: Product) -> GetProductDTO:
+    def _get_product_row_to_dto(row: tuple) -> GetProductDTO:
+        """Convert a row selected by _get_product_rows into a GetProductDTO object."""
+
+        *fields, description1, description2 = row
+
+        return row_constructor(GetProductDTO, GET_PRODUCT_ROW_FIELDS[:-2] + ("description",))(
+            (*fields, f"{description1}{Product.DESCRIPTION_SEPARATOR}{description2}")
+        )
+
+
+class ProductRepository(BaseProductRepository, ProductRepositoryInterface):
+    """The ProductRepository class handles the retrieval of product data from the data storage."""
+
+    def create_product(self, new_product_dto: NewProductDTO) -> ProductDTO:
         """
-        Convert a data model object (Product) into a GetProductDTO object.
+        Create a new product
 
         Args:
-            product (Product): An instance of the Product model class.
+            new_product_dto (NewProductDTO): The data model object representing a product.
 
         Returns:
-            GetProductDTO - A data transfer object containing the product information.
+            ProductDTO - A data transfer object containing the product information.
+
+        Raises:
+            InstanceAlreadyExistsError: If a product with this sku already exists.
         """
 
-        return GetProductDTO(
-            id=product.pk,
-            name=product.name,
-            photo=product.photo,
-            category=product.category,
-            offer_of_the_month=product.offer_of_the_month,
-            availability=product.availability,
-            self_pickup=product.self_pickup,
-            description=product.description,
-            price=product.price,
-        )
+        product = self._new_product_dto_to_product(new_product_dto)
+
+        try:
+            self._insert_product(product)
+        except IntegrityError:
+            raise InstanceAlreadyExistsError(f"Product with sku {new_product_dto.sku} already exists")
+
+        return self._product_to_dto(product)
+
+    def bulk_create_products(self, new_products_dto: list[NewProductDTO], batch_size: int) -> int:
+        """
+        Create new products in batches inside a single transaction.
+
+        Args:
+            new_products_dto (list[NewProductDTO]): The data model objects representing products.
+            batch_size (int): The number of products inserted by a single query.
+
+        Returns:
+            int - The number of created products.
+
+        Raises:
+            InstanceAlreadyExistsError: If a product with one of the skus already exists.
+        """
+
+        products = [self._new_product_dto_to_product(new_product_dto) for new_product_dto in new_products_dto]
+
+        try:
+            with transaction.atomic():
+                Product.objects.bulk_create(products, batch_size=batch_size)
+                self._log_changes((product.pk for product in products), ProductChange.Operation.CREATED)
+        except IntegrityError:
+            raise InstanceAlreadyExistsError("Products with some of the skus already exist")
+
+        return len(products)
+
+    def bulk_upsert_products(self, new_products_dto: list[NewProductDTO], batch_size: int) -> int:
+        """
+        Create new products or update existing ones matched by sku, in batches inside a single transaction.
+        If the same sku occurs several times, the last occurrence wins.
+
+        Args:
+            new_products_dto (list[NewProductDTO]): The data model objects representing products, each with a sku.
+            batch_size (int): The number of products written by a single query.
+
+        Returns:
+            int - The number of created or updated products.
+        """
+
+        products = {
+            new_product_dto.sku: self._new_product_dto_to_product(new_product_dto)
+            for new_product_dto in new_products_dto
+        }
+
+        update_fields = [field.name for field in dc_fields(NewProductDTO) if field.name != "sku"]
+        update_fields += ["updated_at", "version"]
+
+        if supports_full_text_search():
+            update_fields.append("search_vector")
+
+        skus = list(products)
+        sku_batches = [skus[start : start + batch_size] for start in range(0, len(skus), batch_size)]
+
+        with transaction.atomic():
+            # The existing rows are locked, so their versions and categories cannot change before they are overwritten
+            existing_products = {}
+            for sku_batch in sku_batches:
+                existing_products.update(
+                    (sku, (product_id, version, category))
+                    for sku, product_id, version, category in Product.objects.select_for_update()
+                    .filter(sku__in=sku_batch)
+                    .values_list("sku", "id", "version", "category")
+                )
+
+            # Conflicting rows are updated with the inserted values, so existing products are inserted
+            # with their next version, while new products start at the first one
+            for sku, (_, version, _) in existing_products.items():
+                products[sku].version = version + 1
+
+            Product.objects.bulk_create(
+                products.values(),
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["sku"],
+                update_fields=update_fields,
+            )
+
+            # Changes are logged last, since the change log stays locked until the commit
+            for sku_batch in sku_batches:
+                created_skus = [sku for sku in sku_batch if sku not in existing_products]
+                if created_skus:
+                    self._log_selection_changes(
+                        Product.objects.filter(sku__in=created_skus), ProductChange.Operation.CREATED
+                    )
+
+                updated_products = [existing_products[sku] for sku in sku_batch if sku in existing_products]
+                if updated_products:
+                    self._log_changes(
+                        (product_id for product_id, _, _ in updated_products),
+                        ProductChange.Operation.UPDATED,
+                        {product_id: category for product_id, _, category in updated_products},
+                    )
+
+        return len(products)
+
+    def get_product_by_id(self, product_id: int) -> GetProductDTO:
+        """
+        Retrieve information about a product using its unique identifier.
+
+        Args:
+            product_id (int): The unique identifier of the product.
+
+        Returns:
+            GetProductDTO - A data transfer object containing the product information.
+
+        Raises:
+            InstanceDoesNotExistError: If no product with this id is found.
+        """
+
+        # The rows are not ordered, which first() would add, since at most one product has the id
+        rows = list(self._get_product_rows(Product.objects.filter(id=product_id)))
+
+        if not rows:
+            raise InstanceDoesNotExistError(f"Product with id {product_id} not found")
+
+        return self._get_product_row_to_dto(rows[0])
+
+    def get_products_by_ids(self, product_ids: list[int]) -> list[GetProductDTO]:
+        """
+        Retrieve information about several products using their unique identifiers with a single query.
+
+        Args:
+            product_ids (list[int]): The unique identifiers of the products.
+
+        Returns:
+            list[GetProductDTO] - Data transfer objects of the found products, in no particular order.
+        """
+
+        return [
+            self._get_product_row_to_dto(row)
+            for row in self._get_product_rows(Product.objects.filter(id__in=product_ids))
+        ]
+
+    def get_product_version(self, product_id: int) -> VersionDTO:
+        """
+        Retrieve the version of a product without loading the product itself.
+
+        Args:
+            product_id (int): The unique identifier of the product.
+
+        Returns:
+            VersionDTO - A data transfer object containing the version number and modification time of the product.
+
+        Raises:
+            InstanceDoesNotExistError: If no product with this id is found.
+        """
+
+        version = Product.objects.filter(id=product_id).values_list("version", "updated_at").first()
+
+        if version is None:
+            raise InstanceDoesNotExistError(f"Product with id {product_id} not found")
+
+        return VersionDTO(count=1, last_modified=version[1], version=version[0])
+
+    def get_products_version(self, query_params_dto: QueryParamsDTO) -> VersionDTO:
+        """
+        Retrieve the version of the list of products filtered by the provided parameters
+        with a single aggregate query, without loading the products themselves.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
+
+        Returns:
+            VersionDTO - A data transfer object containing the number of products and the latest modification time.
+        """
+
+        version = Product.objects.filter(self._build_filter_conditions(query_params_dto)).aggregate(
+            count=Count("id"),
+            last_modified=Max("updated_at"),
+        )
+
+        return VersionDTO(count=version["count"], last_modified=version["last_modified"])
+
+    def partial_update_product(
+        self,
+        product_id: int,
+        partial_product_dto: PartialProductDTO,
+        expected_versions: Optional[set[int]] = None,
+    ) -> UpdatedProductDTO:
+        """
+        Partial update product with a single UPDATE ... RETURNING query, which writes only the provided fields,
+        increments the version and returns the updated row, so the product is neither read before nor after.
+        If no field is provided, nothing is written and the product is returned with its current version.
+
+        Args:
+            product_id (int): The unique identifier of the product.
+            partial_product_dto (PartialProductDTO): The data model object representing partial data of a product.
+            expected_versions (Optional[set[int]]): The versions the product is updated from, any version if None.
+
+        Returns:
+            UpdatedProductDTO - A data transfer object containing the product information and its new version.
+
+        Raises:
+            InstanceDoesNotExistError: If no product with this id is found.
+            InstanceAlreadyExistsError: If another product with this sku already exists.
+            PreconditionFailedError: If the product has none of the expected versions.
+        """
+
+        update_fields = self._partial_product_dto_to_fields(partial_product_dto)
+        returning = PRODUCT_DTO_FIELDS + ("version", "updated_at")
+
+        products = Product.objects.filter(id=product_id)
+
+        if expected_versions is not None:
+            products = products.filter(version__in=expected_versions)
+
+        # Tags which name no version can match no product
+        if expected_versions is not None and not expected_versions:
+            rows = []
+        elif not update_fields:
+            # Nothing is changed, so the product keeps its version and modification time and no change is logged
+            rows = list(products.values_list(*returning))
+        else:
+            update_fields.update(self._search_vector_fields(update_fields))
+            update_fields.update(updated_at=timezone.now(), version=F("version") + 1)
+
+            try:
+                with transaction.atomic():
+                    # The category is read before it is changed, so subscribers of the old one learn about the move
+                    previous_categories = None
+                    if "category" in update_fields:
+                        previous_categories = dict(products.select_for_update().values_list("id", "category"))
+
+                    rows = update_returning(products, update_fields, returning)
+
+                    if rows:
+                        self._log_changes([product_id], ProductChange.Operation.UPDATED, previous_categories)
+            except IntegrityError:
+                raise InstanceAlreadyExistsError(f"Product with sku {partial_product_dto.sku} already exists")
+
+        if not rows:
+            if expected_versions is not None and Product.objects.filter(id=product_id).exists():
+                raise PreconditionFailedError(f"Product with id {product_id} has been modified")
+
+            raise InstanceDoesNotExistError(f"Product with id {product_id} not found")
+
+        *product_row, version, updated_at = rows[0]
+
+        return UpdatedProductDTO(
+            product=row_constructor(ProductDTO)(product_row),
+            version=version,
+            last_modified=updated_at,
+        )
+
+    def delete_product_by_id(self, product_id: int) -> None:
+        """
+        Delete information about a product using its unique identifier.
+
+        The product is not loaded: without signals or cascades of Product the ORM deletes it
+        with a single DELETE query, and the number of deleted rows tells whether it existed.
+
+        Args:
+            product_id (int): The unique identifier of the product.
+
+        Returns:
+            None
+
+        Raises:
+            InstanceDoesNotExistError: If no product with this id is found.
+        """
+
+        with transaction.atomic():
+            deleted, _ = Product.objects.filter(id=product_id).delete()
+
+            if not deleted:
+                raise InstanceDoesNotExistError(f"Product with id {product_id} not found")
+
+            self._log_changes([product_id], ProductChange.Operation.DELETED)
+
+    def partial_update_products(self, query_params_dto: QueryParamsDTO, partial_product_dto: PartialProductDTO) -> int:
+        """
+        Partial update all products matching the provided parameters with a single query.
+        If no field is provided, nothing is written and the matching products are only counted.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
+            partial_product_dto (PartialProductDTO): The data model object representing partial data of a product.
+
+        Returns:
+            int - The number of updated products.
+        """
+
+        update_fields = self._partial_product_dto_to_fields(partial_product_dto)
+        products = Product.objects.filter(self._build_filter_conditions(query_params_dto))
+
+        # Nothing is changed, so the products keep their versions and modification times and no change is logged
+        if not update_fields:
+            return products.count()
+
+        update_fields.update(self._search_vector_fields(update_fields))
+        update_fields.update(updated_at=timezone.now(), version=F("version") + 1)
+
+        with transaction.atomic():
+            self._log_selection_changes(products, ProductChange.Operation.UPDATED)
+            return products.update(**update_fields)
+
+    def delete_products(self, query_params_dto: QueryParamsDTO) -> int:
+        """
+        Delete all products matching the provided parameters.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
+
+        Returns:
+            int - The number of deleted products.
+        """
+
+        products = Product.objects.filter(self._build_filter_conditions(query_params_dto))
+
+        with transaction.atomic():
+            self._log_selection_changes(products, ProductChange.Operation.DELETED)
+            deleted, _ = products.delete()
+
+        return deleted
+
+    def get_products(self, query_params_dto: QueryParamsDTO) -> ProductPageDTO:
+        """
+        Retrieve a list of products filtered by the provided parameters.
+        If a limit is provided, a single keyset-paginated page is returned.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter and pagination parameters.
+
+        Returns:
+            ProductPageDTO - A data transfer object containing a list of products and the cursors of adjacent pages.
+
+        Raises:
+            InstanceDoesNotExistError: If no products is found.
+        """
+
+        products = Product.objects.filter(self._build_filter_conditions(query_params_dto))
+
+        if query_params_dto.limit is not None:
+            return self._get_products_page(products, query_params_dto)
+
+        if query_params_dto.ordering:
+            products = products.order_by(*self._ordering_to_order_by(query_params_dto.ordering))
+
+        products_dto = self._products_to_dto(products, self._selected_fields(query_params_dto))
+
+        if not products_dto:
+            raise InstanceDoesNotExistError("Products not found")
+
+        return ProductPageDTO(items=products_dto)
+
+    def iter_products(self, query_params_dto: QueryParamsDTO, chunk_size: int) -> Iterator[ProductDTO]:
+        """
+        Lazily iterate over all products filtered by the provided parameters.
+        Rows are fetched from the data storage in chunks, so memory usage does not depend on the number of products.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
+            chunk_size (int): The number of rows fetched from the data storage at a time.
+
+        Returns:
+            Iterator(ProductDTO) - An iterator of data transfer objects containing information about products.
+        """
+
+        products = Product.objects.filter(self._build_filter_conditions(query_params_dto)).order_by("id")
+
+        row_to_dto = row_constructor(ProductDTO)
+
+        for row in products.values_list(*PRODUCT_DTO_FIELDS).iterator(chunk_size=chunk_size):
+            yield row_to_dto(row)
+
+    def get_product_facets(self, query_params_dto: QueryParamsDTO) -> ProductFacetsDTO:
+        """
+        Compute facets of the products filtered by the provided parameters: the number of products
+        and price statistics of every category, and the number of products with every value of each flag.
+
+        Products are counted with a single GROUP BY query over the category and the flags, which returns
+        at most eight rows per category. The facets are summed up from these rows.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
+
+        Returns:
+            ProductFacetsDTO - A data transfer object containing the facets.
+        """
+
+        groups = (
+            Product.objects.filter(self._build_filter_conditions(query_params_dto))
+            .values_list("category", *FACET_FLAGS)
+            .annotate(count=Count("id"), price_min=Min("price"), price_max=Max("price"), price_sum=Sum("price"))
+            .order_by()
+        )
+
+        total_count = 0
+        categories = {}
+        flag_counts = {flag: {True: 0, False: 0} for flag in FACET_FLAGS}
+
+        for category, *flags, count, price_min, price_max, price_sum in groups:
+            total_count += count
+
+            for flag, value in zip(FACET_FLAGS, flags):
+                flag_counts[flag][value] += count
+
+            if category in categories:
+                category_count, category_min, category_max, category_sum = categories[category]
+                categories[category] = (
+                    category_count + count,
+                    min(category_min, price_min),
+                    max(category_max, price_max),
+                    category_sum + price_sum,
+                )
+            else:
+                categories[category] = (count, price_min, price_max, price_sum)
+
+        return ProductFacetsDTO(
+            count=total_count,
+            categories=[
+                CategoryFacetDTO(
+                    category=category,
+                    count=count,
+                    price_min=price_min,
+                    price_max=price_max,
+                    price_avg=(Decimal(price_sum) / count).quantize(Decimal("0.01")),
+                )
+                for category, (count, price_min, price_max, price_sum) in sorted(categories.items())
+            ],
+            **{
+                flag: FlagFacetDTO(true_count=counts[True], false_count=counts[False])
+                for flag, counts in flag_counts.items()
+            },
+        )
+
+    def get_product_changes(self, since: int, limit: int) -> ProductChangesDTO:
+        """
+        Retrieve changes of products recorded after the given sequence number, in the order they were made.
+        Several changes of the same product are collapsed into the latest one, which carries the current
+        data of the product, or no data if the product was deleted.
+
+        Args:
+            since (int): The sequence number of the last change already seen by the client, 0 for all changes.
+            limit (int): The maximum number of log entries read at once.
+
+        Returns:
+            ProductChangesDTO - A data transfer object containing the changes and the sequence number to continue from.
+        """
+
+        entries = list(self._change_entries(since, limit))
+        latest_entries = self._latest_change_entries(entries[:limit])
+        products = Product.objects.filter(id__in=self._live_product_ids(latest_entries))
+
+        return self._entries_to_changes_dto(entries, latest_entries, self._products_to_dto(products), since, limit)
+
+    def search_products(self, search_query_dto: SearchQueryDTO) -> ProductSearchResultDTO:
+        """
+        Find products matching a full-text search query, ordered by relevance.
+
+        On PostgreSQL the query is matched against the maintained search vectors using their GIN index.
+        Other databases are searched with the in-process inverted index of the searchable fields.
+
+        Args:
+            search_query_dto (SearchQueryDTO): A data transfer object containing the query and pagination parameters.
+
+        Returns:
+            ProductSearchResultDTO - A data transfer object containing a page of found products
+            and the offset of the next page.
+        """
+
+        limit, offset = search_query_dto.limit, search_query_dto.offset
+
+        if supports_full_text_search():
+            query = product_search_query(search_query_dto.query)
+            products = (
+                Product.objects.filter(search_vector=query)
+                .annotate(rank=SearchRank(F("search_vector"), query))
+                .order_by("-rank", "id")
+            )
+            page = self._products_to_dto(products[offset : offset + limit + 1])
+        else:
+            product_ids = product_search_index.search(
+                search_query_dto.query,
+                lambda: ProductChange.objects.aggregate(seq=Max("id"))["seq"] or 0,
+                lambda since: ProductChange.objects.filter(id__gt=since).values_list("id", "product_id").iterator(),
+                self._search_index_rows,
+            )
+            page_ids = product_ids[offset : offset + limit + 1]
+            products_dto = {
+                product_dto.id: product_dto
+                for product_dto in self._products_to_dto(Product.objects.filter(id__in=page_ids))
+            }
+            page = [products_dto[product_id] for product_id in page_ids if product_id in products_dto]
+
+        has_more = len(page) > limit
+
+        return ProductSearchResultDTO(items=page[:limit], next_offset=offset + limit if has_more else None)
+
+    @staticmethod
+    def _search_index_rows(product_ids: Optional[set[int]]) -> Iterable[tuple]:
+        """Select the searchable fields of the given products, or of all products if None, for the search index."""
+
+        products = Product.objects.all() if product_ids is None else Product.objects.filter(id__in=product_ids)
+
+        return products.values_list("id", *SEARCH_FIELD_WEIGHTS).iterator()
+
+    @classmethod
+    def _get_products_page(cls, products: QuerySet[Product], query_params_dto: QueryParamsDTO) -> ProductPageDTO:
+        """
+        Fetch a single page of products using keyset pagination.
+
+        Args:
+            products (QuerySet[Product]): A filtered QuerySet of Product objects.
+            query_params_dto (QueryParamsDTO): A data transfer object containing pagination parameters.
+
+        Returns:
+            ProductPageDTO - A data transfer object containing a page of products and the cursors of adjacent pages.
+
+        Raises:
+            InstanceDoesNotExistError: If no products is found.
+        """
+
+        page_products, cursor_dto, ordering = cls._page_queryset(products, query_params_dto)
+        page = cls._products_to_dto(page_products, cls._selected_fields(query_params_dto, ordering))
+
+        return cls._rows_to_page(page, query_params_dto, cursor_dto, ordering)
+
+    @classmethod
+    def _products_to_dto(
+        cls, products: QuerySet[Product], fields: tuple[str, ...] = PRODUCT_DTO_FIELDS
+    ) -> list[ProductDTO]:
+        """
+        Converts a QuerySet of Product objects to a list of ProductDTO objects.
+        Only the given columns of ProductDTO are selected, and rows are fetched as tuples
+        straight into the data transfer objects without creating model instances.
+
+        Args:
+            products (QuerySet[Product]): A QuerySet of Product objects to be converted.
+            fields (tuple[str, ...]): The names of the ProductDTO fields to select, all of them by default.
+
+        Returns:
+            list[ProductDTO]: A list of ProductDTO objects containing the converted data.
+        """
+
+        row_to_dto = cls._row_converter(fields)
+
+        products_dto = [row_to_dto(row) for row in products.values_list(*fields)]
+
+        return products_dto
+
+
+class CachedProductRepository(ProductRepositoryInterface):
+    """
+    The CachedProductRepository class is a read-through caching decorator for another product repository.
+
+    Products retrieved by id are cached by their id and removed from the cache when they are updated or deleted.
+    Changes whose affected products are not known in advance invalidate all cached products at once.
+    Every change also invalidates the catalog cache holding results derived from the whole catalog, such as lists.
+    """
+
+    def __init__(
+        self,
+        product_repository: ProductRepositoryInterface,
+        product_cache: GenerationalCache,
+        catalog_cache: GenerationalCache,
+    ):
+        self.product_repository = product_repository
+        self.product_cache = product_cache
+        self.catalog_cache = catalog_cache
+
+    def create_product(self, new_product_dto: NewProductDTO) -> ProductDTO:
+        product_dto = self.product_repository.create_product(new_product_dto)
+        self.catalog_cache.invalidate()
+        return product_dto
+
+    def bulk_create_products(self, new_products_dto: list[NewProductDTO], batch_size: int) -> int:
+        count = self.product_repository.bulk_create_products(new_products_dto, batch_size)
+        self.catalog_cache.invalidate()
+        return count
+
+    def bulk_upsert_products(self, new_products_dto: list[NewProductDTO], batch_size: int) -> int:
+        count = self.product_repository.bulk_upsert_products(new_products_dto, batch_size)
+        self.product_cache.invalidate()
+        self.catalog_cache.invalidate()
+        return count
+
+    def get_product_by_id(self, product_id: int) -> GetProductDTO:
+        return self.product_cache.get_or_load(
+            product_id, lambda: self.product_repository.get_product_by_id(product_id)
+        )
+
+    def get_products_by_ids(self, product_ids: list[int]) -> list[GetProductDTO]:
+        products_dto, generation = self.product_cache.get_many(product_ids)
+        missing_ids = [product_id for product_id in product_ids if product_id not in products_dto]
+
+        if missing_ids:
+            loaded_products_dto = {
+                product_dto.id: product_dto for product_dto in self.product_repository.get_products_by_ids(missing_ids)
+            }
+            self.product_cache.set_many(loaded_products_dto, generation)
+            products_dto.update(loaded_products_dto)
+
+        return list(products_dto.values())
+
+    def get_product_version(self, product_id: int) -> VersionDTO:
+        product_dto, _ = self.product_cache.get(product_id)
+
+        if product_dto is not None and product_dto.version is not None:
+            return VersionDTO(count=1, last_modified=product_dto.updated_at, version=product_dto.version)
+
+        return self.product_repository.get_product_version(product_id)
+
+    def get_products_version(self, query_params_dto: QueryParamsDTO) -> VersionDTO:
+        return self.product_repository.get_products_version(query_params_dto)
+
+    def partial_update_product(
+        self,
+        product_id: int,
+        partial_product_dto: PartialProductDTO,
+        expected_versions: Optional[set[int]] = None,
+    ) -> UpdatedProductDTO:
+        updated_product_dto = self.product_repository.partial_update_product(
+            product_id, partial_product_dto, expected_versions
+        )
+
+        # An update without fields writes nothing, so the cached product and lists stay fresh
+        if BaseProductRepository._partial_product_dto_to_fields(partial_product_dto):
+            self.product_cache.delete(product_id)
+            self.catalog_cache.invalidate()
+
+        return updated_product_dto
+
+    def delete_product_by_id(self, product_id: int) -> None:
+        self.product_repository.delete_product_by_id(product_id)
+        self.product_cache.delete(product_id)
+        self.catalog_cache.invalidate()
+
+    def partial_update_products(self, query_params_dto: QueryParamsDTO, partial_product_dto: PartialProductDTO) -> int:
+        count = self.product_repository.partial_update_products(query_params_dto, partial_product_dto)
+
+        if BaseProductRepository._partial_product_dto_to_fields(partial_product_dto):
+            self._invalidate_selection(query_params_dto)
+
+        return count
+
+    def delete_products(self, query_params_dto: QueryParamsDTO) -> int:
+        count = self.product_repository.delete_products(query_params_dto)
+        self._invalidate_selection(query_params_dto)
+        return count
+
+    def get_products(self, query_params_dto: QueryParamsDTO) -> ProductPageDTO:
+        return self.product_repository.get_products(query_params_dto)
+
+    def iter_products(self, query_params_dto: QueryParamsDTO, chunk_size: int) -> Iterator[ProductDTO]:
+        return self.product_repository.iter_products(query_params_dto, chunk_size)
+
+    def get_product_facets(self, query_params_dto: QueryParamsDTO) -> ProductFacetsDTO:
+        cache_key = "facets:" + hashlib.sha1(repr(astuple(query_params_dto)).encode("utf-8")).hexdigest()
+
+        return self.catalog_cache.get_or_load(
+            cache_key, lambda: self.product_repository.get_product_facets(query_params_dto)
+        )
+
+    def get_product_changes(self, since: int, limit: int) -> ProductChangesDTO:
+        return self.product_repository.get_product_changes(since, limit)
+
+    def search_products(self, search_query_dto: SearchQueryDTO) -> ProductSearchResultDTO:
+        return self.product_repository.search_products(search_query_dto)
+
+    def _invalidate_selection(self, query_params_dto: QueryParamsDTO) -> None:
+        """Remove cached products selected by the provided parameters."""
+
+        if query_params_dto.ids is not None:
+            self.product_cache.delete_many(query_params_dto.ids)
+        else:
+            self.product_cache.invalidate()
+
+        self.catalog_cache.invalidate()
+
+
+class AsyncProductRepository(BaseProductRepository, AsyncProductRepositoryInterface):
+    """
+    The AsyncProductRepository class handles the retrieval of product data from the data storage
+    using the asynchronous interface of the ORM.
+    """
+
+    async def create_product(self, new_product_dto: NewProductDTO) -> ProductDTO:
+        """
+        Create a new product
+
+        Args:
+            new_product_dto (NewProductDTO): The data model object representing a product.
+
+        Returns:
+            ProductDTO - A data transfer object containing the product information.
+
+        Raises:
+            InstanceAlreadyExistsError: If a product with this sku already exists.
+        """
+
+        product = self._new_product_dto_to_product(new_product_dto)
+
+        try:
+            await sync_to_async(self._insert_product)(product)
+        except IntegrityError:
+            raise InstanceAlreadyExistsError(f"Product with sku {new_product_dto.sku} already exists")
+
+        return self._product_to_dto(product)
+
+    async def get_product_by_id(self, product_id: int) -> GetProductDTO:
+        """
+        Retrieve information about a product using its unique identifier.
+
+        Args:
+            product_id (int): The unique identifier of the product.
+
+        Returns:
+            GetProductDTO - A data transfer object containing the product information.
+
+        Raises:
+            InstanceDoesNotExistError: If no product with this id is found.
+        """
+
+        rows = [row async for row in self._get_product_rows(Product.objects.filter(id=product_id))]
+
+        if not rows:
+            raise InstanceDoesNotExistError(f"Product with id {product_id} not found")
+
+        return self._get_product_row_to_dto(rows[0])
+
+    async def get_product_version(self, product_id: int) -> VersionDTO:
+        """
+        Retrieve the version of a product without loading the product itself.
+
+        Args:
+            product_id (int): The unique identifier of the product.
+
+        Returns:
+            VersionDTO - A data transfer object containing the version number and modification time of the product.
+
+        Raises:
+            InstanceDoesNotExistError: If no product with this id is found.
+        """
+
+        version = await Product.objects.filter(id=product_id).values_list("version", "updated_at").afirst()
+
+        if version is None:
+            raise InstanceDoesNotExistError(f"Product with id {product_id} not found")
+
+        return VersionDTO(count=1, last_modified=version[1], version=version[0])
+
+    async def get_products_version(self, query_params_dto: QueryParamsDTO) -> VersionDTO:
+        """
+        Retrieve the version of the list of products filtered by the provided parameters
+        with a single aggregate query, without loading the products themselves.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter parameters.
+
+        Returns:
+            VersionDTO - A data transfer object containing the number of products and the latest modification time.
+        """
+
+        version = await Product.objects.filter(self._build_filter_conditions(query_params_dto)).aaggregate(
+            count=Count("id"),
+            last_modified=Max("updated_at"),
+        )
+
+        return VersionDTO(count=version["count"], last_modified=version["last_modified"])
+
+    async def get_products(self, query_params_dto: QueryParamsDTO) -> ProductPageDTO:
+        """
+        Retrieve a list of products filtered by the provided parameters.
+        If a limit is provided, a single keyset-paginated page is returned.
+
+        Args:
+            query_params_dto (QueryParamsDTO): A data transfer object containing filter and pagination parameters.
+
+        Returns:
+            ProductPageDTO - A data transfer object containing a list of products and the cursors of adjacent pages.
+
+        Raises:
+            InstanceDoesNotExistError: If no products is found.
+        """
+
+        products = Product.objects.filter(self._build_filter_conditions(query_params_dto))
+
+        if query_params_dto.limit is not None:
+            page_products, cursor_dto, ordering = self._page_queryset(products, query_params_dto)
+            page = await self._products_to_dto(page_products, self._selected_fields(query_params_dto, ordering))
+            return self._rows_to_page(page, query_params_dto, cursor_dto, ordering)
+
+        if query_params_dto.ordering:
+            products = products.order_by(*self._ordering_to_order_by(query_params_dto.ordering))
+
+        products_dto = await self._products_to_dto(products, self._selected_fields(query_params_dto))
+
+        if not products_dto:
+            raise InstanceDoesNotExistError("Products not found")
+
+        return ProductPageDTO(items=products_dto)
+
+    async def get_product_changes(self, since: int, limit: int) -> ProductChangesDTO:
+        """
+        Retrieve changes of products recorded after the given sequence number, in the order they were made.
+        Several changes of the same product are collapsed into the latest one, which carries the current
+        data of the product, or no data if the product was deleted.
+
+        Args:
+            since (int): The sequence number of the last change already seen, 0 for all changes.
+            limit (int): The maximum number of log entries read at once.
+
+        Returns:
+            ProductChangesDTO - A data transfer object containing the changes and the sequence number to continue from.
+        """
+
+        entries = [entry async for entry in self._change_entries(since, limit)]
+        latest_entries = self._latest_change_entries(entries[:limit])
+        products = Product.objects.filter(id__in=self._live_product_ids(latest_entries))
+
+        return self._entries_to_changes_dto(
+            entries, latest_entries, await self._products_to_dto(products), since, limit
+        )
+
+    async def get_last_product_change_seq(self) -> int:
+        """
+        Retrieve the sequence number of the latest change of products.
+
+        Returns:
+            int - The sequence number, 0 if no change was made yet.
+        """
+
+        last_change = await ProductChange.objects.aaggregate(seq=Max("id"))
+
+        return last_change["seq"] or 0
+
+    @classmethod
+    async def _products_to_dto(
+        cls, products: QuerySet[Product], fields: tuple[str, ...] = PRODUCT_DTO_FIELDS
+    ) -> list[ProductDTO]:
+        """
+        Converts a QuerySet of Product objects to a list of ProductDTO objects,
+        fetching rows with the given columns as tuples through asynchronous iteration.
+
+        Args:
+            products (QuerySet[Product]): A QuerySet of Product objects to be converted.
+            fields (tuple[str, ...]): The names of the ProductDTO fields to select, all of them by default.
+
+        Returns:
+            list[ProductDTO]: A list of ProductDTO objects containing the converted data.
+        """
+
+        row_to_dto = cls._row_converter(fields)
+
+        return [row_to_dto(row) async for row in products.values_list(*fields)]
+
+
+class AsyncCachedProductRepository(AsyncProductRepositoryInterface):
+    """
+    The AsyncCachedProductRepository class is the asynchronous counterpart of CachedProductRepository
+    sharing its caches, so changes made through either of them are seen by both.
+    """
+
+    def __init__(
+        self,
+        product_repository: AsyncProductRepositoryInterface,
+        product_cache: GenerationalCache,
+        catalog_cache: GenerationalCache,
+    ):
+        self.product_repository = product_repository
+        self.product_cache = product_cache
+        self.catalog_cache = catalog_cache
+
+    async def create_product(self, new_product_dto: NewProductDTO) -> ProductDTO:
+        product_dto = await self.product_repository.create_product(new_product_dto)
+        await self.catalog_cache.ainvalidate()
+        return product_dto
+
+    async def get_product_by_id(self, product_id: int) -> GetProductDTO:
+        return await self.product_cache.aget_or_load(
+            product_id, lambda: self.product_repository.get_product_by_id(product_id)
+        )
+
+    async def get_product_version(self, product_id: int) -> VersionDTO:
+        product_dto, _ = await self.product_cache.aget(product_id)
+
+        if product_dto is not None and product_dto.version is not None:
+            return VersionDTO(count=1, last_modified=product_dto.updated_at, version=product_dto.version)
+
+        return await self.product_repository.get_product_version(product_id)
+
+    async def get_products_version(self, query_params_dto: QueryParamsDTO) -> VersionDTO:
+        return await self.product_repository.get_products_version(query_params_dto)
+
+    async def get_products(self, query_params_dto: QueryParamsDTO) -> ProductPageDTO:
+        return await self.product_repository.get_products(query_params_dto)
+
+    async def get_product_changes(self, since: int, limit: int) -> ProductChangesDTO:
+        return await self.product_repository.get_product_changes(since, limit)
+
+    async def get_last_product_change_seq(self) -> int:
+        return await self.product_repository.get_last_product_change_seq()
@@ -0,0 +1,186 @@
+import re
+import threading
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connection
+from django.db.models import F, Value
+
+# Searchable fields of a product and the weight labels of their words, the name is the most relevant
+
+SEARCH_FIELD_WEIGHTS = {"name": "A", "category": "B", "description1": "C", "description2": "C"}
+
+# Ranks of the weight labels, the same as the defaults of the PostgreSQL ts_rank function
+
+LABEL_RANKS = {"A": 1.0, "B": 0.4, "C": 0.2, "D": 0.1}
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def supports_full_text_search() -> bool:
+    """Check whether the database maintains search vectors of products and answers search queries itself."""
+
+    return connection.vendor == "postgresql"
+
+
+def product_search_vector(values: Optional[dict] = None) -> SearchVector:
+    """
+    Build the expression of the weighted search vector of a product.
+
+    Args:
+        values (Optional[dict]): New values of the searchable fields. Fields which are not provided
+            are read from the row, so the expression can be used both in INSERT and UPDATE queries.
+
+    Returns:
+        SearchVector - The search vector expression.
+    """
+
+    values = values or {}
+    vector = None
+
+    for field, weight in SEARCH_FIELD_WEIGHTS.items():
+        source = Value(values[field]) if field in values else F(field)
+        field_vector = SearchVector(source, weight=weight, config=settings.PRODUCT_SEARCH_CONFIG)
+        vector = field_vector if vector is None else vector + field_vector
+
+    return vector
+
+
+def product_search_query(query: str) -> SearchQuery:
+    """Build a search query from user input in the web search engine syntax ("quoted phrases", -exclusions, or)."""
+
+    return SearchQuery(query, search_type="websearch", config=settings.PRODUCT_SEARCH_CONFIG)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a text into lowercase words."""
+
+    return WORD_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    Thread-safe in-process inverted index of the searchable product fields, used on databases
+    without full-text search such as SQLite. Every word is mapped to the products containing it
+    and their rank, the sum of the label ranks of the word occurrences.
+
+    The index is built from the database on first use and then kept up to date from the change log:
+    only the products changed since the last applied change are read again, unless there are more of them
+    than max_changed_products, in which case the index is rebuilt. Changes which bypass the change log,
+    e.g. saves from the admin site, are not seen until the process restarts.
+    Words are not stemmed, and products must contain every word of the query.
+    """
+
+    def __init__(self, max_changed_products: int = 500):
+        self.max_changed_products = max_changed_products
+        self._seq = None
+        self._postings = {}
+        self._words = {}
+        self._lock = threading.Lock()
+
+    def search(
+        self,
+        query: str,
+        load_last_seq: Callable[[], int],
+        load_changes: Callable[[int], Iterable[tuple]],
+        load_rows: Callable[[Optional[set[int]]], Iterable[tuple]],
+    ) -> list[int]:
+        """
+        Find products containing every word of the query.
+
+        Args:
+            query (str): The search query.
+            load_last_seq (Callable): A function returning the sequence number of the latest change of products.
+            load_changes (Callable): A function returning (seq, product_id) entries of the change log
+                recorded after the given sequence number.
+            load_rows (Callable): A function returning (id, name, category, description1, description2)
+                rows of the given products, or of all products if None is given.
+
+        Returns:
+            list[int] - The ids of the found products ordered by rank, from the most relevant.
+        """
+
+        with self._lock:
+            self._update(load_last_seq, load_changes, load_rows)
+            ranks = self._rank(query)
+
+        return sorted(ranks, key=lambda product_id: (-ranks[product_id], product_id))
+
+    def _update(self, load_last_seq, load_changes, load_rows) -> None:
+        """Apply the changes of products recorded after the last applied one, building the index on first use."""
+
+        # The sequence number is read before the rows, so changes made in between are applied again later
+        if self._seq is None:
+            seq, product_ids = load_last_seq(), None
+        else:
+            changes = list(load_changes(self._seq))
+
+            if not changes:
+                return
+
+            seq = max(change_seq for change_seq, _ in changes)
+            product_ids = {product_id for _, product_id in changes}
+
+            if len(product_ids) > self.max_changed_products:
+                product_ids = None
+
+        if product_ids is None:
+            self._postings, self._words = {}, {}
+        else:
+            for product_id in product_ids:
+                self._remove(product_id)
+
+        # Deleted products have no rows, so they are only removed
+        for product_id, *texts in load_rows(product_ids):
+            self._add(product_id, texts)
+
+        self._seq = seq
+
+    def _rank(self, query: str) -> dict[int, float]:
+        """Rank the products containing every word of the query."""
+
+        ranks = None
+
+        for word in dict.fromkeys(tokenize(query)):
+            word_postings = self._postings.get(word, {})
+
+            if ranks is None:
+                ranks = dict(word_postings)
+            else:
+                ranks = {
+                    product_id: rank + word_postings[product_id]
+                    for product_id, rank in ranks.items()
+                    if product_id in word_postings
+                }
+
+            if not ranks:
+                return {}
+
+        return ranks or {}
+
+    def _add(self, product_id: int, texts: list[Optional[str]]) -> None:
+        """Add the words of the searchable fields of a product to the postings."""
+
+        words = set()
+
+        for text, weight in zip(texts, SEARCH_FIELD_WEIGHTS.values()):
+            for word in tokenize(text or ""):
+                word_postings = self._postings.setdefault(word, {})
+                word_postings[product_id] = word_postings.get(product_id, 0.0) + LABEL_RANKS[weight]
+                words.add(word)
+
+        self._words[product_id] = words
+
+    def _remove(self, product_id: int) -> None:
+        """Remove a product from the postings of its words."""
+
+        for word in self._words.pop(product_id, ()):
+            word_postings = self._postings[word]
+            del word_postings[product_id]
+
+            if not word_postings:
+                del self._postings[word]
+
+
+product_search_index = InvertedIndex()
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from .pagination import ORDERING_FIELDS, decode_cursor
+
 
 class ProductCreateSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=100)
@@ -11,6 +13,15 @@ class ProductCreateSerializer(serializers.Serializer):
     description1 = serializers.CharField(max_length=500)
     description2 = serializers.CharField(max_length=500)
     price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    sku = serializers.CharField(max_length=64, required=False, allow_null=True)
+
+
+class ProductUpsertSerializer(ProductCreateSerializer):
+    sku = serializers.CharField(max_length=64)
+
+
+class ProductBulkResultSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
 
 
 class ProductSerializer(serializers.Serializer):
@@ -24,6 +35,10 @@ class ProductSerializer(serializers.Serializer):
     description1 = serializers.CharField()
     description2 = serializers.CharField()
     price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    sku = serializers.CharField(allow_null=True)
+
+
+PRODUCT_FIELDS = ProductSerializer._declared_fields
 
 
 class PartialProductSerializer(serializers.Serializer):
@@ -36,6 +51,7 @@ class PartialProductSerializer(serializers.Serializer):
     description1 = serializers.CharField(max_length=500, required=False, allow_blank=True, allow_null=True)
     description2 = serializers.CharField(max_length=500, required=False, allow_blank=True, allow_null=True)
     price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    sku = serializers.CharField(max_length=64, required=False, allow_null=True)
 
 
 class GetProductSerializer(serializers.Serializer):
@@ -48,3 +64,183 @@ class GetProductSerializer(serializers.Serializer):
     self_pickup = serializers.BooleanField()
     description = serializers.CharField()
     price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    sku = serializers.CharField(allow_null=True)
+
+
+class ProductFilterQueryParamsSerializer(serializers.Serializer):
+    is_offer_of_the_month = serializers.BooleanField(required=False, allow_null=True)
+    is_available = serializers.BooleanField(required=False, allow_null=True)
+    is_self_pickup = serializers.BooleanField(required=False, allow_null=True)
+
+
+class ProductQueryParamsSerializer(ProductFilterQueryParamsSerializer):
+    category = serializers.ListField(
+        child=serializers.CharField(max_length=50),
+        required=False,
+        allow_empty=False,
+        max_length=100,
+    )
+    price_min = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    price_max = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, required=False)
+    cursor = serializers.CharField(required=False)
+    ordering = serializers.ChoiceField(
+        choices=[prefix + field for field in ORDERING_FIELDS for prefix in ("", "-")],
+        required=False,
+    )
+    fields = serializers.CharField(required=False)
+
+    def validate_fields(self, value):
+        fields = {field.strip() for field in value.split(",")} - {""}
+        unknown_fields = fields - PRODUCT_FIELDS.keys()
+
+        if not fields:
+            raise serializers.ValidationError("At least one field must be provided.")
+
+        if unknown_fields:
+            raise serializers.ValidationError(f"Unknown fields: {', '.join(sorted(unknown_fields))}.")
+
+        return tuple(field for field in PRODUCT_FIELDS if field in fields)
+
+    def validate(self, attrs):
+        price_min, price_max = attrs.get("price_min"), attrs.get("price_max")
+        if price_min is not None and price_max is not None and price_min > price_max:
+            raise serializers.ValidationError({"price_max": "Must be greater than or equal to price_min."})
+        return attrs
+
+    def validate_cursor(self, value):
+        try:
+            decode_cursor(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid cursor.")
+        return value
+
+
+class ProductPageSerializer(serializers.Serializer):
+    next = serializers.CharField(source="next_cursor", allow_null=True)
+    previous = serializers.CharField(source="previous_cursor", allow_null=True)
+    results = ProductSerializer(source="items", many=True)
+
+
+class ProductSearchQueryParamsSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    offset = serializers.IntegerField(min_value=0, max_value=10000, default=0)
+
+
+class ProductSearchResultSerializer(serializers.Serializer):
+    next_offset = serializers.IntegerField(allow_null=True)
+    results = ProductSerializer(source="items", many=True)
+
+
+class CategoryFacetSerializer(serializers.Serializer):
+    category = serializers.CharField()
+    count = serializers.IntegerField()
+    price_min = serializers.DecimalField(max_digits=10, decimal_places=2)
+    price_max = serializers.DecimalField(max_digits=10, decimal_places=2)
+    price_avg = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+class FlagFacetSerializer(serializers.Serializer):
+    true = serializers.IntegerField(source="true_count")
+    false = serializers.IntegerField(source="false_count")
+
+
+class ProductFacetsSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    categories = CategoryFacetSerializer(many=True)
+    offer_of_the_month = FlagFacetSerializer()
+    availability = FlagFacetSerializer()
+    self_pickup = FlagFacetSerializer()
+
+
+class ProductChangesQueryParamsSerializer(serializers.Serializer):
+    since = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=100)
+
+
+class ProductChangeSerializer(serializers.Serializer):
+    seq = serializers.IntegerField()
+    product_id = serializers.IntegerField()
+    operation = serializers.CharField()
+    changed_at = serializers.DateTimeField()
+    product = ProductSerializer(allow_null=True)
+
+
+class ProductChangesSerializer(serializers.Serializer):
+    next_since = serializers.IntegerField()
+    has_more = serializers.BooleanField()
+    changes = ProductChangeSerializer(many=True)
+
+
+class ProductBatchQueryParamsSerializer(serializers.Serializer):
+    ids = serializers.CharField()
+
+    def validate_ids(self, value):
+        try:
+            ids = [int(product_id) for product_id in value.split(",") if product_id.strip()]
+        except ValueError:
+            raise serializers.ValidationError("Ids must be comma separated integers.")
+
+        if not ids:
+            raise serializers.ValidationError("At least one id must be provided.")
+
+        if any(product_id < 1 for product_id in ids):
+            raise serializers.ValidationError("Ids must be greater than or equal to 1.")
+
+        ids = list(dict.fromkeys(ids))
+
+        if len(ids) > 100:
+            raise serializers.ValidationError("At most 100 ids can be requested at once.")
+
+        return ids
+
+    def validate(self, attrs):
+        if any(name in self.initial_data for name in ProductQueryParamsSerializer._declared_fields):
+            raise serializers.ValidationError("Ids cannot be combined with the query parameters of lists.")
+        return attrs
+
+
+class ProductBatchSerializer(serializers.Serializer):
+    results = GetProductSerializer(source="products", many=True)
+    missing = serializers.ListField(child=serializers.IntegerField(), source="missing_ids")
+
+
+class ProductEventsQueryParamsSerializer(serializers.Serializer):
+    id = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=100,
+    )
+    category = serializers.ListField(
+        child=serializers.CharField(max_length=50),
+        required=False,
+        allow_empty=False,
+        max_length=100,
+    )
+    since = serializers.IntegerField(min_value=0, required=False)
+
+
+class BulkPartialProductSerializer(PartialProductSerializer):
+    sku = None
+
+    def validate(self, attrs):
+        if all(value is None for value in attrs.values()):
+            raise serializers.ValidationError("At least one field must be provided.")
+        return attrs
+
+
+class ProductSelectionSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+    filters = ProductFilterQueryParamsSerializer(required=False)
+
+    def validate(self, attrs):
+        filters = attrs.get("filters") or {}
+        if "ids" not in attrs and all(value is None for value in filters.values()):
+            raise serializers.ValidationError("Either ids or at least one filter must be provided.")
+        return attrs
+
+
+class ProductBulkPartialUpdateSerializer(ProductSelectionSerializer):
+    data = BulkPartialProductSerializer()
@@ -1,3 +1,469 @@
-from django.test import TestCase
+import asyncio
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.cache import GenerationalCache
+from core.exceptions import InstanceDoesNotExistError, PreconditionFailedError
+
+from .dto import NewProductDTO, PartialProductDTO, ProductChangeDTO, ProductDTO, QueryParamsDTO, SearchQueryDTO
+from .events import ProductChangeSubscription
+from .models import Product, ProductChange
+from .repositories import AsyncCachedProductRepository, ProductRepository
+from .search import InvertedIndex
+
+
+def create_products(count: int) -> list[Product]:
+    """Create products alternating between two categories, with the price growing with the number."""
+
+    return Product.objects.bulk_create(
+        Product(
+            name=f"Product {number}",
+            photo=f"https://example.com/{number}.jpg",
+            category="Phones" if number % 2 else "Laptops",
+            offer_of_the_month=bool(number % 3),
+            availability=True,
+            self_pickup=False,
+            description1="First description",
+            description2="Second description",
+            price=100 + number,
+            sku=f"SKU-{number}",
+        )
+        for number in range(count)
+    )
+
+
+def product_payload(product: Product) -> dict:
+    """Return the JSON representation of a product in product lists."""
+
+    return {
+        "id": product.id,
+        "name": product.name,
+        "photo": product.photo,
+        "category": product.category,
+        "offer_of_the_month": product.offer_of_the_month,
+        "availability": product.availability,
+        "self_pickup": product.self_pickup,
+        "description1": product.description1,
+        "description2": product.description2,
+        "price": f"{Decimal(product.price):.2f}",
+        "sku": product.sku,
+    }
+
+
+class ProductRepositoryQueriesTestCase(TestCase):
+    """Tests locking in the number of queries made by the product repository."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = create_products(10)
+
+    def test_get_products_makes_one_query(self):
+        with self.assertNumQueries(1):
+            product_page_dto = ProductRepository().get_products(QueryParamsDTO(categories=("Phones",)))
+
+        self.assertEqual(
+            [product_dto.id for product_dto in product_page_dto.items],
+            [product.id for product in self.products if product.category == "Phones"],
+        )
+        self.assertEqual(
+            product_page_dto.items[0],
+            ProductDTO(
+                id=self.products[1].id,
+                name="Product 1",
+                photo="https://example.com/1.jpg",
+                category="Phones",
+                offer_of_the_month=True,
+                availability=True,
+                self_pickup=False,
+                description1="First description",
+                description2="Second description",
+                price=Decimal("101.00"),
+                sku="SKU-1",
+            ),
+        )
+
+    def test_get_products_page_makes_one_query(self):
+        with self.assertNumQueries(1):
+            product_page_dto = ProductRepository().get_products(QueryParamsDTO(limit=3, ordering="price"))
+
+        self.assertEqual(
+            [product_dto.name for product_dto in product_page_dto.items],
+            ["Product 0", "Product 1", "Product 2"],
+        )
+        self.assertIsNotNone(product_page_dto.next_cursor)
+        self.assertIsNone(product_page_dto.previous_cursor)
+
+    def test_get_product_by_id_selects_only_the_detail_columns(self):
+        product = self.products[1]
+
+        with CaptureQueriesContext(connection) as context:
+            get_product_dto = ProductRepository().get_product_by_id(product.id)
+
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn("search_vector", context.captured_queries[0]["sql"])
+        self.assertNotIn("ORDER BY", context.captured_queries[0]["sql"])
+        self.assertEqual(get_product_dto.id, product.id)
+        self.assertEqual(get_product_dto.description, "First description <br/> Second description")
+        self.assertEqual(get_product_dto.sku, "SKU-1")
+
+    def test_delete_product_by_id_deletes_without_loading_the_product(self):
+        product_id = Product.objects.values_list("id", flat=True).first()
+
+        with CaptureQueriesContext(connection) as context:
+            ProductRepository().delete_product_by_id(product_id)
+
+        product_queries = [query["sql"] for query in context.captured_queries if '"products_product"' in query["sql"]]
+
+        # The change log entry is written by a separate query, the product itself is only deleted
+        self.assertEqual(len(product_queries), 1)
+        self.assertTrue(product_queries[0].startswith("DELETE"))
+        self.assertFalse(Product.objects.filter(id=product_id).exists())
+
+    def test_delete_product_by_id_raises_for_missing_product(self):
+        missing_id = self.products[-1].id + 1
+
+        with CaptureQueriesContext(connection) as context:
+            with self.assertRaises(InstanceDoesNotExistError):
+                ProductRepository().delete_product_by_id(missing_id)
+
+        product_queries = [query["sql"] for query in context.captured_queries if '"products_product"' in query["sql"]]
+
+        self.assertEqual(len(product_queries), 1)
+        self.assertEqual(Product.objects.count(), len(self.products))
+        self.assertFalse(ProductChange.objects.exists())
+
+
+class ProductRepositoryUpdatesTestCase(TestCase):
+    """Tests of updates which provide no fields."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = create_products(4)
+
+    def test_partial_update_product_without_fields_writes_nothing(self):
+        product = Product.objects.get(id=self.products[0].id)
+
+        with CaptureQueriesContext(connection) as context:
+            updated_product_dto = ProductRepository().partial_update_product(
+                product.id, PartialProductDTO(), {product.version}
+            )
+
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertTrue(context.captured_queries[0]["sql"].startswith("SELECT"))
+        self.assertEqual(updated_product_dto.version, product.version)
+        self.assertEqual(updated_product_dto.last_modified, product.updated_at)
+        self.assertEqual(updated_product_dto.product.name, product.name)
+        self.assertEqual(Product.objects.get(id=product.id).version, product.version)
+        self.assertFalse(ProductChange.objects.exists())
+
+    def test_partial_update_product_without_fields_checks_version(self):
+        product = self.products[0]
+
+        with self.assertRaises(PreconditionFailedError):
+            ProductRepository().partial_update_product(product.id, PartialProductDTO(), {product.version + 1})
+
+        with self.assertRaises(InstanceDoesNotExistError):
+            ProductRepository().partial_update_product(self.products[-1].id + 1, PartialProductDTO())
+
+    def test_partial_update_products_without_fields_writes_nothing(self):
+        with CaptureQueriesContext(connection) as context:
+            count = ProductRepository().partial_update_products(
+                QueryParamsDTO(categories=("Phones",)), PartialProductDTO()
+            )
+
+        self.assertEqual(count, 2)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertTrue(context.captured_queries[0]["sql"].startswith("SELECT"))
+        self.assertEqual(set(Product.objects.values_list("version", flat=True)), {1})
+        self.assertFalse(ProductChange.objects.exists())
+
+
+class ProductRepositoryBulkUpsertTestCase(TestCase):
+    """Tests of the versions and change log entries written by the bulk upsert."""
+
+    @staticmethod
+    def new_product_dto(sku: str, name: str) -> NewProductDTO:
+        return NewProductDTO(
+            name=name,
+            photo="https://example.com/photo.jpg",
+            category="Phones",
+            offer_of_the_month=False,
+            availability=True,
+            self_pickup=False,
+            description1="First description",
+            description2="Second description",
+            price=Decimal("100.00"),
+            sku=sku,
+        )
+
+    def test_bulk_upsert_starts_new_products_at_first_version_and_increments_existing(self):
+        ProductRepository().bulk_upsert_products([self.new_product_dto("SKU-1", "Old name")], batch_size=10)
+        self.assertEqual(Product.objects.get(sku="SKU-1").version, 1)
+
+        with CaptureQueriesContext(connection) as context:
+            count = ProductRepository().bulk_upsert_products(
+                [self.new_product_dto("SKU-1", "New name"), self.new_product_dto("SKU-2", "Created")],
+                batch_size=10,
+            )
+
+        self.assertEqual(count, 2)
+        self.assertEqual(
+            dict(Product.objects.values_list("sku", "version")),
+            {"SKU-1": 2, "SKU-2": 1},
+        )
+        self.assertEqual(Product.objects.get(sku="SKU-1").name, "New name")
+        self.assertFalse(any(query["sql"].startswith("UPDATE") for query in context.captured_queries))
+        product_ids = dict(Product.objects.values_list("sku", "id"))
+        self.assertEqual(
+            list(ProductChange.objects.order_by("id").values_list("product_id", "operation")),
+            [
+                (product_ids["SKU-1"], ProductChange.Operation.CREATED),
+                (product_ids["SKU-2"], ProductChange.Operation.CREATED),
+                (product_ids["SKU-1"], ProductChange.Operation.UPDATED),
+            ],
+        )
+
+
+class ProductChangeCategoryTestCase(TestCase):
+    """Tests of routing changes of products which moved to another category."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = create_products(4)
+
+    def test_changes_report_the_category_products_moved_from(self):
+        repository = ProductRepository()
+        phone, laptop = self.products[1], self.products[0]
+
+        repository.partial_update_product(phone.id, PartialProductDTO(category="Tablets"))
+        repository.partial_update_product(phone.id, PartialProductDTO(category="Watches"))
+        repository.partial_update_product(laptop.id, PartialProductDTO(name="Renamed"))
+
+        changes = {change.product_id: change for change in repository.get_product_changes(0, 10).changes}
+
+        self.assertEqual(changes[phone.id].product.category, "Watches")
+        self.assertEqual(changes[phone.id].previous_category, "Phones")
+        self.assertIsNone(changes[laptop.id].previous_category)
+
+    def test_selection_and_bulk_changes_report_previous_categories(self):
+        repository = ProductRepository()
+
+        repository.partial_update_products(
+            QueryParamsDTO(categories=("Phones",)), PartialProductDTO(category="Tablets")
+        )
+        repository.bulk_upsert_products(
+            [ProductRepositoryBulkUpsertTestCase.new_product_dto("SKU-0", "Upserted")], batch_size=10
+        )
+
+        self.assertEqual(
+            dict(ProductChange.objects.values_list("product_id", "previous_category")),
+            {
+                self.products[0].id: "Laptops",
+                self.products[1].id: "Phones",
+                self.products[3].id: "Phones",
+            },
+        )
+
+    def test_moved_product_matches_subscribers_of_both_categories(self):
+        product_dto = ProductRepository().get_products(QueryParamsDTO(ids=(self.products[1].id,))).items[0]
+        change_dto = ProductChangeDTO(
+            seq=1,
+            product_id=product_dto.id,
+            operation=ProductChange.Operation.UPDATED,
+            changed_at=self.products[1].updated_at,
+            product=product_dto,
+            previous_category="Laptops",
+        )
+
+        def subscription(*categories):
+            return ProductChangeSubscription(frozenset(), frozenset(categories), queue_size=1)
+
+        self.assertTrue(subscription("Phones").matches(change_dto))
+        self.assertTrue(subscription("Laptops").matches(change_dto))
+        self.assertFalse(subscription("Tablets").matches(change_dto))
+
+
+class InvertedIndexTestCase(SimpleTestCase):
+    """Tests of keeping the in-process search index up to date from the change log."""
+
+    def setUp(self):
+        self.index = InvertedIndex(max_changed_products=2)
+        self.rows = {
+            1: (1, "Red phone", "Phones", "", ""),
+            2: (2, "Blue phone", "Phones", "", ""),
+            3: (3, "Red laptop", "Laptops", "", ""),
+        }
+        self.changes = []
+        self.loaded = []
+
+    def search(self, query: str) -> list[int]:
+        return self.index.search(query, self.load_last_seq, self.load_changes, self.load_rows)
+
+    def load_last_seq(self) -> int:
+        return len(self.changes)
+
+    def load_changes(self, since: int) -> list[tuple]:
+        return self.changes[since:]
+
+    def load_rows(self, product_ids) -> list[tuple]:
+        self.loaded.append(product_ids)
+        return [row for product_id, row in self.rows.items() if product_ids is None or product_id in product_ids]
+
+    def change(self, product_id: int, row=None) -> None:
+        if row is None:
+            self.rows.pop(product_id)
+        else:
+            self.rows[product_id] = row
+
+        self.changes.append((len(self.changes) + 1, product_id))
+
+    def test_search_ranks_products_containing_every_word(self):
+        self.assertEqual(self.search("red"), [1, 3])
+        self.assertEqual(self.search("phones red"), [1])
+        self.assertEqual(self.search("green"), [])
+
+    def test_search_reads_only_changed_products(self):
+        self.search("red")
+        self.change(2, (2, "Red tablet", "Tablets", "", ""))
+        self.change(3)
+
+        self.assertEqual(self.search("red"), [1, 2])
+        self.assertEqual(self.search("laptop"), [])
+        self.assertEqual(self.loaded, [None, {2, 3}])
+
+    def test_search_rebuilds_index_after_many_changes(self):
+        self.search("red")
+        for product_id in (1, 2, 3):
+            self.change(product_id, (product_id, "Green", "Phones", "", ""))
+
+        self.assertEqual(self.search("green"), [1, 2, 3])
+        self.assertEqual(self.search("red"), [])
+        self.assertEqual(self.loaded, [None, None])
+
+
+class ProductRepositorySearchTestCase(TestCase):
+    """Tests of searching products on databases without full-text search."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = create_products(4)
+
+    def setUp(self):
+        patcher = mock.patch("products.repositories.product_search_index", InvertedIndex())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def search(self, query: str) -> list[str]:
+        search_result_dto = ProductRepository().search_products(SearchQueryDTO(query=query, limit=10, offset=0))
+        return [product_dto.name for product_dto in search_result_dto.items]
+
+    def test_search_sees_changes_made_through_the_repository(self):
+        repository = ProductRepository()
+        self.assertEqual(self.search("product 1"), ["Product 1"])
+
+        repository.partial_update_product(self.products[1].id, PartialProductDTO(name="Renamed"))
+        repository.delete_product_by_id(self.products[2].id)
+
+        with self.assertNumQueries(3):
+            self.assertEqual(self.search("renamed"), ["Renamed"])
+
+        self.assertEqual(self.search("product 1"), [])
+        self.assertEqual(self.search("product 2"), [])
+        self.assertEqual(self.search("product 3"), ["Product 3"])
+
+    def test_unchanged_catalog_is_searched_without_reading_the_index_rows(self):
+        self.search("product")
+
+        with CaptureQueriesContext(connection) as context:
+            self.search("product 3")
+
+        self.assertEqual(len(context.captured_queries), 2)
+        self.assertIn('"products_productchange"', context.captured_queries[0]["sql"])
+
+
+class ProductListApiTestCase(TestCase):
+    """Tests of the payload rendered by the product list endpoint."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = create_products(6)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_renders_filtered_products(self):
+        response = self.client.get("/products/", {"category": "Phones", "format": "json"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            [product_payload(product) for product in self.products if product.category == "Phones"],
+        )
+
+    def test_list_page_renders_products_and_cursor(self):
+        response = self.client.get("/products/", {"limit": 2, "ordering": "price", "format": "json"})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["results"], [product_payload(product) for product in self.products[:2]])
+        self.assertIsNone(payload["previous"])
+
+        next_page = self.client.get(
+            "/products/", {"limit": 2, "ordering": "price", "cursor": payload["next"], "format": "json"}
+        )
+
+        self.assertEqual(next_page.json()["results"], [product_payload(product) for product in self.products[2:4]])
+
+
+class AsyncCachedProductRepositoryLoadTestCase(SimpleTestCase):
+    """Load tests of concurrent reads of a product missing from the cache."""
+
+    concurrency = 100
+
+    class SlowProductRepository:
+        """Stand-in for the database counting the loads of a product, each of which takes a while."""
+
+        def __init__(self, failures: int = 0):
+            self.loads = 0
+            self.failures = failures
+
+        async def get_product_by_id(self, product_id: int):
+            self.loads += 1
+            await asyncio.sleep(0.05)
+
+            if self.loads <= self.failures:
+                raise InstanceDoesNotExistError(f"Product with id {product_id} not found")
+
+            return f"product {product_id}"
+
+    def setUp(self):
+        cache.clear()
+        self.product_cache = GenerationalCache("test:products", timeout=60, lock_timeout=5, poll_interval=0.01)
+        self.catalog_cache = GenerationalCache("test:catalog", timeout=60, lock_timeout=5, poll_interval=0.01)
+
+    async def test_concurrent_misses_load_product_once(self):
+        product_repository = self.SlowProductRepository()
+        repository = AsyncCachedProductRepository(product_repository, self.product_cache, self.catalog_cache)
+
+        products = await asyncio.gather(*(repository.get_product_by_id(1) for _ in range(self.concurrency)))
+
+        self.assertEqual(products, ["product 1"] * self.concurrency)
+        self.assertEqual(product_repository.loads, 1)
+
+    async def test_waiting_reader_takes_over_when_load_fails(self):
+        product_repository = self.SlowProductRepository(failures=1)
+        repository = AsyncCachedProductRepository(product_repository, self.product_cache, self.catalog_cache)
+
+        products = await asyncio.gather(
+            *(repository.get_product_by_id(1) for _ in range(self.concurrency)), return_exceptions=True
+        )
+
+        failed = [product for product in products if isinstance(product, InstanceDoesNotExistError)]
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(products.count("product 1"), self.concurrency - 1)
+        self.assertEqual(product_repository.loads, 2)
@@ -1,8 +1,25 @@
 from django.urls import path
 
-from .views import ApiProductListView, ApiProductDetailView
+from .views import (
+    ApiProductListView,
+    ApiProductDetailView,
+    ApiProductExportView,
+    ApiProductBulkView,
+    ApiProductSearchView,
+    ApiProductFacetsView,
+    ApiProductChangesView,
+)
+from .async_views import AsyncApiProductListView, AsyncApiProductDetailView, AsyncApiProductEventsView
 
 urlpatterns = [
     path("", ApiProductListView.as_view(), name="api-product-list"),
+    path("bulk/", ApiProductBulkView.as_view(), name="api-product-bulk"),
+    path("export/", ApiProductExportView.as_view(), name="api-product-export"),
+    path("search/", ApiProductSearchView.as_view(), name="api-product-search"),
+    path("facets/", ApiProductFacetsView.as_view(), name="api-product-facets"),
+    path("changes/", ApiProductChangesView.as_view(), name="api-product-changes"),
     path("<int:id>/", ApiProductDetailView.as_view(), name="api-product-detail"),
+    path("async/", AsyncApiProductListView.as_view(), name="async-api-product-list"),
+    path("async/events/", AsyncApiProductEventsView.as_view(), name="async-api-product-events"),
+    path("async/<int:id>/", AsyncApiProductDetailView.as_view(), name="async-api-product-detail"),
 ]
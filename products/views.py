@@ -1,23 +1,91 @@
+import hashlib
+from dataclasses import astuple
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework import status
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from drf_spectacular.types import OpenApiTypes
 
-from core.containers import ServiceContainer
+from core.conditional import (
+    make_etag,
+    make_version_etag,
+    get_if_match_versions,
+    get_not_modified_response,
+    set_validators,
+)
+from core.containers import ServiceContainer, CacheContainer
 from core.permissions import JWTPermissionValidator
-from core.exceptions import InstanceDoesNotExistError
-from core.responses import ResponseWithErrorSerializer, ValidationErrorResponseSerializer, AccessDeniedDetailSerializer
-from .dto import NewProductDTO, PartialProductDTO, QueryParamsDTO
-from .serializers import ProductCreateSerializer, ProductSerializer, PartialProductSerializer, GetProductSerializer
+from core.exceptions import InstanceDoesNotExistError, InstanceAlreadyExistsError, PreconditionFailedError
+from core.responses import (
+    ResponseWithErrorSerializer,
+    ValidationErrorResponseSerializer,
+    AccessDeniedDetailSerializer,
+    BulkValidationErrorResponseSerializer,
+)
+from .dto import NewProductDTO, PartialProductDTO, QueryParamsDTO, ProductDTO, SearchQueryDTO
+from .serializers import (
+    ProductCreateSerializer,
+    ProductUpsertSerializer,
+    ProductBulkResultSerializer,
+    ProductSerializer,
+    PartialProductSerializer,
+    GetProductSerializer,
+    ProductFilterQueryParamsSerializer,
+    ProductQueryParamsSerializer,
+    ProductSelectionSerializer,
+    ProductBulkPartialUpdateSerializer,
+    ProductSearchQueryParamsSerializer,
+    ProductSearchResultSerializer,
+    ProductFacetsSerializer,
+    ProductChangesQueryParamsSerializer,
+    ProductChangesSerializer,
+    ProductBatchQueryParamsSerializer,
+)
+from .renderers import NDJSONRenderer, ProductJSONRenderer, COMPACT_RENDERER_CLASSES
+
+PRODUCT_FILTER_PARAMETERS = [
+    OpenApiParameter(
+        name="is_offer_of_the_month",
+        type=OpenApiTypes.BOOL,
+        location=OpenApiParameter.QUERY,
+        description="Filter products by 'offer of the month' status (True/False).",
+    ),
+    OpenApiParameter(
+        name="is_available",
+        type=OpenApiTypes.BOOL,
+        location=OpenApiParameter.QUERY,
+        description="Filter products by availability status (True/False).",
+    ),
+    OpenApiParameter(
+        name="is_self_pickup",
+        type=OpenApiTypes.BOOL,
+        location=OpenApiParameter.QUERY,
+        description="Filter products by 'self pickup' status (True/False).",
+    ),
+]
 
 
 class ApiProductListView(APIView):
     """
     The ApiPetListView class defines API endpoints for create product and
     working with a list containing information about products.
+    Rendered JSON lists are cached until the next change of the catalog, and
+    lists the client already has are answered with 304 Not Modified.
+    Lists can also be requested in the compact columnar JSON or MessagePack formats with the Accept header.
     """
 
+    renderer_classes = [ProductJSONRenderer, *COMPACT_RENDERER_CLASSES, BrowsableAPIRenderer]
+
+    # Product fields rendered by the response to the current request, all of them if None
+    fields = None
+
     @extend_schema(
         summary="Create a new product",
         request=ProductCreateSerializer,
@@ -25,6 +93,7 @@ class ApiProductListView(APIView):
             200: ProductSerializer,
             401: AccessDeniedDetailSerializer,
             403: AccessDeniedDetailSerializer,
+            409: ResponseWithErrorSerializer,
         },
         tags=["Products"],
     )
@@ -42,7 +111,10 @@ class ApiProductListView(APIView):
 
         new_product_dto = NewProductDTO(**product_serializer.validated_data)
 
-        product_dto = product_service.create_product(new_product_dto)
+        try:
+            product_dto = product_service.create_product(new_product_dto)
+        except InstanceAlreadyExistsError as exception:
+            return Response({"error": str(exception.message)}, status=status.HTTP_409_CONFLICT)
 
         product = ProductSerializer(product_dto)
 
@@ -55,26 +127,70 @@ class ApiProductListView(APIView):
         summary="Retrieve information about all products by query params",
         responses={
             200: ProductSerializer(many=True),
+            304: None,
+            400: ValidationErrorResponseSerializer,
             404: ResponseWithErrorSerializer,
         },
         parameters=[
+            *PRODUCT_FILTER_PARAMETERS,
+            OpenApiParameter(
+                name="category",
+                type={"type": "array", "items": {"type": "string"}},
+                location=OpenApiParameter.QUERY,
+                explode=True,
+                description="Filter products by category, repeat the parameter to match any of several categories.",
+            ),
+            OpenApiParameter(
+                name="price_min",
+                type=OpenApiTypes.DECIMAL,
+                location=OpenApiParameter.QUERY,
+                description="Filter products with a price greater than or equal to the value.",
+            ),
             OpenApiParameter(
-                name="is_offer_of_the_month",
-                type=OpenApiTypes.BOOL,
+                name="price_max",
+                type=OpenApiTypes.DECIMAL,
                 location=OpenApiParameter.QUERY,
-                description="Filter products by 'offer of the month' status (True/False).",
+                description="Filter products with a price less than or equal to the value.",
             ),
             OpenApiParameter(
-                name="is_available",
-                type=OpenApiTypes.BOOL,
+                name="limit",
+                type=OpenApiTypes.INT,
                 location=OpenApiParameter.QUERY,
-                description="Filter products by availability status (True/False).",
+                description=(
+                    "Maximum number of products per page (1-100). When provided, the response is a page "
+                    "object with 'next', 'previous' and 'results' keys."
+                ),
             ),
             OpenApiParameter(
-                name="is_self_pickup",
-                type=OpenApiTypes.BOOL,
+                name="cursor",
+                type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
-                description="Filter products by 'self pickup' status (True/False).",
+                description="Opaque cursor taken from the 'next' or 'previous' key of a previous page.",
+            ),
+            OpenApiParameter(
+                name="ordering",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Sort key of the list (id, -id, price, -price, category, -category).",
+            ),
+            OpenApiParameter(
+                name="fields",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "Comma separated product fields to return, e.g. 'id,name,price'. Only these columns are read "
+                    "from the database. All fields are returned by default."
+                ),
+            ),
+            OpenApiParameter(
+                name="ids",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "Comma separated ids of at most 100 products to retrieve at once, e.g. '1,2,3'. It cannot be "
+                    "combined with the other parameters. The response is then an object with the found products "
+                    "in the order of the ids under 'results', and the ids of products not found under 'missing'."
+                ),
             ),
         ],
         tags=["Products"],
@@ -82,34 +198,603 @@ class ApiProductListView(APIView):
     def get(self, request):
         """Handle GET request to retrieve all products data."""
 
-        query_params_dto = QueryParamsDTO(
-            offer_of_the_month=request.query_params.get('is_offer_of_the_month', None),
-            availability=request.query_params.get('is_available', None),
-            self_pickup=request.query_params.get('is_self_pickup', None)
-        )
+        if "ids" in request.query_params:
+            return self._get_products_by_ids(request)
+
+        query_params_serializer = ProductQueryParamsSerializer(data=self._query_params_data(request.query_params))
+
+        if not query_params_serializer.is_valid():
+            return Response(query_params_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        query_params_dto = self._query_params_to_dto(query_params_serializer.validated_data)
+
+        self.fields = query_params_dto.fields
 
         product_service = ServiceContainer.product_service()
 
+        renderer = request.accepted_renderer
+        catalog_cache = CacheContainer.catalog_cache()
+        cache_key = self._list_cache_key(query_params_dto)
+
+        if renderer.format == "json":
+            cached_list, _ = catalog_cache.get(cache_key)
+            if cached_list is not None:
+                etag, content = cached_list
+                return self._conditional_list_response(request, renderer, etag, content)
+
+        version_dto = product_service.get_products_version(query_params_dto)
+
+        etag = make_etag("products", cache_key, version_dto.count, version_dto.last_modified, renderer.format)
+
+        not_modified = get_not_modified_response(request, etag, None)
+
+        if not_modified is not None:
+            return not_modified
+
         try:
-            products_dto = product_service.get_products(query_params_dto)
+            if renderer.format != "json":
+                response = Response(
+                    data=self._get_products_data(product_service, query_params_dto),
+                    status=status.HTTP_200_OK,
+                )
+                return set_validators(response, etag, None)
+
+            _, content = catalog_cache.get_or_load(
+                cache_key,
+                lambda: (
+                    etag,
+                    renderer.render(
+                        self._get_products_data(product_service, query_params_dto),
+                        renderer_context={"fields": query_params_dto.fields},
+                    ),
+                ),
+            )
         except InstanceDoesNotExistError as exception:
             return Response({"error": str(exception.message)}, status=status.HTTP_404_NOT_FOUND)
 
-        products = ProductSerializer(products_dto, many=True)
+        return self._conditional_list_response(request, renderer, etag, content)
+
+    @staticmethod
+    def _get_products_by_ids(request):
+        """Retrieve the products requested by id with the ids query parameter."""
+
+        query_params_serializer = ProductBatchQueryParamsSerializer(data=request.query_params.dict())
+
+        if not query_params_serializer.is_valid():
+            return Response(query_params_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        product_service = ServiceContainer.product_service()
+
+        product_batch_dto = product_service.get_products_by_ids(query_params_serializer.validated_data["ids"])
+
+        return Response(
+            data=product_batch_dto,
+            status=status.HTTP_200_OK,
+        )
+
+    def get_renderer_context(self):
+        renderer_context = super().get_renderer_context()
+        renderer_context["fields"] = self.fields
+        return renderer_context
+
+    @staticmethod
+    def _query_params_data(query_params):
+        """Collect query parameters for validation, keeping all values of the repeatable category parameter."""
+
+        data = query_params.dict()
+
+        if "category" in query_params:
+            data["category"] = query_params.getlist("category")
+
+        return data
+
+    @staticmethod
+    def _query_params_to_dto(query_params):
+        """Convert validated query parameters of a list of products into a QueryParamsDTO object."""
+
+        categories = query_params.get("category")
+
+        return QueryParamsDTO(
+            offer_of_the_month=query_params.get("is_offer_of_the_month"),
+            availability=query_params.get("is_available"),
+            self_pickup=query_params.get("is_self_pickup"),
+            categories=tuple(sorted(set(categories))) if categories is not None else None,
+            price_min=query_params.get("price_min"),
+            price_max=query_params.get("price_max"),
+            limit=query_params.get("limit"),
+            cursor=query_params.get("cursor"),
+            ordering=query_params.get("ordering"),
+            fields=query_params.get("fields"),
+        )
+
+    @staticmethod
+    def _conditional_list_response(request, renderer, etag, content):
+        """
+        Create a response with the rendered list, or a 304 response if the client already has it.
+        Lists are validated by their entity tag only: the latest modification time of the listed products
+        does not change when one of them is deleted, so it cannot tell whether a list changed.
+        """
+
+        not_modified = get_not_modified_response(request, etag, None)
+
+        if not_modified is not None:
+            return not_modified
+
+        response = HttpResponse(content, content_type=renderer.media_type, status=status.HTTP_200_OK)
+
+        return set_validators(response, etag, None)
+
+    @staticmethod
+    def _get_products_data(product_service, query_params_dto):
+        """Retrieve products either as a plain list or as a page, to be encoded by the ProductJSONRenderer."""
+
+        product_page_dto = product_service.get_products(query_params_dto)
+
+        if query_params_dto.limit is None:
+            return product_page_dto.items
+
+        return product_page_dto
+
+    @staticmethod
+    def _list_cache_key(query_params_dto):
+        """Build a cache key of the rendered list from the normalized query parameters."""
+
+        return "list:" + hashlib.sha1(repr(astuple(query_params_dto)).encode("utf-8")).hexdigest()
+
+
+class ApiProductBulkView(APIView):
+    """
+    The ApiProductBulkView class defines API endpoints for writing batches of products.
+    A whole batch is validated and written in a single request, and every batch
+    operation is executed as set-based queries instead of one query per product.
+    """
+
+    @extend_schema(
+        summary="Create a batch of new products",
+        request=ProductCreateSerializer(many=True),
+        responses={
+            201: ProductBulkResultSerializer,
+            400: BulkValidationErrorResponseSerializer(many=True),
+            401: AccessDeniedDetailSerializer,
+            403: AccessDeniedDetailSerializer,
+            409: ResponseWithErrorSerializer,
+        },
+        tags=["Products"],
+    )
+    def post(self, request):
+        """Handle POST request to create a batch of products."""
+
+        JWTPermissionValidator.is_superuser_or_raise(request)
+
+        products_serializer = ProductCreateSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=settings.PRODUCT_BULK_MAX_ITEMS
+        )
+
+        if not products_serializer.is_valid():
+            return Response(self._bulk_errors(products_serializer), status=status.HTTP_400_BAD_REQUEST)
+
+        product_service = ServiceContainer.product_service()
+
+        new_products_dto = [NewProductDTO(**product) for product in products_serializer.validated_data]
+
+        try:
+            count = product_service.bulk_create_products(new_products_dto, settings.PRODUCT_BULK_BATCH_SIZE)
+        except InstanceAlreadyExistsError as exception:
+            return Response({"error": str(exception.message)}, status=status.HTTP_409_CONFLICT)
+
+        result = ProductBulkResultSerializer({"count": count})
+
+        return Response(
+            data=result.data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        summary="Create or update a batch of products matched by sku",
+        request=ProductUpsertSerializer(many=True),
+        responses={
+            200: ProductBulkResultSerializer,
+            400: BulkValidationErrorResponseSerializer(many=True),
+            401: AccessDeniedDetailSerializer,
+            403: AccessDeniedDetailSerializer,
+        },
+        tags=["Products"],
+    )
+    def put(self, request):
+        """Handle PUT request to create or update a batch of products."""
+
+        JWTPermissionValidator.is_superuser_or_raise(request)
+
+        products_serializer = ProductUpsertSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=settings.PRODUCT_BULK_MAX_ITEMS
+        )
+
+        if not products_serializer.is_valid():
+            return Response(self._bulk_errors(products_serializer), status=status.HTTP_400_BAD_REQUEST)
+
+        product_service = ServiceContainer.product_service()
+
+        new_products_dto = [NewProductDTO(**product) for product in products_serializer.validated_data]
+
+        count = product_service.bulk_upsert_products(new_products_dto, settings.PRODUCT_BULK_BATCH_SIZE)
+
+        result = ProductBulkResultSerializer({"count": count})
+
+        return Response(
+            data=result.data,
+            status=status.HTTP_200_OK,
+        )
+
+    @extend_schema(
+        summary="Partial update all products selected by ids or filters",
+        request=ProductBulkPartialUpdateSerializer,
+        responses={
+            200: ProductBulkResultSerializer,
+            400: ValidationErrorResponseSerializer,
+            401: AccessDeniedDetailSerializer,
+            403: AccessDeniedDetailSerializer,
+        },
+        tags=["Products"],
+    )
+    def patch(self, request):
+        """Handle PATCH request to partial update a selection of products."""
+
+        JWTPermissionValidator.is_superuser_or_raise(request)
+
+        update_serializer = ProductBulkPartialUpdateSerializer(data=request.data)
+
+        if not update_serializer.is_valid():
+            return Response(update_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        product_service = ServiceContainer.product_service()
+
+        query_params_dto = self._selection_to_query_params_dto(update_serializer.validated_data)
+        partial_product_dto = PartialProductDTO(**update_serializer.validated_data["data"])
+
+        count = product_service.partial_update_products(query_params_dto, partial_product_dto)
+
+        result = ProductBulkResultSerializer({"count": count})
+
+        return Response(
+            data=result.data,
+            status=status.HTTP_200_OK,
+        )
+
+    @extend_schema(
+        summary="Delete all products selected by ids or filters",
+        request=ProductSelectionSerializer,
+        responses={
+            200: ProductBulkResultSerializer,
+            400: ValidationErrorResponseSerializer,
+            401: AccessDeniedDetailSerializer,
+            403: AccessDeniedDetailSerializer,
+        },
+        tags=["Products"],
+    )
+    def delete(self, request):
+        """Handle DELETE request to remove a selection of products."""
+
+        JWTPermissionValidator.is_superuser_or_raise(request)
+
+        selection_serializer = ProductSelectionSerializer(data=request.data)
+
+        if not selection_serializer.is_valid():
+            return Response(selection_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        product_service = ServiceContainer.product_service()
+
+        query_params_dto = self._selection_to_query_params_dto(selection_serializer.validated_data)
+
+        count = product_service.delete_products(query_params_dto)
+
+        result = ProductBulkResultSerializer({"count": count})
+
+        return Response(
+            data=result.data,
+            status=status.HTTP_200_OK,
+        )
+
+    @staticmethod
+    def _selection_to_query_params_dto(selection):
+        """Convert validated selection of products into a QueryParamsDTO object."""
+
+        filters = selection.get("filters") or {}
+        ids = selection.get("ids")
+
+        return QueryParamsDTO(
+            offer_of_the_month=filters.get("is_offer_of_the_month"),
+            availability=filters.get("is_available"),
+            self_pickup=filters.get("is_self_pickup"),
+            ids=tuple(ids) if ids is not None else None,
+        )
+
+    @staticmethod
+    def _bulk_errors(products_serializer):
+        """Collect validation errors of the batch, keeping only the items that failed validation."""
+
+        if isinstance(products_serializer.errors, dict):
+            return products_serializer.errors
+
+        return [
+            {"index": index, "errors": errors}
+            for index, errors in enumerate(products_serializer.errors)
+            if errors
+        ]
+
+
+class ApiProductExportView(APIView):
+    """
+    The ApiProductExportView class defines API endpoint for streaming export of the product catalog.
+    Products are fetched in chunks and written to the response one by one, so the export starts
+    immediately and uses constant memory regardless of the catalog size.
+    """
+
+    renderer_classes = [ProductJSONRenderer, NDJSONRenderer]
+
+    @extend_schema(
+        summary="Export all products by query params as a JSON array or newline delimited JSON",
+        responses={
+            200: ProductSerializer(many=True),
+            400: ValidationErrorResponseSerializer,
+        },
+        parameters=[
+            *PRODUCT_FILTER_PARAMETERS,
+            OpenApiParameter(
+                name="format",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                enum=["json", "ndjson"],
+                description="Export format, JSON array by default.",
+            ),
+        ],
+        tags=["Products"],
+    )
+    def get(self, request):
+        """Handle GET request to stream all products data."""
+
+        query_params_serializer = ProductFilterQueryParamsSerializer(data=request.query_params.dict())
+
+        if not query_params_serializer.is_valid():
+            return Response(query_params_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        query_params = query_params_serializer.validated_data
+
+        query_params_dto = QueryParamsDTO(
+            offer_of_the_month=query_params.get("is_offer_of_the_month"),
+            availability=query_params.get("is_available"),
+            self_pickup=query_params.get("is_self_pickup"),
+        )
+
+        product_service = ServiceContainer.product_service()
+
+        products_dto = product_service.export_products(query_params_dto, settings.PRODUCT_EXPORT_CHUNK_SIZE)
+
+        renderer = request.accepted_renderer
+        encoder = ProductJSONRenderer.encoders[ProductDTO]
+
+        if isinstance(renderer, NDJSONRenderer):
+            content = (encoder.encode(product_dto) + b"\n" for product_dto in products_dto)
+        else:
+            content = self._render_json_array(encoder, products_dto)
+
+        # Django buffers the whole content of a synchronous iterator before streaming it under ASGI
+        if isinstance(request._request, ASGIRequest):
+            content = self._iter_content_async(content, settings.PRODUCT_EXPORT_CHUNK_SIZE)
+
+        return StreamingHttpResponse(content, content_type=renderer.media_type, status=status.HTTP_200_OK)
+
+    @staticmethod
+    async def _iter_content_async(content, batch_size: int):
+        """
+        Iterate over synchronously produced content from the event loop, so it is streamed under ASGI.
+        Batches of chunks are produced in the thread of the request, which holds its database connection.
+        """
+
+        iterator = iter(content)
+        next_batch = sync_to_async(lambda: b"".join(islice(iterator, batch_size)))
+
+        try:
+            while batch := await next_batch():
+                yield batch
+        finally:
+            await sync_to_async(iterator.close)()
+
+    @staticmethod
+    def _render_json_array(encoder, products_dto):
+        """Render products one by one as elements of a JSON array."""
+
+        yield b"["
+        for index, product_dto in enumerate(products_dto):
+            if index:
+                yield b","
+            yield encoder.encode(product_dto)
+        yield b"]"
+
+
+class ApiProductSearchView(APIView):
+    """
+    The ApiProductSearchView class defines API endpoint for full-text search of products.
+    Rendered search results are cached until the next change of the catalog.
+    """
+
+    renderer_classes = [ProductJSONRenderer, *COMPACT_RENDERER_CLASSES, BrowsableAPIRenderer]
+
+    @extend_schema(
+        summary="Search products by name, category and descriptions, ordered by relevance",
+        responses={
+            200: ProductSearchResultSerializer,
+            400: ValidationErrorResponseSerializer,
+        },
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description=(
+                    "Search query. Products containing all of its words are found, "
+                    "\"quoted phrases\", 'or' and -excluded words are supported on PostgreSQL."
+                ),
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Maximum number of products per page (1-100), 20 by default.",
+            ),
+            OpenApiParameter(
+                name="offset",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Number of the most relevant products to skip (0-10000), taken from 'next_offset'.",
+            ),
+        ],
+        tags=["Products"],
+    )
+    def get(self, request):
+        """Handle GET request to search products."""
+
+        query_params_serializer = ProductSearchQueryParamsSerializer(data=request.query_params.dict())
+
+        if not query_params_serializer.is_valid():
+            return Response(query_params_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        query_params = query_params_serializer.validated_data
+
+        search_query_dto = SearchQueryDTO(
+            query=query_params["q"],
+            limit=query_params["limit"],
+            offset=query_params["offset"],
+        )
+
+        product_service = ServiceContainer.product_service()
+
+        renderer = request.accepted_renderer
+
+        if renderer.format != "json":
+            return Response(data=product_service.search_products(search_query_dto), status=status.HTTP_200_OK)
+
+        cache_key = "search:" + hashlib.sha1(repr(astuple(search_query_dto)).encode("utf-8")).hexdigest()
+
+        content = CacheContainer.catalog_cache().get_or_load(
+            cache_key,
+            lambda: renderer.render(product_service.search_products(search_query_dto)),
+        )
+
+        return HttpResponse(content, content_type=renderer.media_type, status=status.HTTP_200_OK)
+
+
+class ApiProductFacetsView(APIView):
+    """
+    The ApiProductFacetsView class defines API endpoint for facets of the product catalog,
+    the counts and price statistics shown next to a list of products.
+    Facets are computed by the database and cached until the next change of the catalog.
+    """
+
+    renderer_classes = [ProductJSONRenderer, BrowsableAPIRenderer]
+
+    @extend_schema(
+        summary="Retrieve product counts and prices per category and product counts per flag by query params",
+        responses={
+            200: ProductFacetsSerializer,
+            400: ValidationErrorResponseSerializer,
+        },
+        parameters=PRODUCT_FILTER_PARAMETERS,
+        tags=["Products"],
+    )
+    def get(self, request):
+        """Handle GET request to retrieve facets of products."""
+
+        query_params_serializer = ProductFilterQueryParamsSerializer(data=request.query_params.dict())
+
+        if not query_params_serializer.is_valid():
+            return Response(query_params_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        query_params = query_params_serializer.validated_data
+
+        query_params_dto = QueryParamsDTO(
+            offer_of_the_month=query_params.get("is_offer_of_the_month"),
+            availability=query_params.get("is_available"),
+            self_pickup=query_params.get("is_self_pickup"),
+        )
+
+        product_service = ServiceContainer.product_service()
+
+        product_facets_dto = product_service.get_product_facets(query_params_dto)
+
+        return Response(
+            data=product_facets_dto,
+            status=status.HTTP_200_OK,
+        )
+
+
+class ApiProductChangesView(APIView):
+    """
+    The ApiProductChangesView class defines API endpoint for the feed of product changes.
+    A client mirroring the catalog reads the changes made since its last sync, so the cost
+    of a sync depends on the number of changes instead of the size of the catalog.
+    """
+
+    renderer_classes = [ProductJSONRenderer, BrowsableAPIRenderer]
+
+    @extend_schema(
+        summary="Retrieve changes of products made after the given sequence number",
+        responses={
+            200: ProductChangesSerializer,
+            400: ValidationErrorResponseSerializer,
+        },
+        parameters=[
+            OpenApiParameter(
+                name="since",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "Sequence number of the last change already seen, taken from 'next_since' of the previous "
+                    "response, 0 by default to read the changes from the beginning."
+                ),
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Maximum number of changes read at once (1-1000), 100 by default.",
+            ),
+        ],
+        tags=["Products"],
+    )
+    def get(self, request):
+        """Handle GET request to retrieve changes of products."""
+
+        query_params_serializer = ProductChangesQueryParamsSerializer(data=request.query_params.dict())
+
+        if not query_params_serializer.is_valid():
+            return Response(query_params_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        query_params = query_params_serializer.validated_data
+
+        product_service = ServiceContainer.product_service()
+
+        product_changes_dto = product_service.get_product_changes(query_params["since"], query_params["limit"])
 
         return Response(
-            data=products.data,
+            data=product_changes_dto,
             status=status.HTTP_200_OK,
         )
 
 
 class ApiProductDetailView(APIView):
-    """The ApiProductDetailView class defines API endpoints for working with pet information."""
+    """
+    The ApiProductDetailView class defines API endpoints for working with pet information.
+    Products the client already has are answered with 304 Not Modified.
+    """
+
+    renderer_classes = [ProductJSONRenderer, BrowsableAPIRenderer]
 
     @extend_schema(
         summary="Retrieve product data by product id",
         responses={
             200: GetProductSerializer,
+            304: None,
             404: ResponseWithErrorSerializer,
         },
         tags=["Products"],
@@ -120,17 +805,29 @@ class ApiProductDetailView(APIView):
         product_service = ServiceContainer.product_service()
 
         try:
-            product_dto = product_service.get_product(id)
+            version_dto = product_service.get_product_version(id)
         except InstanceDoesNotExistError as exception:
             return Response({"error": str(exception.message)}, status=status.HTTP_404_NOT_FOUND)
 
-        product = GetProductSerializer(product_dto)
+        etag = make_version_etag(version_dto.version, request.accepted_renderer.format)
 
-        return Response(
-            data=product.data,
+        not_modified = get_not_modified_response(request, etag, version_dto.last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
+        try:
+            product_dto = product_service.get_product(id)
+        except InstanceDoesNotExistError as exception:
+            return Response({"error": str(exception.message)}, status=status.HTTP_404_NOT_FOUND)
+
+        response = Response(
+            data=product_dto,
             status=status.HTTP_200_OK,
         )
 
+        return set_validators(response, etag, version_dto.last_modified)
+
     @extend_schema(
         summary="Delete product data by product id",
         responses={
@@ -164,7 +861,20 @@ class ApiProductDetailView(APIView):
             401: AccessDeniedDetailSerializer,
             403: AccessDeniedDetailSerializer,
             404: ResponseWithErrorSerializer,
+            409: ResponseWithErrorSerializer,
+            412: ResponseWithErrorSerializer,
         },
+        parameters=[
+            OpenApiParameter(
+                name="If-Match",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.HEADER,
+                description=(
+                    "ETag of the product the changes are based on, the update fails with 412 "
+                    "if the product has been modified since."
+                ),
+            ),
+        ],
         tags=["Products"],
     )
     def patch(self, request, id):
@@ -182,13 +892,25 @@ class ApiProductDetailView(APIView):
         partial_product_dto = PartialProductDTO(**product_serializer.validated_data)
 
         try:
-            product_dto = product_service.partial_update_product(id, partial_product_dto)
+            updated_product_dto = product_service.partial_update_product(
+                id, partial_product_dto, get_if_match_versions(request)
+            )
         except InstanceDoesNotExistError as exception:
             return Response({"error": str(exception.message)}, status=status.HTTP_404_NOT_FOUND)
+        except InstanceAlreadyExistsError as exception:
+            return Response({"error": str(exception.message)}, status=status.HTTP_409_CONFLICT)
+        except PreconditionFailedError as exception:
+            return Response({"error": str(exception.message)}, status=status.HTTP_412_PRECONDITION_FAILED)
 
-        product = ProductSerializer(product_dto)
+        product = ProductSerializer(updated_product_dto.product)
 
-        return Response(
+        response = Response(
             data=product.data,
             status=status.HTTP_200_OK,
         )
+
+        return set_validators(
+            response,
+            make_version_etag(updated_product_dto.version, request.accepted_renderer.format),
+            updated_product_dto.last_modified,
+        )
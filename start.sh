@@ -9,7 +9,6 @@ do
  sleep 2
 done
 
-python manage.py makemigrations
 python manage.py migrate
 python manage.py shell <<EOF
 from django.contrib.auth import get_user_model
@@ -19,4 +18,11 @@ if not User.objects.filter(username='admin').exists():
     print("Superuser 'admin' has been created.")
 EOF
 
+# Production server, "wsgi" runs threaded workers and "asgi" runs uvicorn workers, see gunicorn.conf.py
+if [ "$SERVER_MODE" = "wsgi" ] || [ "$SERVER_MODE" = "asgi" ]; then
+  # Refuse to start with a configuration the workers cannot run with, such as a per-process cache
+  python manage.py check || exit 1
+  exec gunicorn -c gunicorn.conf.py
+fi
+
 python manage.py runserver 0:8000